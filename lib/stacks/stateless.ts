@@ -4,6 +4,10 @@ import * as sfn from "aws-cdk-lib/aws-stepfunctions";
 import * as tasks from "aws-cdk-lib/aws-stepfunctions-tasks";
 import * as apigwv2 from "aws-cdk-lib/aws-apigatewayv2";
 import * as iam from "aws-cdk-lib/aws-iam";
+import * as dynamodb from "aws-cdk-lib/aws-dynamodb";
+import * as sqs from "aws-cdk-lib/aws-sqs";
+import * as lambdaEventSources from "aws-cdk-lib/aws-lambda-event-sources";
+import * as s3 from "aws-cdk-lib/aws-s3";
 import * as agentcore from "@aws-cdk/aws-bedrock-agentcore-alpha";
 import * as path from "path";
 import { Construct } from "constructs";
@@ -75,6 +79,8 @@ export class StatelessStack extends cdk.Stack {
           "conversation-system-prompt",
           envProps
         ),
+        // プロンプト内の $変数 に埋め込むチーム・チャンネル別の値（オプション）
+        SSM_PROMPT_VARIABLES: genSsmName("prompt-variables", envProps),
         // 更新トリガー用タイムスタンプ
         CONFIG_VERSION: "2025-01-11-v10-ssm-prompts",
       },
@@ -122,10 +128,25 @@ export class StatelessStack extends cdk.Stack {
         resources: [
           `arn:aws:ssm:${cdk.Stack.of(this).region}:${cdk.Stack.of(this).account}:parameter${genSsmName("router-system-prompt", envProps)}`,
           `arn:aws:ssm:${cdk.Stack.of(this).region}:${cdk.Stack.of(this).account}:parameter${genSsmName("conversation-system-prompt", envProps)}`,
+          `arn:aws:ssm:${cdk.Stack.of(this).region}:${cdk.Stack.of(this).account}:parameter${genSsmName("prompt-variables", envProps)}`,
         ],
       })
     );
 
+    // ========================================
+    // Agent Result Bucket
+    // ========================================
+    // Step Functions のペイロード上限（256 KB）を超える返信テキストの退避先
+    // 一時データのため 1 日で失効させる
+    const agentResultBucket = new s3.Bucket(this, "AgentResultBucket", {
+      blockPublicAccess: s3.BlockPublicAccess.BLOCK_ALL,
+      encryption: s3.BucketEncryption.S3_MANAGED,
+      enforceSSL: true,
+      lifecycleRules: [{ expiration: cdk.Duration.days(1) }],
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+      autoDeleteObjects: true,
+    });
+
     // Slack Posting Lambda
     const postToSlackLambda = new LambdaPythonFunction(
       this,
@@ -142,6 +163,9 @@ export class StatelessStack extends cdk.Stack {
       }
     );
 
+    // 退避された返信テキストの読み取り権限
+    agentResultBucket.grantRead(postToSlackLambda.function);
+
     // SSM Parameter Store 読み取り権限
     postToSlackLambda.function.addToRolePolicy(
       new iam.PolicyStatement({
@@ -167,14 +191,65 @@ export class StatelessStack extends cdk.Stack {
         entry: "src/lambda/invoke-agentcore",
         environment: {
           AGENT_RUNTIME_ARN: agentRuntime.agentRuntimeArn,
+          // ストリーミング返信（生成中のテキストを Slack に逐次表示）
+          STREAM_REPLIES: "false",
+          SSM_SLACK_BOT_TOKEN: genSsmName("slack-bot-token", envProps),
+          // 大きな返信テキストの退避先
+          RESULT_BUCKET_NAME: agentResultBucket.bucketName,
         },
         timeout: cdk.Duration.seconds(120),
       }
     );
 
+    // 返信テキストの退避権限
+    agentResultBucket.grantPut(invokeAgentCoreLambda.function);
+
+    // SSM Parameter Store 読み取り権限（ストリーミング返信で使用）
+    invokeAgentCoreLambda.function.addToRolePolicy(
+      new iam.PolicyStatement({
+        actions: ["ssm:GetParameter"],
+        resources: [
+          `arn:aws:ssm:${cdk.Stack.of(this).region}:${cdk.Stack.of(this).account}:parameter${genSsmName("slack-bot-token", envProps)}`,
+        ],
+      })
+    );
+
     // AgentCore Runtime呼び出し権限を付与
     agentRuntime.grantInvokeRuntime(invokeAgentCoreLambda.function);
 
+    // Pipeline Lambda（DISPATCH_MODE=direct 用）
+    // AgentCore 呼び出しから Slack 投稿までを Step Functions を経由せずに 1 回の実行で行う
+    const pipelineLambda = new LambdaPythonFunction(this, "PipelineLambda", {
+      envProps,
+      functionName: "pipeline",
+      entry: "src/lambda/invoke-agentcore",
+      handler: "pipeline_handler",
+      environment: {
+        AGENT_RUNTIME_ARN: agentRuntime.agentRuntimeArn,
+        STREAM_REPLIES: "false",
+        SSM_SLACK_BOT_TOKEN: genSsmName("slack-bot-token", envProps),
+      },
+      timeout: cdk.Duration.seconds(150),
+    });
+
+    // SSM Parameter Store 読み取り権限
+    pipelineLambda.function.addToRolePolicy(
+      new iam.PolicyStatement({
+        actions: ["ssm:GetParameter"],
+        resources: [
+          `arn:aws:ssm:${cdk.Stack.of(this).region}:${cdk.Stack.of(this).account}:parameter${genSsmName("slack-bot-token", envProps)}`,
+        ],
+      })
+    );
+
+    agentRuntime.grantInvokeRuntime(pipelineLambda.function);
+
+    // 非同期実行の自動再試行は無効化（Step Functions のような実行名による重複排除がなく、
+    // 再試行されると同じメッセージに二重に返信するため）
+    pipelineLambda.function.configureAsyncInvoke({
+      retryAttempts: 0,
+    });
+
     // Step Functions タスク
     const invokeAgentTask = new tasks.LambdaInvoke(this, "InvokeAgent", {
       lambdaFunction: invokeAgentCoreLambda.function,
@@ -194,6 +269,28 @@ export class StatelessStack extends cdk.Stack {
       tracingEnabled: true,
     });
 
+    // Slack 再送の重複排除テーブル（コンテナをまたいだ判定用）
+    // キーは DEDUP_TTL_SECONDS で失効する一時データ
+    const dedupTable = new dynamodb.Table(this, "DedupTable", {
+      partitionKey: { name: "pk", type: dynamodb.AttributeType.STRING },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      timeToLiveAttribute: "expires_at",
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+    });
+
+    // Dispatch キュー（DISPATCH_MODE=queue 用）
+    // Ingress はキューに積んで即 ack し、同じ Ingress Lambda がイベントソースとしてまとめて Step Functions を開始する
+    const dispatchDeadLetterQueue = new sqs.Queue(this, "DispatchDeadLetterQueue", {
+      retentionPeriod: cdk.Duration.days(4),
+      enforceSSL: true,
+    });
+    const dispatchQueue = new sqs.Queue(this, "DispatchQueue", {
+      // Ingress Lambda のタイムアウト（10 秒）より長くする
+      visibilityTimeout: cdk.Duration.seconds(60),
+      enforceSSL: true,
+      deadLetterQueue: { queue: dispatchDeadLetterQueue, maxReceiveCount: 3 },
+    });
+
     // Ingress Lambda
     const ingressLambda = new LambdaPythonFunction(this, "IngressLambda", {
       envProps,
@@ -204,10 +301,27 @@ export class StatelessStack extends cdk.Stack {
         SSM_SLACK_SIGNING_SECRET: genSsmName("slack-signing-secret", envProps),
         SSM_SLACK_BOT_USER_ID: genSsmName("slack-bot-user-id", envProps),
         STEP_FUNCTION_ARN: this.stateMachine.stateMachineArn,
+        // sync: Step Functions 経由 / direct: Pipeline Lambda を直接非同期実行
+        DISPATCH_MODE: "sync",
+        PIPELINE_FUNCTION_NAME: pipelineLambda.function.functionName,
+        DEDUP_TABLE_NAME: dedupTable.tableName,
+        // queue: DispatchQueue に積み、ドレイナーとして Step Functions を開始
+        DISPATCH_QUEUE_URL: dispatchQueue.queueUrl,
       },
       timeout: cdk.Duration.seconds(10),
     });
+    dispatchQueue.grantSendMessages(ingressLambda.function);
+    // ドレイナー（失敗したレコードのみ再配信させる部分バッチレスポンス）
+    ingressLambda.function.addEventSource(
+      new lambdaEventSources.SqsEventSource(dispatchQueue, {
+        batchSize: 10,
+        maxBatchingWindow: cdk.Duration.seconds(1),
+        reportBatchItemFailures: true,
+      })
+    );
+    dedupTable.grantReadWriteData(ingressLambda.function);
     this.stateMachine.grantStartExecution(ingressLambda.function);
+    pipelineLambda.function.grantInvoke(ingressLambda.function);
 
     // SSM Parameter Store 読み取り権限
     ingressLambda.function.addToRolePolicy(
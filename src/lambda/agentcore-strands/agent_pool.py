@@ -0,0 +1,196 @@
+"""Per-container pool of Strands agents and memory session managers.
+
+Building an Agent (and its Bedrock model client) plus an
+AgentCoreMemorySessionManager (which restores the session from Memory) on every
+message is pure overhead when the same channel keeps talking to the same
+container. The pool keeps one entry per (memory, session, actor, prompt version):
+
+- a single session manager shared by the router and conversation agents of
+  that session (each agent has its own agent_id within the session)
+- the agents themselves, reused across invocations
+
+A pooled agent restores the session from Memory only when it is built, so it
+only stays current while every message of the session reaches this container.
+That holds when invoke-agentcore routes a whole channel to one runtime session
+(SESSION_AFFINITY=channel, sent as metadata["session_affinity"]); with the
+default thread affinity other threads of the channel are handled in other
+containers, so the caller checks out with reuse=False and gets agents built
+for this request only.
+
+An entry is checked out for the duration of one orchestration; a concurrent
+request for a busy entry gets a throwaway one instead. On release the agents'
+per-request state is reset: retrieved memory context injected into the user
+messages is stripped (a fresh agent restores history without it), and agents
+without memory have their messages cleared. Entries whose agents failed, or that were marked not to be
+returned (e.g. a speculative agent wrote this turn to Memory instead of the
+pooled ones), are discarded. The least recently used entries are evicted beyond
+the pool size.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+AGENT_POOL_MAX_SESSIONS = int(os.environ.get("AGENT_POOL_MAX_SESSIONS", "32"))
+
+
+@lru_cache(maxsize=1)
+def memory_classes() -> Optional[tuple[Any, Any, Any]]:
+    """Import the Memory integration classes once (None if bedrock_agentcore is unavailable)."""
+    try:
+        from bedrock_agentcore.memory.integrations.strands.config import (
+            AgentCoreMemoryConfig,
+            RetrievalConfig,
+        )
+        from bedrock_agentcore.memory.integrations.strands.session_manager import (
+            AgentCoreMemorySessionManager,
+        )
+    except ImportError:
+        return None
+    return AgentCoreMemoryConfig, RetrievalConfig, AgentCoreMemorySessionManager
+
+
+class PooledSession:
+    """Agents and the session manager they share for one memory session."""
+
+    def __init__(self, session_manager_factory: Callable[[], Optional[Any]]) -> None:
+        self._session_manager_factory = session_manager_factory
+        self._session_manager: Optional[Any] = None
+        self._session_manager_created = False
+        self.agents: dict[str, Any] = {}
+        self.failed = False
+        self.discarded = False
+        self.busy = False
+
+    @property
+    def session_manager(self) -> Optional[Any]:
+        """The shared session manager, created on first use (it restores the session from Memory)."""
+        if not self._session_manager_created:
+            self._session_manager = self._session_manager_factory()
+            self._session_manager_created = True
+        return self._session_manager
+
+    def detached_session_manager(self) -> Optional[Any]:
+        """A new session manager for the same memory session, not shared with the pooled agents.
+
+        For an agent running concurrently with the pooled ones (a session manager
+        is not safe to use from two agents at once).
+        """
+        return self._session_manager_factory()
+
+    def agent(self, agent_id: str, factory: Callable[[Optional[Any]], Any]) -> Any:
+        """Return the pooled agent for agent_id, building it with factory(session_manager) once."""
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            agent = factory(self.session_manager)
+            self.agents[agent_id] = agent
+        return agent
+
+    def mark_failed(self) -> None:
+        """Discard this entry on release (an agent may be left mid-conversation)."""
+        self.failed = True
+
+    def discard(self) -> None:
+        """Do not return this entry to the pool on release.
+
+        For agents that are healthy but no longer current, e.g. when another agent
+        handled this turn of the memory session and the pooled ones missed it.
+        """
+        self.discarded = True
+
+    def reset(self) -> None:
+        """Drop per-request state so the next checkout starts like a freshly built agent."""
+        for agent in self.agents.values():
+            if self._session_manager is None:
+                agent.messages.clear()
+                continue
+            tag = f"<{self._session_manager.config.context_tag}>"
+            for message in agent.messages:
+                content = message.get("content")
+                if message.get("role") == "user" and content:
+                    message["content"] = [
+                        block for block in content if not str(block.get("text", "")).startswith(tag)
+                    ]
+
+
+class AgentPool:
+    """LRU pool of PooledSession entries."""
+
+    def __init__(self, max_sessions: int = AGENT_POOL_MAX_SESSIONS) -> None:
+        self._max_sessions = max_sessions
+        self._entries: OrderedDict[tuple, PooledSession] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def checkout(
+        self,
+        key: tuple,
+        session_manager_factory: Callable[[], Optional[Any]],
+        reuse: bool = True,
+    ) -> Iterator[PooledSession]:
+        """Check out the entry for key, creating it if needed.
+
+        Args:
+            key: (memory_id, session_id, actor_id, prompt versions)
+            session_manager_factory: Builds the session manager on first use
+            reuse: False to bypass the pool (a fresh entry that is not kept)
+        """
+        if not reuse:
+            yield PooledSession(session_manager_factory)
+            return
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not entry.busy:
+                self._entries.move_to_end(key)
+                pooled = True
+            else:
+                entry = PooledSession(session_manager_factory)
+                pooled = False
+            entry.busy = True
+
+        try:
+            yield entry
+        except BaseException:
+            entry.failed = True
+            raise
+        finally:
+            self._release(key, entry, pooled)
+
+    def _release(self, key: tuple, entry: PooledSession, pooled: bool) -> None:
+        with self._lock:
+            entry.busy = False
+            if entry.failed or entry.discarded:
+                if pooled and self._entries.get(key) is entry:
+                    del self._entries[key]
+                logger.info(
+                    "Discarded pooled agents (%s): session=%s",
+                    "failure" if entry.failed else "not returned",
+                    key[1],
+                )
+                return
+
+            entry.reset()
+            if not pooled:
+                if key in self._entries:
+                    # A concurrent request owns the pooled entry; drop this throwaway one
+                    return
+                self._entries[key] = entry
+
+            while len(self._entries) > self._max_sessions:
+                evicted_key, _ = self._entries.popitem(last=False)
+                logger.info("Evicted pooled agents: session=%s", evicted_key[1])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by all invocations in this container
+agent_pool = AgentPool()
@@ -1,5 +1,13 @@
 """Agent definitions for the Slack × Strands × AgentCore bot."""
 
-from prompt_loader import ROUTER_SYSTEM_PROMPT, CONVERSATION_SYSTEM_PROMPT
-
 __all__ = ["ROUTER_SYSTEM_PROMPT", "CONVERSATION_SYSTEM_PROMPT"]
+
+
+def __getattr__(name: str) -> str:
+    # Resolved on first access: prompt_loader imports the default prompts from
+    # this package, so importing it eagerly here would be circular
+    if name in __all__:
+        import prompt_loader
+
+        return getattr(prompt_loader, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,250 @@
+"""Token-budgeted assembly of the long-term memory context.
+
+AgentCoreMemorySessionManager retrieves a fixed top_k per namespace and injects
+every record above the relevance score into the user message, so a greeting
+pays for the same memory context as a deep technical question. Here each agent
+call gets a token budget derived from the route and the model:
+
+- the Router gets MEMORY_CONTEXT_TOKENS_ROUTER
+- the Conversation Agent gets MEMORY_CONTEXT_TOKENS_SIMPLE_REPLY or
+  MEMORY_CONTEXT_TOKENS_FULL_REPLY (full_reply when the route is not known yet,
+  e.g. for a speculative call)
+- either is capped at MEMORY_CONTEXT_MAX_FRACTION of the model's context window
+
+The budget is split between the retrieval namespaces by NAMESPACES shares.
+Records are ranked by score within each namespace and trimmed to its share;
+budget left unused by one namespace goes to the best remaining records of the
+others. Dropped records are logged. top_k per namespace is derived from the
+largest budget, so retrieval never fetches more than could be used.
+
+Token counts are estimated (about 4 ASCII characters or 1 other character per
+token) since no tokenizer is available for the Bedrock models.
+"""
+
+import logging
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional
+
+from agent_pool import memory_classes
+
+logger = logging.getLogger(__name__)
+
+MEMORY_CONTEXT_TOKENS_ROUTER = int(os.environ.get("MEMORY_CONTEXT_TOKENS_ROUTER", "600"))
+MEMORY_CONTEXT_TOKENS_SIMPLE_REPLY = int(os.environ.get("MEMORY_CONTEXT_TOKENS_SIMPLE_REPLY", "400"))
+MEMORY_CONTEXT_TOKENS_FULL_REPLY = int(os.environ.get("MEMORY_CONTEXT_TOKENS_FULL_REPLY", "1500"))
+MEMORY_CONTEXT_MAX_FRACTION = float(os.environ.get("MEMORY_CONTEXT_MAX_FRACTION", "0.05"))
+
+# Estimated tokens per memory record, used to derive top_k from a budget
+MEMORY_RECORD_TOKENS = int(os.environ.get("MEMORY_RECORD_TOKENS", "80"))
+
+# Threads retrieving the namespaces in parallel, shared by all agent calls in the container
+MEMORY_RETRIEVAL_MAX_WORKERS = int(os.environ.get("MEMORY_RETRIEVAL_MAX_WORKERS", "8"))
+
+# Share of the budget and minimum relevance score per retrieval namespace
+NAMESPACES: dict[str, tuple[float, float]] = {
+    "/preferences/{actorId}": (0.2, 0.7),
+    "/facts/{actorId}": (0.5, 0.3),
+    "/summaries/{actorId}/{sessionId}": (0.3, 0.5),
+}
+
+# Context windows (tokens) by model ID substring; unknown models use the default
+_MODEL_CONTEXT_WINDOWS = {
+    "nova-micro": 128_000,
+    "nova-lite": 300_000,
+    "nova-2-lite": 300_000,
+    "nova-pro": 300_000,
+    "claude": 200_000,
+}
+_DEFAULT_CONTEXT_WINDOW = 128_000
+
+_retrieval_executor = ThreadPoolExecutor(
+    max_workers=MEMORY_RETRIEVAL_MAX_WORKERS, thread_name_prefix="memory-retrieval"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: ~4 ASCII characters per token, 1 token per other character."""
+    ascii_chars = sum(1 for c in text if ord(c) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def context_window(model_id: str) -> int:
+    for key, window in _MODEL_CONTEXT_WINDOWS.items():
+        if key in model_id:
+            return window
+    return _DEFAULT_CONTEXT_WINDOW
+
+
+def context_budget(agent_name: str, route: Optional[str], model_id: str = "") -> int:
+    """Memory context token budget for one agent call."""
+    if agent_name == "router":
+        budget = MEMORY_CONTEXT_TOKENS_ROUTER
+    elif route == "simple_reply":
+        budget = MEMORY_CONTEXT_TOKENS_SIMPLE_REPLY
+    else:
+        budget = MEMORY_CONTEXT_TOKENS_FULL_REPLY
+    return min(budget, int(context_window(model_id) * MEMORY_CONTEXT_MAX_FRACTION))
+
+
+def retrieval_config(retrieval_config_class: Any) -> dict:
+    """RetrievalConfig per namespace with top_k derived from the largest budget."""
+    max_budget = max(
+        MEMORY_CONTEXT_TOKENS_ROUTER,
+        MEMORY_CONTEXT_TOKENS_SIMPLE_REPLY,
+        MEMORY_CONTEXT_TOKENS_FULL_REPLY,
+    )
+    return {
+        namespace: retrieval_config_class(
+            top_k=max(1, math.ceil(max_budget * share / MEMORY_RECORD_TOKENS)),
+            relevance_score=relevance_score,
+        )
+        for namespace, (share, relevance_score) in NAMESPACES.items()
+    }
+
+
+@dataclass(frozen=True)
+class Record:
+    """A retrieved memory record."""
+
+    namespace: str
+    text: str
+    score: float
+    tokens: int
+
+
+def assemble(records: list[Record], budget: int) -> tuple[list[Record], list[Record]]:
+    """Pick the records fitting the budget.
+
+    Returns:
+        (kept, dropped), kept in namespace order and by descending score
+    """
+    by_score = sorted(records, key=lambda r: r.score, reverse=True)
+    kept: set[int] = set()
+    used = 0
+
+    # Each namespace first fills its own share...
+    for namespace, (share, _) in NAMESPACES.items():
+        remaining = int(budget * share)
+        for i, record in enumerate(by_score):
+            if record.namespace == namespace and record.tokens <= remaining:
+                kept.add(i)
+                remaining -= record.tokens
+                used += record.tokens
+
+    # ...then unused budget goes to the best remaining records of any namespace
+    for i, record in enumerate(by_score):
+        if i not in kept and used + record.tokens <= budget:
+            kept.add(i)
+            used += record.tokens
+
+    order = {namespace: n for n, namespace in enumerate(NAMESPACES)}
+    kept_records = sorted(
+        (by_score[i] for i in kept), key=lambda r: (order.get(r.namespace, len(order)), -r.score)
+    )
+    dropped = [record for i, record in enumerate(by_score) if i not in kept]
+    return kept_records, dropped
+
+
+@lru_cache(maxsize=1)
+def budgeted_session_manager_class() -> Optional[type]:
+    """AgentCoreMemorySessionManager subclass assembling a budgeted context (None if unavailable)."""
+    classes = memory_classes()
+    if classes is None:
+        return None
+    _, _, AgentCoreMemorySessionManager = classes
+
+    class BudgetedMemorySessionManager(AgentCoreMemorySessionManager):
+        """Session manager whose retrieved context is ranked and trimmed to a token budget.
+
+        Set ``route`` to the Router's decision before the Conversation Agent runs
+        (None for "not known yet").
+        """
+
+        route: Optional[str] = None
+
+        def retrieve_customer_context(self, event: Any) -> None:
+            agent = event.agent
+            messages = getattr(agent, "messages", None)
+            if not messages or messages[-1].get("role") != "user":
+                return None
+            content = messages[-1].get("content")
+            if not content or "text" not in content[0]:
+                return None
+            if not self.config.retrieval_config:
+                return None
+
+            user_query = content[0]["text"]
+            model_id = str(getattr(agent.model, "config", {}).get("model_id", ""))
+            budget = context_budget(agent.name, self.route, model_id)
+
+            try:
+                records = self._retrieve_records(user_query)
+            except Exception as e:
+                logger.error("Failed to retrieve customer context: %s", e)
+                return None
+
+            kept, dropped = assemble(records, budget)
+            if dropped:
+                logger.info(
+                    "Memory context trimmed for %s (route=%s, budget=%d): kept=%d (%d tokens), "
+                    "dropped=%d (%d tokens) %s",
+                    agent.name,
+                    self.route,
+                    budget,
+                    len(kept),
+                    sum(r.tokens for r in kept),
+                    len(dropped),
+                    sum(r.tokens for r in dropped),
+                    [(r.namespace, round(r.score, 2), r.tokens) for r in dropped],
+                )
+            if kept:
+                context_text = "\n".join(r.text for r in kept)
+                tag = self.config.context_tag
+                # Prepended so the user's query text stays last, as in the base class
+                messages[-1]["content"].insert(0, {"text": f"<{tag}>{context_text}</{tag}>"})
+                logger.info("Retrieved %s customer context items", len(kept))
+            return None
+
+        def _retrieve_records(self, user_query: str) -> list[Record]:
+            def retrieve(namespace: str, config: Any) -> list[Record]:
+                resolved_namespace = namespace.format(
+                    actorId=self.config.actor_id,
+                    sessionId=self.config.session_id,
+                    memoryStrategyId=config.strategy_id or "",
+                )
+                memories = self.memory_client.retrieve_memories(
+                    memory_id=self.config.memory_id,
+                    namespace_path=resolved_namespace,
+                    query=user_query,
+                    top_k=config.top_k,
+                )
+                records = []
+                for memory in memories:
+                    if not isinstance(memory, dict):
+                        continue
+                    score = memory.get("score", 0.0)
+                    if config.relevance_score and score < config.relevance_score:
+                        continue
+                    memory_content = memory.get("content", {})
+                    text = memory_content.get("text", "").strip() if isinstance(memory_content, dict) else ""
+                    if text:
+                        records.append(Record(namespace, text, score, estimate_tokens(text)))
+                return records
+
+            records: list[Record] = []
+            futures = {
+                _retrieval_executor.submit(retrieve, namespace, config): namespace
+                for namespace, config in self.config.retrieval_config.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    records.extend(future.result())
+                except Exception as e:
+                    logger.error("Failed to retrieve memories for namespace %s: %s", futures[future], e)
+            return records
+
+    return BudgetedMemorySessionManager
@@ -0,0 +1,65 @@
+"""Request deadline carried from the Slack event down to the model calls.
+
+The ingress Lambda stamps each normalized event with ``deadline_ms`` (epoch
+milliseconds). invoke-agentcore clamps it to its own remaining Lambda time and
+forwards it in ``metadata["deadline_ms"]``. The orchestration checks the
+remaining budget before each stage and picks cheaper behaviour when it is
+tight:
+
+- "ok": normal flow
+- "tight": skip memory retrieval and cap the Conversation Agent's max_tokens
+- "exhausted": skip model calls and return a fallback result
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Literal, Optional
+
+# Remaining seconds below which the budget is "tight" / "exhausted"
+DEADLINE_TIGHT_SECONDS = float(os.environ.get("DEADLINE_TIGHT_SECONDS", "30"))
+DEADLINE_EXHAUSTED_SECONDS = float(os.environ.get("DEADLINE_EXHAUSTED_SECONDS", "5"))
+
+Budget = Literal["ok", "tight", "exhausted"]
+
+
+@dataclass(frozen=True, slots=True)
+class Deadline:
+    """An absolute deadline in epoch seconds with an injectable clock."""
+
+    expires_at: float
+    clock: Callable[[], float] = field(default=time.time, compare=False, repr=False)
+
+    @classmethod
+    def from_metadata(
+        cls,
+        metadata: dict,
+        clock: Callable[[], float] = time.time,
+    ) -> Optional["Deadline"]:
+        """Build a deadline from payload metadata, or None when it is absent or invalid."""
+        deadline_ms = metadata.get("deadline_ms")
+        if not isinstance(deadline_ms, (int, float)) or isinstance(deadline_ms, bool):
+            return None
+        return cls(expires_at=deadline_ms / 1000, clock=clock)
+
+    def remaining(self) -> float:
+        """Seconds left until the deadline (negative once it has passed)."""
+        return self.expires_at - self.clock()
+
+    def budget(
+        self,
+        tight_seconds: float = DEADLINE_TIGHT_SECONDS,
+        exhausted_seconds: float = DEADLINE_EXHAUSTED_SECONDS,
+    ) -> Budget:
+        """Classify the remaining time."""
+        remaining = self.remaining()
+        if remaining < exhausted_seconds:
+            return "exhausted"
+        if remaining < tight_seconds:
+            return "tight"
+        return "ok"
+
+
+def budget_of(deadline: Optional[Deadline]) -> Budget:
+    """Budget for an optional deadline (no deadline means "ok")."""
+    return deadline.budget() if deadline is not None else "ok"
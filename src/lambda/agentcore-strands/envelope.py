@@ -0,0 +1,61 @@
+"""Typed Slack message envelope passed from the handler to the orchestration.
+
+The routing code reads the Slack flags from typed fields instead of parsing them
+back out of the prompt text, so user text that happens to contain
+"Slack context:" or "is_mentioned: True" cannot change the routing decision.
+The prompt text for the agents is rendered once, at the model boundary.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+
+
+@dataclass(frozen=True)
+class MessageEnvelope:
+    """A Slack message plus the metadata the agents need."""
+
+    text: str
+    team_id: str = ""
+    channel_id: str = ""
+    user_id: str = ""
+    ts: str = ""
+    thread_ts: str = ""
+    is_mentioned: bool = False
+    is_dm: bool = False
+    channel_kind: str = "unknown"
+
+    @classmethod
+    def from_payload(cls, prompt: str, metadata: dict) -> "MessageEnvelope":
+        """Build an envelope from the AgentCore payload's prompt and metadata."""
+        slack_meta = metadata.get("slack") or {}
+        return cls(
+            text=prompt,
+            team_id=slack_meta.get("team_id") or "",
+            channel_id=slack_meta.get("channel_id") or "",
+            user_id=slack_meta.get("user_id") or "",
+            ts=slack_meta.get("ts") or "",
+            thread_ts=slack_meta.get("thread_ts") or "",
+            is_mentioned=slack_meta.get("is_mentioned") is True,
+            is_dm=slack_meta.get("is_dm") is True,
+            channel_kind=slack_meta.get("channel_kind") or "unknown",
+        )
+
+    @property
+    def is_in_thread(self) -> bool:
+        """True when the message is a thread reply rather than in channel main."""
+        return bool(self.thread_ts and self.thread_ts != self.ts)
+
+    @cached_property
+    def prompt(self) -> str:
+        """The user message with Slack context, as sent to the agents (rendered once)."""
+        return "\n".join(
+            [
+                f"User message: {self.text}",
+                "",
+                "Slack context:",
+                f"- is_mentioned: {self.is_mentioned}",
+                f"- is_dm: {self.is_dm}",
+                f"- channel_kind: {self.channel_kind}",
+                f"- is_in_thread: {self.is_in_thread}",
+            ]
+        )
@@ -6,16 +6,35 @@ This module provides simple if/else orchestration instead of Graph:
 
 Note: Strands Graph does not support session_manager on agent nodes yet,
 so we use manual orchestration to enable Memory functionality.
+
+Agents and the session manager they share are reused across invocations
+through agent_pool (one pooled entry per memory session) when the caller's
+session affinity routes the whole memory session to this container.
 """
 
 import logging
 import os
-from typing import Any, Literal, Optional
+import queue
+import threading
+import time
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Iterator, Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator
 from strands import Agent
-
-from agents import ROUTER_SYSTEM_PROMPT, CONVERSATION_SYSTEM_PROMPT
+from strands.models import BedrockModel
+
+from agent_pool import PooledSession, agent_pool, memory_classes
+from context_budget import budgeted_session_manager_class, retrieval_config
+from deadline import Budget, Deadline, budget_of
+from envelope import MessageEnvelope
+from prompt_loader import RenderedPrompt, prompt_registry
+from reply_cache import REPLY_CACHE_ENABLED, reply_cache, reply_scope
+from routing_cache import ROUTING_CACHE_ENABLED, fingerprint, routing_cache
+from routing_rules import get_routing_rules
+from speculation import SpeculativeCall, should_speculate
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +46,21 @@ CONVERSATION_MODEL_ID = os.environ.get(
     "CONVERSATION_MODEL_ID", "us.anthropic.claude-sonnet-4-5-20250514-v1:0"
 )
 
+# Conversation max_tokens when the deadline budget is tight
+TIGHT_MAX_TOKENS = int(os.environ.get("TIGHT_MAX_TOKENS", "1024"))
+
+# Reply sent to a mention/DM when there is no time left to call the models
+DEADLINE_FALLBACK_REPLY = "すみません、時間内にお返事を用意できませんでした。もう一度話しかけてもらえますか？"
+
+# Appended to the conversation prompt in streaming mode, where the reply text
+# itself is streamed to Slack instead of being wrapped in structured output
+STREAMING_REPLY_INSTRUCTION = """
+
+## Streaming Mode (overrides Output Format)
+Write ONLY the Slack message text itself, in plain Slack-friendly Markdown.
+Do NOT output JSON and do not add any text before or after the message.
+"""
+
 
 # Pydantic models for structured output
 class RouterResponse(BaseModel):
@@ -87,7 +121,7 @@ def _create_session_manager(
     session_id: Optional[str],
     actor_id: Optional[str],
 ) -> Optional[Any]:
-    """Create AgentCoreMemorySessionManager if memory_id is available.
+    """Create a BudgetedMemorySessionManager if memory_id is available.
 
     Memory strategy:
     - actor_id: team_id (team-wide long-term memory for facts/preferences)
@@ -99,105 +133,161 @@ def _create_session_manager(
         actor_id: Actor ID (team_id for team-wide memory)
 
     Returns:
-        AgentCoreMemorySessionManager instance or None
+        BudgetedMemorySessionManager instance (see context_budget.py) or None
     """
     if not memory_id:
         logger.info("No memory_id provided, memory disabled")
         return None
 
-    try:
-        from bedrock_agentcore.memory.integrations.strands.config import (
-            AgentCoreMemoryConfig,
-            RetrievalConfig,
-        )
-        from bedrock_agentcore.memory.integrations.strands.session_manager import (
-            AgentCoreMemorySessionManager,
-        )
+    classes = memory_classes()
+    session_manager_class = budgeted_session_manager_class()
+    if classes is None or session_manager_class is None:
+        logger.warning("bedrock_agentcore not available, memory disabled")
+        return None
+    AgentCoreMemoryConfig, RetrievalConfig, _ = classes
 
+    try:
         memory_config = AgentCoreMemoryConfig(
             memory_id=memory_id,
             session_id=session_id or "default_session",
             actor_id=actor_id or "default_actor",
-            retrieval_config={
-                "/preferences/{actorId}": RetrievalConfig(
-                    top_k=5, relevance_score=0.7
-                ),
-                "/facts/{actorId}": RetrievalConfig(
-                    top_k=10, relevance_score=0.3
-                ),
-                "/summaries/{actorId}/{sessionId}": RetrievalConfig(
-                    top_k=3, relevance_score=0.5
-                ),
-            },
+            # top_k per namespace derived from the memory context token budgets
+            retrieval_config=retrieval_config(RetrievalConfig),
         )
-        session_manager = AgentCoreMemorySessionManager(
+        session_manager = session_manager_class(
             agentcore_memory_config=memory_config,
             region_name=os.environ.get("AWS_REGION", "ap-northeast-1"),
         )
         logger.info(
-            "Created AgentCoreMemorySessionManager: memory_id=%s, session_id=%s, actor_id=%s",
+            "Created BudgetedMemorySessionManager: memory_id=%s, session_id=%s, actor_id=%s",
             memory_id,
             session_id,
             actor_id,
         )
         return session_manager
-    except ImportError:
-        logger.warning("bedrock_agentcore not available, memory disabled")
-        return None
     except Exception as e:
         logger.warning("Failed to create session manager: %s", e)
         return None
 
 
-def run_orchestration(
-    user_message: str,
-    memory_id: Optional[str] = None,
-    session_id: Optional[str] = None,
-    actor_id: Optional[str] = None,
-) -> dict:
-    """Run the 2-agent orchestration manually.
+@dataclass(frozen=True)
+class _Prompts:
+    """System prompts rendered for the message's team/channel."""
 
-    Flow:
-    0. Pre-filter short messages without mention
-    1. Call Router Agent (with session_manager) to decide action based on conversation flow
-    2. If ignore -> return Router's decision
-    3. If reply needed -> call Conversation Agent (with session_manager)
-    4. Return final result
+    router: RenderedPrompt
+    conversation: RenderedPrompt
 
-    Memory strategy:
-    - actor_id = team_id: Team-wide long-term memory
-    - session_id = channel_id: Channel-level short-term memory (includes threads)
+    @property
+    def version(self) -> tuple[str, str]:
+        """Identifies the prompts the pooled agents were built with."""
+        return (self.router.version, self.conversation.version)
 
-    Args:
-        user_message: The user's input message with context
-        memory_id: AgentCore Memory ID for session management
-        session_id: Session ID (channel_id for channel-level context)
-        actor_id: Actor ID (team_id for team-wide memory)
 
-    Returns:
-        dict with should_reply, route, reply_mode, typing_style, reply_text, reason
+def _prompts_for(envelope: MessageEnvelope) -> _Prompts:
+    """Current prompts for the message (memoized by the registry)."""
+    return _Prompts(
+        router=prompt_registry.render("router", envelope.team_id, envelope.channel_id),
+        conversation=prompt_registry.render("conversation", envelope.team_id, envelope.channel_id),
+    )
+
+
+def _build_router(system_prompt: str, session_manager: Optional[Any]) -> Agent:
+    """Router Agent (structured RouterResponse output)."""
+    return Agent(
+        name="router",
+        agent_id="router",
+        system_prompt=system_prompt,
+        model=ROUTER_MODEL_ID,
+        session_manager=session_manager,
+        structured_output_model=RouterResponse,
+        callback_handler=None,
+    )
+
+
+def _build_conversation(
+    system_prompt: str, session_manager: Optional[Any], model: Any = None
+) -> Agent:
+    """Conversation Agent (structured ConversationResponse output, default model if model is None)."""
+    return Agent(
+        name="conversation",
+        agent_id="conversation",
+        system_prompt=system_prompt,
+        model=model or CONVERSATION_MODEL_ID,
+        session_manager=session_manager,
+        structured_output_model=ConversationResponse,
+        callback_handler=None,
+    )
+
+
+def _build_streaming_conversation(
+    system_prompt: str, session_manager: Optional[Any], model: Any = None
+) -> Agent:
+    """Conversation Agent writing plain text; the callback handler is set per request."""
+    return Agent(
+        name="conversation",
+        agent_id="conversation_stream",
+        system_prompt=system_prompt + STREAMING_REPLY_INSTRUCTION,
+        model=model or CONVERSATION_MODEL_ID,
+        session_manager=session_manager,
+        callback_handler=None,
+    )
+
+
+def _checkout(
+    memory_id: Optional[str],
+    session_id: Optional[str],
+    actor_id: Optional[str],
+    prompts: _Prompts,
+    reuse_agents: bool,
+) -> AbstractContextManager[PooledSession]:
+    """Check out the pooled agents (and shared session manager) for this memory session."""
+    return agent_pool.checkout(
+        (memory_id, session_id, actor_id, prompts.version),
+        lambda: _create_session_manager(memory_id, session_id, actor_id),
+        reuse=reuse_agents,
+    )
+
+
+def _set_memory_route(pooled: PooledSession, route: Optional[str]) -> None:
+    """Tell the shared session manager which route the next Conversation call serves.
+
+    The route selects the memory context token budget (see context_budget.py).
     """
-    default_result = {
-        "should_reply": False,
-        "route": "ignore",
-        "reply_mode": "thread",
-        "typing_style": "none",
-        "reply_text": "",
-        "reason": "Error during orchestration",
+    session_manager = pooled.session_manager
+    if session_manager is not None:
+        session_manager.route = route
+
+
+def _deadline_fallback(
+    should_reply: bool,
+    reply_mode: str = "thread",
+    typing_style: str = "none",
+) -> dict:
+    """Result returned instead of calling the models once the deadline budget is exhausted."""
+    return {
+        "should_reply": should_reply,
+        "route": "simple_reply" if should_reply else "ignore",
+        "reply_mode": reply_mode,
+        "typing_style": typing_style,
+        "reply_text": DEADLINE_FALLBACK_REPLY if should_reply else "",
+        "reason": "Deadline budget exhausted",
     }
 
-    # ========================================
-    # Step 0: Pre-filter short messages
-    # ========================================
-    # Extract just the user text (before "Slack context:")
-    text_only = user_message.split("\n\nSlack context:")[0].replace("User message: ", "").strip()
 
-    # Check if mentioned (from context)
-    is_mentioned = "is_mentioned: True" in user_message
+def _conversation_model(budget: Budget) -> Any:
+    """Conversation model, with a capped max_tokens when the budget is tight."""
+    if budget == "tight":
+        return BedrockModel(model_id=CONVERSATION_MODEL_ID, max_tokens=TIGHT_MAX_TOKENS)
+    return CONVERSATION_MODEL_ID
+
+
+def _prefilter(envelope: MessageEnvelope) -> Optional[dict]:
+    """Return an ignore result for messages that never need the Router, else None."""
+    text_only = envelope.text.strip()
 
     # Short messages (1-3 chars) without mention → immediate ignore
     # This avoids Router Agent timeout due to structured output validation failures
-    if len(text_only) <= 3 and not is_mentioned:
+    if len(text_only) <= 3 and not envelope.is_mentioned:
         logger.info(
             "Pre-filter: Short message (%d chars) without mention, skipping Router",
             len(text_only),
@@ -210,33 +300,76 @@ def run_orchestration(
             "reply_text": "",
             "reason": "短いメッセージのため自動スキップ",
         }
+    return None
+
+
+def _apply_routing_rules(envelope: MessageEnvelope) -> Optional[RouterResponse]:
+    """Router decision from the deterministic routing rules, or None to ask the Router Agent."""
+    decision = get_routing_rules().evaluate(envelope)
+    if decision is None:
+        return None
+    logger.info(
+        "Routing rule %s matched: should_reply=%s, route=%s",
+        decision.rule,
+        decision.should_reply,
+        decision.route,
+    )
+    return RouterResponse(
+        should_reply=decision.should_reply,
+        route=decision.route,
+        reply_mode=decision.reply_mode,
+        typing_style=decision.typing_style,
+        reason=f"ルール {decision.rule} により判定",
+    )
+
+
+def _screen(envelope: MessageEnvelope) -> tuple[Optional[dict], Optional[RouterResponse]]:
+    """Step 0: (pre-filter result, None), (None, rule decision), or (None, None) to ask the Router.
+
+    Evaluated once per message; the result is shared by the speculation gate and _route.
+    """
+    prefiltered = _prefilter(envelope)
+    if prefiltered is not None:
+        return prefiltered, None
+    return None, _apply_routing_rules(envelope)
+
+
+def _call_router(
+    envelope: MessageEnvelope,
+    pooled: PooledSession,
+    prompts: _Prompts,
+    budget: Budget,
+) -> tuple[Optional[RouterResponse], Optional[dict]]:
+    """Call the Router Agent (with Memory for conversation context).
+
+    Returns:
+        (router_output, None) on success, (None, error_result) on failure
+    """
+    default_result = {
+        "should_reply": False,
+        "route": "ignore",
+        "reply_mode": "thread",
+        "typing_style": "none",
+        "reply_text": "",
+        "reason": "Error during orchestration",
+    }
 
-    # ========================================
-    # Step 1: Call Router Agent (with Memory for conversation context)
-    # ========================================
     try:
-        logger.info("Step 1: Calling Router Agent...")
-
-        # Create session manager for memory - Router needs conversation context
-        # to make better decisions about whether/how to reply
-        router_session_manager = _create_session_manager(memory_id, session_id, actor_id)
-
-        router = Agent(
-            name="router",
-            system_prompt=ROUTER_SYSTEM_PROMPT,
-            model=ROUTER_MODEL_ID,
-            session_manager=router_session_manager,
-            structured_output_model=RouterResponse,
-            callback_handler=None,
-        )
+        logger.info("Step 1: Calling Router Agent (budget=%s)...", budget)
 
-        router_result = router(user_message)
+        # Pooled router with the session's memory - Router needs conversation context
+        # to make better decisions about whether/how to reply.
+        # Memory retrieval is skipped when the deadline budget is tight.
+        build_router = partial(_build_router, prompts.router.text)
+        router = build_router(None) if budget == "tight" else pooled.agent("router", build_router)
+
+        router_result = router(envelope.prompt)
 
         # Get structured output
         if not hasattr(router_result, "structured_output") or router_result.structured_output is None:
             logger.error("Router Agent did not return structured output")
             default_result["reason"] = "Router failed to return structured output"
-            return default_result
+            return None, default_result
 
         router_output: RouterResponse = router_result.structured_output
         logger.info(
@@ -245,18 +378,87 @@ def run_orchestration(
             router_output.route,
             router_output.reason,
         )
+        return router_output, None
 
     except Exception as e:
+        pooled.mark_failed()
         logger.error("Router Agent failed: %s", e, exc_info=True)
         default_result["reason"] = f"Router Agent error: {str(e)}"
-        return default_result
+        return None, default_result
+
+
+def _reply_cache_scope(envelope: MessageEnvelope, prompts: _Prompts) -> Optional[tuple]:
+    """Reply cache scope for the message, or None when the cache is disabled."""
+    if not REPLY_CACHE_ENABLED:
+        return None
+    return reply_scope(envelope.team_id, envelope.channel_id, prompts.conversation.version)
+
+
+def _routing_cache_key(envelope: MessageEnvelope, prompts: _Prompts) -> Optional[str]:
+    """Routing cache key for the message, or None when the cache does not apply."""
+    if not ROUTING_CACHE_ENABLED or routing_cache.bypasses(envelope):
+        return None
+    return fingerprint(envelope, prompts.router.version)
+
+
+def _route(
+    envelope: MessageEnvelope,
+    pooled: PooledSession,
+    prompts: _Prompts,
+    deadline: Optional[Deadline] = None,
+    screened: Optional[tuple[Optional[dict], Optional[RouterResponse]]] = None,
+) -> tuple[Optional[RouterResponse], Optional[dict]]:
+    """Run the pre-filter, the routing rules, the routing cache and the Router Agent (Steps 0-2).
+
+    Args:
+        screened: Step 0 result from _screen when the caller already has it
+
+    Returns:
+        (router_output, None) when a reply should be generated,
+        (None, final_result) when the orchestration should stop here
+    """
+    # ========================================
+    # Step 0: Pre-filter short messages and apply the routing rules
+    # ========================================
+    prefiltered, router_output = screened or _screen(envelope)
+    if prefiltered is not None:
+        return None, prefiltered
+
+    # No time left for a model call: reply with a fallback only when addressed (mention or DM)
+    budget = budget_of(deadline)
+    if budget == "exhausted" and (router_output is None or router_output.should_reply):
+        logger.warning(
+            "Deadline budget exhausted before routing (remaining=%.1fs)", deadline.remaining()
+        )
+        return None, _deadline_fallback(should_reply=envelope.is_mentioned or envelope.is_dm)
+
+    # ========================================
+    # Step 1: Call Router Agent unless a rule or the routing cache already decided
+    # ========================================
+    if router_output is None:
+        cache_key = _routing_cache_key(envelope, prompts)
+        cached = routing_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            router_output = RouterResponse(**cached)
+            logger.info(
+                "Routing cache hit: should_reply=%s, route=%s (hit_rate=%.2f)",
+                router_output.should_reply,
+                router_output.route,
+                routing_cache.hit_rate(),
+            )
+        else:
+            router_output, error_result = _call_router(envelope, pooled, prompts, budget)
+            if error_result is not None:
+                return None, error_result
+            if cache_key:
+                routing_cache.put(cache_key, router_output.model_dump())
 
     # ========================================
     # Step 2: Check Router's decision
     # ========================================
     if not router_output.should_reply or router_output.route == "ignore":
         logger.info("Router decided to ignore, returning early")
-        return {
+        return None, {
             "should_reply": router_output.should_reply,
             "route": router_output.route,
             "reply_mode": router_output.reply_mode,
@@ -265,25 +467,130 @@ def run_orchestration(
             "reason": router_output.reason,
         }
 
+    return router_output, None
+
+
+def run_orchestration(
+    envelope: MessageEnvelope,
+    memory_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    actor_id: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+    reuse_agents: bool = False,
+) -> dict:
+    """Run the 2-agent orchestration manually.
+
+    Flow:
+    0. Pre-filter short messages without mention, then apply the routing rules
+    1. Call Router Agent (unless a rule decided) (with session_manager) to decide action based on conversation flow
+    2. If ignore -> return Router's decision
+    3. If reply needed -> call Conversation Agent (with session_manager)
+    4. Return final result
+
+    Memory strategy:
+    - actor_id = team_id: Team-wide long-term memory
+    - session_id = channel_id: Channel-level short-term memory (includes threads)
+
+    Each step checks the deadline budget (see deadline.py): a tight budget skips
+    memory retrieval and caps max_tokens, an exhausted one returns a fallback.
+
+    Args:
+        envelope: The Slack message and its metadata
+        memory_id: AgentCore Memory ID for session management
+        session_id: Session ID (channel_id for channel-level context)
+        actor_id: Actor ID (team_id for team-wide memory)
+        deadline: Request deadline propagated from the Slack event
+        reuse_agents: Reuse pooled agents (only safe when the whole memory
+            session is routed to this container, see agent_pool.py)
+
+    Returns:
+        dict with should_reply, route, reply_mode, typing_style, reply_text, reason
+    """
+    prompts = _prompts_for(envelope)
+    with _checkout(memory_id, session_id, actor_id, prompts, reuse_agents) as pooled:
+        return _run_orchestration(envelope, pooled, prompts, deadline)
+
+
+def _run_orchestration(
+    envelope: MessageEnvelope,
+    pooled: PooledSession,
+    prompts: _Prompts,
+    deadline: Optional[Deadline],
+) -> dict:
+    """Orchestration body for run_orchestration, using the checked-out agents."""
+    # A repeated question is answered from the reply cache instead of the Conversation Agent
+    scope = _reply_cache_scope(envelope, prompts)
+    cached = reply_cache.lookup(scope, envelope.text) if scope else None
+
+    # Start the Conversation Agent alongside the Router when a reply is all but certain
+    screened = _screen(envelope)
+    speculative = None
+    if (
+        cached is None
+        and budget_of(deadline) == "ok"
+        and screened == (None, None)
+        and should_speculate(envelope)
+    ):
+        logger.info("Starting speculative Conversation Agent")
+        # Runs alongside the Router, so it gets its own session manager. Both are built
+        # inside the speculative call, keeping the Memory restore off the Router's path.
+        # The pooled conversation agent misses this turn, so the entry is not returned
+        pooled.discard()
+        build_conversation = partial(_build_conversation, prompts.conversation.text)
+        speculative = SpeculativeCall(
+            lambda: build_conversation(pooled.detached_session_manager())(envelope.prompt)
+        )
+
+    router_started_at = time.monotonic()
+    router_output, early_result = _route(envelope, pooled, prompts, deadline, screened)
+    router_seconds = time.monotonic() - router_started_at
+
+    budget = budget_of(deadline)
+    if early_result is None and budget == "exhausted":
+        logger.warning("Deadline budget exhausted after routing, sending fallback reply")
+        early_result = _deadline_fallback(
+            True, router_output.reply_mode, router_output.typing_style
+        )
+
+    if early_result is not None:
+        if speculative is not None:
+            speculative.discard(early_result["reason"])
+        return early_result
+
+    if cached is not None:
+        cached_reply, similarity = cached
+        logger.info("Reply cache hit: similarity=%.3f", similarity)
+        return {
+            **cached_reply,
+            "route": router_output.route,
+            "reply_mode": router_output.reply_mode,
+            "typing_style": router_output.typing_style,
+            "reason": "類似の質問への回答をキャッシュから返信",
+        }
+
     # ========================================
     # Step 3: Call Conversation Agent (with Memory)
     # ========================================
     try:
-        logger.info("Step 3: Calling Conversation Agent (route=%s)...", router_output.route)
-
-        # Create session manager for memory
-        session_manager = _create_session_manager(memory_id, session_id, actor_id)
-
-        conversation = Agent(
-            name="conversation",
-            system_prompt=CONVERSATION_SYSTEM_PROMPT,
-            model=CONVERSATION_MODEL_ID,
-            session_manager=session_manager,
-            structured_output_model=ConversationResponse,
-            callback_handler=None,
+        logger.info(
+            "Step 3: Calling Conversation Agent (route=%s, budget=%s)...",
+            router_output.route,
+            budget,
         )
 
-        conversation_result = conversation(user_message)
+        if speculative is not None:
+            conversation_result = speculative.result(router_seconds)
+        else:
+            # Pooled agent sharing the router's session manager
+            # (without memory and with capped max_tokens when the budget is tight)
+            build_conversation = partial(_build_conversation, prompts.conversation.text)
+            if budget == "tight":
+                conversation = build_conversation(None, _conversation_model(budget))
+            else:
+                _set_memory_route(pooled, router_output.route)
+                conversation = pooled.agent("conversation", build_conversation)
+
+            conversation_result = conversation(envelope.prompt)
 
         # Get structured output
         if not hasattr(conversation_result, "structured_output") or conversation_result.structured_output is None:
@@ -304,9 +611,14 @@ def run_orchestration(
             len(conversation_output.reply_text),
         )
 
+        # Only full-budget replies are cached (tight ones lack memory and are truncated)
+        if scope and budget == "ok" and conversation_output.should_reply and conversation_output.reply_text:
+            reply_cache.store(scope, envelope.text, conversation_output.model_dump())
+
         return conversation_output.model_dump()
 
     except Exception as e:
+        pooled.mark_failed()
         logger.error("Conversation Agent failed: %s", e, exc_info=True)
         # Fall back to router's decision with error reason
         return {
@@ -317,3 +629,128 @@ def run_orchestration(
             "reply_text": "",
             "reason": f"Conversation Agent error: {str(e)}",
         }
+
+
+def stream_orchestration(
+    envelope: MessageEnvelope,
+    memory_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    actor_id: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+    reuse_agents: bool = False,
+) -> Iterator[dict]:
+    """Run the orchestration and stream the Conversation Agent's reply.
+
+    Yields, in order:
+    - {"type": "route", ...}: the Router decided to reply (reply_mode, typing_style)
+    - {"type": "reply_delta", "text": ...}: reply text chunks as the model generates them
+    - the final result dict (same shape as run_orchestration's return value)
+
+    In streaming mode the Conversation Agent writes plain text instead of
+    structured output so that tokens can be forwarded as they arrive.
+
+    Args:
+        envelope: The Slack message and its metadata
+        memory_id: AgentCore Memory ID for session management
+        session_id: Session ID (channel_id for channel-level context)
+        actor_id: Actor ID (team_id for team-wide memory)
+        deadline: Request deadline propagated from the Slack event
+        reuse_agents: Reuse pooled agents (see run_orchestration)
+    """
+    prompts = _prompts_for(envelope)
+    with _checkout(memory_id, session_id, actor_id, prompts, reuse_agents) as pooled:
+        yield from _stream_orchestration(envelope, pooled, prompts, deadline)
+
+
+def _stream_orchestration(
+    envelope: MessageEnvelope,
+    pooled: PooledSession,
+    prompts: _Prompts,
+    deadline: Optional[Deadline],
+) -> Iterator[dict]:
+    """Orchestration body for stream_orchestration, using the checked-out agents."""
+    router_output, early_result = _route(envelope, pooled, prompts, deadline)
+    if early_result is not None:
+        yield early_result
+        return
+
+    budget = budget_of(deadline)
+    if budget == "exhausted":
+        logger.warning("Deadline budget exhausted after routing, sending fallback reply")
+        yield _deadline_fallback(True, router_output.reply_mode, router_output.typing_style)
+        return
+
+    yield {
+        "type": "route",
+        "route": router_output.route,
+        "reply_mode": router_output.reply_mode,
+        "typing_style": router_output.typing_style,
+    }
+
+    logger.info(
+        "Step 3: Streaming Conversation Agent (route=%s, budget=%s)...",
+        router_output.route,
+        budget,
+    )
+
+    chunks: queue.Queue = queue.Queue()
+    outcome: dict[str, Any] = {}
+
+    def on_event(**kwargs: Any) -> None:
+        data = kwargs.get("data")
+        if data:
+            chunks.put(data)
+
+    def run_conversation() -> None:
+        try:
+            build_conversation = partial(_build_streaming_conversation, prompts.conversation.text)
+            if budget == "tight":
+                conversation = build_conversation(None, _conversation_model(budget))
+            else:
+                _set_memory_route(pooled, router_output.route)
+                conversation = pooled.agent("conversation_stream", build_conversation)
+            conversation.callback_handler = on_event
+            outcome["result"] = conversation(envelope.prompt)
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            chunks.put(None)
+
+    worker = threading.Thread(target=run_conversation, daemon=True)
+    worker.start()
+
+    reply_parts = []
+    try:
+        while (chunk := chunks.get()) is not None:
+            reply_parts.append(chunk)
+            yield {"type": "reply_delta", "text": chunk}
+    finally:
+        if worker.is_alive():
+            # The consumer went away mid-reply; the agent is still running in the
+            # worker, so the entry must not go back to the pool
+            pooled.mark_failed()
+    worker.join()
+
+    reply_text = "".join(reply_parts).strip()
+    if "error" in outcome or not reply_text:
+        error = outcome.get("error")
+        if error is not None:
+            pooled.mark_failed()
+            logger.error("Conversation Agent failed: %s", error, exc_info=error)
+        yield {
+            "should_reply": router_output.should_reply,
+            "route": router_output.route,
+            "reply_mode": router_output.reply_mode,
+            "typing_style": router_output.typing_style,
+            "reply_text": "",
+            "reason": f"Conversation Agent error: {error}" if error else "Empty streamed reply",
+        }
+        return
+
+    logger.info("Conversation streamed: reply_text_length=%d", len(reply_text))
+    yield ConversationResponse(
+        reply_mode=router_output.reply_mode,
+        typing_style=router_output.typing_style,
+        reply_text=reply_text,
+        reason=router_output.reason,
+    ).model_dump()
@@ -4,7 +4,7 @@ AgentCore Runtime will call into this handler when invoked via the
 InvokeAgentRuntime API from Step Functions.
 
 This handler:
-1. Parses the prompt and metadata from the payload
+1. Parses the prompt and metadata from the payload into a MessageEnvelope
 2. Derives actor_id (team_id) and session_id (channel_id)
 3. Runs the 2-agent orchestration (Router -> Conversation)
 4. Returns the final JSON result for the Slack Posting Lambda
@@ -12,17 +12,28 @@ This handler:
 Memory strategy:
 - actor_id = team_id: Team-wide long-term memory (facts, preferences)
 - session_id = channel_id: Channel-level short-term memory (conversation context)
+
+Startup: the orchestration (strands, pydantic, Memory integration) and the SSM
+prompts are not needed to start serving, so the server starts first and a
+background thread preloads them; a request arriving earlier waits for the same
+import instead of repeating it. Profile with ``python -X importtime``.
 """
 
 import logging
 import os
+import threading
+import time
+from typing import Iterator
 
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
 
-from graph import run_orchestration
+from deadline import Deadline
+from envelope import MessageEnvelope
+from log_utils import bind_correlation_ids, install
 
-# Configure logging
+# Configure logging; records carry the request's channel_id/ts (see log_utils.py)
 logging.basicConfig(level=logging.INFO)
+install(logging.getLogger())
 logger = logging.getLogger(__name__)
 
 # Environment variables
@@ -54,38 +65,60 @@ def _derive_ids_from_metadata(metadata: dict) -> dict:
     }
 
 
-def _build_user_message(prompt: str, metadata: dict) -> str:
-    """Build the user message with Slack context for the agents."""
-    slack_meta = metadata.get("slack", {})
-
-    # Determine if the message is in a thread or channel main
-    ts = slack_meta.get("ts", "")
-    thread_ts = slack_meta.get("thread_ts", "")
-    # If thread_ts differs from ts, message is in a thread
-    # If they're the same or thread_ts is empty, message is in channel main
-    is_in_thread = bool(thread_ts and thread_ts != ts)
+def _reuse_agents(metadata: dict) -> bool:
+    """Pooled agents stay current only when the whole channel comes to this session.
 
-    context_parts = [
-        f"User message: {prompt}",
-        "",
-        "Slack context:",
-        f"- is_mentioned: {slack_meta.get('is_mentioned', False)}",
-        f"- is_dm: {slack_meta.get('is_dm', False)}",
-        f"- channel_kind: {slack_meta.get('channel_kind', 'unknown')}",
-        f"- is_in_thread: {is_in_thread}",
-    ]
+    The memory session is the channel; invoke-agentcore sends the runtime
+    session affinity it used (thread affinity spreads a channel's threads over
+    several containers).
+    """
+    return metadata.get("session_affinity") == "channel"
+
+
+def _stream_reply(
+    envelope: MessageEnvelope,
+    session_id: str,
+    actor_id: str,
+    deadline: Deadline | None = None,
+    reuse_agents: bool = False,
+) -> Iterator[dict]:
+    """Stream orchestration events; the runtime sends each one as an SSE data line."""
+    # The runtime iterates the generator outside the invoke call's context
+    bind_correlation_ids(channel_id=envelope.channel_id, ts=envelope.ts)
+    try:
+        from graph import stream_orchestration
 
-    return "\n".join(context_parts)
+        yield from stream_orchestration(
+            envelope=envelope,
+            memory_id=AGENTCORE_MEMORY_ID if AGENTCORE_MEMORY_ID else None,
+            session_id=session_id,
+            actor_id=actor_id,
+            deadline=deadline,
+            reuse_agents=reuse_agents,
+        )
+    except Exception as e:
+        logger.error("Error during streaming orchestration: %s", str(e), exc_info=True)
+        yield {
+            "should_reply": False,
+            "route": "ignore",
+            "reply_mode": "thread",
+            "typing_style": "none",
+            "reply_text": "",
+            "reason": f"Error: {str(e)}",
+        }
 
 
 @app.entrypoint
-def invoke(payload: dict) -> dict:
+def invoke(payload: dict) -> dict | Iterator[dict]:
     """Main AgentCore Runtime handler.
 
     Expected payload structure from Step Functions:
     {
         "prompt": "user message text",
+        "stream": false,
         "metadata": {
+            "deadline_ms": 1700000000000,
+            "session_affinity": "thread",
             "slack": {
                 "team_id": "...",
                 "channel_id": "...",
@@ -100,13 +133,17 @@ def invoke(payload: dict) -> dict:
     }
 
     Returns:
-        Dict with should_reply, route, reply_mode, typing_style, reply_text, reason
+        Dict with should_reply, route, reply_mode, typing_style, reply_text, reason.
+        When "stream" is true, a generator of streaming events instead
+        (see graph.stream_orchestration); the final event is that same dict.
     """
     logger.info("AgentCore handler invoked with payload keys: %s", list(payload.keys()))
 
     # Extract prompt and metadata
     prompt = payload.get("prompt", "")
     metadata = payload.get("metadata", {})
+    slack_meta = metadata.get("slack", {})
+    bind_correlation_ids(channel_id=slack_meta.get("channel_id"), ts=slack_meta.get("ts"))
 
     if not prompt:
         logger.warning("Empty prompt received")
@@ -131,17 +168,31 @@ def invoke(payload: dict) -> dict:
         len(prompt),
     )
 
+    # Request deadline (epoch ms) propagated from the Slack event, if any
+    deadline = Deadline.from_metadata(metadata)
+    if deadline is not None:
+        logger.info("Deadline remaining: %.1fs", deadline.remaining())
+
+    # Typed Slack message; the prompt text is rendered once when the agents run
+    envelope = MessageEnvelope.from_payload(prompt, metadata)
+
+    reuse_agents = _reuse_agents(metadata)
+
+    if payload.get("stream"):
+        return _stream_reply(envelope, session_id, actor_id, deadline, reuse_agents)
+
     try:
-        # Build user message with context
-        user_message = _build_user_message(prompt, metadata)
+        from graph import run_orchestration
 
         # Run the 2-agent orchestration (Router -> Conversation)
         logger.info("Running orchestration...")
         final_result = run_orchestration(
-            user_message=user_message,
+            envelope=envelope,
             memory_id=AGENTCORE_MEMORY_ID if AGENTCORE_MEMORY_ID else None,
             session_id=session_id,
             actor_id=actor_id,
+            deadline=deadline,
+            reuse_agents=reuse_agents,
         )
 
         logger.info(
@@ -164,5 +215,28 @@ def invoke(payload: dict) -> dict:
         }
 
 
+def _preload() -> None:
+    """Import the orchestration and load the prompts off the startup path."""
+    started = time.perf_counter()
+    try:
+        import graph  # noqa: F401
+        from prompt_loader import prompt_registry
+
+        prompt_registry.refresh()
+        logger.info("Preloaded orchestration in %.2fs", time.perf_counter() - started)
+    except Exception as e:
+        logger.warning("Preload failed, loading on the first request instead: %s", e)
+
+    # Pick up prompt changes in SSM without restarting the container; started
+    # even when the preload failed, so a failed first load is retried
+    try:
+        from prompt_loader import prompt_registry
+
+        prompt_registry.start_background_refresh()
+    except Exception as e:
+        logger.warning("Failed to start the background prompt refresh: %s", e)
+
+
 if __name__ == "__main__":
+    threading.Thread(target=_preload, name="preload", daemon=True).start()
     app.run()
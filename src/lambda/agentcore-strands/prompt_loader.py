@@ -2,45 +2,107 @@
 
 Loads system prompts from SSM Parameter Store at runtime with fallback to defaults.
 Uses aws-lambda-powertools cache to reduce API calls.
+
+PromptRegistry keeps the current prompts as versioned templates (version = hash
+of the text), reloads them in a background thread so SSM changes take effect
+without a restart, and renders them with per-team/per-channel variables
+(string.Template ``$name`` placeholders). Rendered prompts are memoized per
+(template version, variables, team, channel), so the hot path is a dict lookup.
+A failed reload keeps the last loaded prompt; the default prompts are used only
+until the first successful load.
+
+Prompt variables (SSM_PROMPT_VARIABLES, JSON)::
+
+    {"default": {"bot_name": "..."}, "teams": {"T0123": {...}}, "channels": {"C0123": {...}}}
+
+Channel values override team values, which override the defaults. Prompts are
+used verbatim when no variables apply.
 """
 
+import hashlib
+import json
 import logging
 import os
+import string
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Mapping, Optional
 
 from aws_lambda_powertools.utilities.parameters import get_parameter
 
 logger = logging.getLogger(__name__)
 
+# Seconds between background reloads of the prompts and prompt variables
+PROMPT_REFRESH_SECONDS = float(os.environ.get("PROMPT_REFRESH_SECONDS", "300"))
+
+# Rendered prompts kept before the memo is cleared
+_MAX_RENDERED_PROMPTS = 4096
+
+
+def _default_router_prompt() -> str:
+    from agents.router_agent import _DEFAULT_ROUTER_SYSTEM_PROMPT
+
+    return _DEFAULT_ROUTER_SYSTEM_PROMPT
 
-def get_router_system_prompt() -> str:
-    """Get Router Agent system prompt from SSM or fallback to default.
+
+def _default_conversation_prompt() -> str:
+    from agents.conversation_agent import _DEFAULT_CONVERSATION_SYSTEM_PROMPT
+
+    return _DEFAULT_CONVERSATION_SYSTEM_PROMPT
+
+
+def load_router_system_prompt() -> str:
+    """Load the Router Agent system prompt from SSM (the default when not configured).
 
     Environment:
         SSM_ROUTER_SYSTEM_PROMPT: SSM parameter name (optional)
 
-    Returns:
-        str: Router system prompt
+    Raises:
+        Exception: When the parameter cannot be loaded
     """
     param_name = os.environ.get("SSM_ROUTER_SYSTEM_PROMPT")
     if not param_name:
         logger.info("SSM_ROUTER_SYSTEM_PROMPT not set, using default prompt")
-        from agents.router_agent import _DEFAULT_ROUTER_SYSTEM_PROMPT
+        return _default_router_prompt()
+
+    prompt = get_parameter(param_name, max_age=300)
+    logger.info("Loaded router prompt from SSM: %s", param_name)
+    return prompt
+
+
+def load_conversation_system_prompt() -> str:
+    """Load the Conversation Agent system prompt from SSM (the default when not configured).
 
-        return _DEFAULT_ROUTER_SYSTEM_PROMPT
+    Environment:
+        SSM_CONVERSATION_SYSTEM_PROMPT: SSM parameter name (optional)
+
+    Raises:
+        Exception: When the parameter cannot be loaded
+    """
+    param_name = os.environ.get("SSM_CONVERSATION_SYSTEM_PROMPT")
+    if not param_name:
+        logger.info("SSM_CONVERSATION_SYSTEM_PROMPT not set, using default prompt")
+        return _default_conversation_prompt()
+
+    prompt = get_parameter(param_name, max_age=300)
+    logger.info("Loaded conversation prompt from SSM: %s", param_name)
+    return prompt
 
+
+def get_router_system_prompt() -> str:
+    """Get Router Agent system prompt from SSM or fallback to default.
+
+    Environment:
+        SSM_ROUTER_SYSTEM_PROMPT: SSM parameter name (optional)
+
+    Returns:
+        str: Router system prompt
+    """
     try:
-        prompt = get_parameter(param_name, max_age=300)
-        logger.info("Loaded router prompt from SSM: %s", param_name)
-        return prompt
+        return load_router_system_prompt()
     except Exception as e:
-        logger.warning(
-            "Failed to load router prompt from SSM (%s): %s, using default",
-            param_name,
-            e,
-        )
-        from agents.router_agent import _DEFAULT_ROUTER_SYSTEM_PROMPT
-
-        return _DEFAULT_ROUTER_SYSTEM_PROMPT
+        logger.warning("Failed to load router prompt from SSM: %s, using default", e)
+        return _default_router_prompt()
 
 
 def get_conversation_system_prompt() -> str:
@@ -52,29 +114,208 @@ def get_conversation_system_prompt() -> str:
     Returns:
         str: Conversation system prompt
     """
-    param_name = os.environ.get("SSM_CONVERSATION_SYSTEM_PROMPT")
+    try:
+        return load_conversation_system_prompt()
+    except Exception as e:
+        logger.warning("Failed to load conversation prompt from SSM: %s, using default", e)
+        return _default_conversation_prompt()
+
+
+def get_prompt_variables() -> dict:
+    """Get prompt template variables from SSM ({} when SSM_PROMPT_VARIABLES is not set).
+
+    Environment:
+        SSM_PROMPT_VARIABLES: SSM parameter name (optional)
+
+    Raises:
+        Exception: When the parameter cannot be loaded or is not valid JSON
+    """
+    param_name = os.environ.get("SSM_PROMPT_VARIABLES")
     if not param_name:
-        logger.info("SSM_CONVERSATION_SYSTEM_PROMPT not set, using default prompt")
-        from agents.conversation_agent import _DEFAULT_CONVERSATION_SYSTEM_PROMPT
+        return {}
+    return json.loads(get_parameter(param_name, max_age=300))
 
-        return _DEFAULT_CONVERSATION_SYSTEM_PROMPT
 
-    try:
-        prompt = get_parameter(param_name, max_age=300)
-        logger.info("Loaded conversation prompt from SSM: %s", param_name)
-        return prompt
-    except Exception as e:
-        logger.warning(
-            "Failed to load conversation prompt from SSM (%s): %s, using default",
-            param_name,
-            e,
+def _version(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A prompt text compiled once, identified by the hash of its text."""
+
+    name: str
+    text: str
+    version: str
+    template: string.Template = field(compare=False, repr=False)
+
+    @classmethod
+    def compile(cls, name: str, text: str) -> "PromptTemplate":
+        return cls(name=name, text=text, version=_version(text), template=string.Template(text))
+
+    def render(self, variables: Mapping[str, str]) -> str:
+        """Substitute $placeholders (unknown ones are left as is; no variables -> text verbatim)."""
+        return self.template.safe_substitute(variables) if variables else self.text
+
+
+@dataclass(frozen=True)
+class RenderedPrompt:
+    """A prompt rendered for one team/channel and the version identifying it."""
+
+    text: str
+    version: str
+
+
+class PromptRegistry:
+    """Versioned prompt templates with background reload and memoized rendering.
+
+    Args:
+        loaders: Prompt loaders by name (raising when the prompt cannot be loaded)
+        variables_loader: Loads the prompt variables
+        refresh_seconds: Seconds between background reloads
+        defaults: Prompts used when a loader fails before its first successful load
+    """
+
+    def __init__(
+        self,
+        loaders: Mapping[str, Callable[[], str]],
+        variables_loader: Callable[[], dict] = get_prompt_variables,
+        refresh_seconds: float = PROMPT_REFRESH_SECONDS,
+        defaults: Optional[Mapping[str, Callable[[], str]]] = None,
+    ) -> None:
+        self._loaders = dict(loaders)
+        self._defaults = dict(defaults or {})
+        self._variables_loader = variables_loader
+        self._refresh_seconds = refresh_seconds
+        self._templates: dict[str, PromptTemplate] = {}
+        self._variables: dict = {}
+        self._variables_version = ""
+        self._rendered: dict[tuple, RenderedPrompt] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> bool:
+        """Reload all templates and variables; returns True when anything changed.
+
+        A prompt that fails to load keeps its current template, so a transient
+        SSM error does not swap in the default and bump the version.
+        """
+        templates = {}
+        for name, loader in self._loaders.items():
+            try:
+                templates[name] = loader()
+            except Exception as e:
+                current = self._templates.get(name)
+                if current is not None:
+                    logger.warning(
+                        "Failed to load %s prompt, keeping version %s: %s", name, current.version, e
+                    )
+                    continue
+                if name not in self._defaults:
+                    raise
+                logger.warning("Failed to load %s prompt, using the default: %s", name, e)
+                templates[name] = self._defaults[name]()
+        try:
+            variables = self._variables_loader()
+            variables_version = _version(json.dumps(variables, sort_keys=True))
+        except Exception as e:
+            logger.warning("Failed to load prompt variables, keeping previous ones: %s", e)
+            variables, variables_version = self._variables, self._variables_version
+
+        with self._lock:
+            changed = variables_version != self._variables_version
+            for name, text in templates.items():
+                current = self._templates.get(name)
+                if current is None or current.text != text:
+                    self._templates[name] = PromptTemplate.compile(name, text)
+                    logger.info(
+                        "Loaded %s prompt version %s", name, self._templates[name].version
+                    )
+                    changed = True
+            self._variables = variables
+            self._variables_version = variables_version
+            if changed:
+                self._rendered.clear()
+        return changed
+
+    def template(self, name: str) -> PromptTemplate:
+        """Current template for name (loaded on first use)."""
+        template = self._templates.get(name)
+        if template is None:
+            self.refresh()
+            template = self._templates[name]
+        return template
+
+    def render(self, name: str, team_id: str = "", channel_id: str = "") -> RenderedPrompt:
+        """The prompt for a team/channel, rendered once per template and variables version."""
+        template = self.template(name)
+        key = (name, template.version, self._variables_version, team_id, channel_id)
+        rendered = self._rendered.get(key)
+        if rendered is None:
+            text = template.render(self._scope_variables(team_id, channel_id))
+            rendered = RenderedPrompt(
+                text=text,
+                version=template.version if text == template.text else _version(text),
+            )
+            with self._lock:
+                if len(self._rendered) >= _MAX_RENDERED_PROMPTS:
+                    self._rendered.clear()
+                self._rendered[key] = rendered
+        return rendered
+
+    def _scope_variables(self, team_id: str, channel_id: str) -> dict:
+        variables = self._variables
+        return {
+            **variables.get("default", {}),
+            **variables.get("teams", {}).get(team_id, {}),
+            **variables.get("channels", {}).get(channel_id, {}),
+        }
+
+    def start_background_refresh(self) -> None:
+        """Reload the prompts every refresh_seconds in a daemon thread (idempotent)."""
+        if self._thread is not None or self._refresh_seconds <= 0:
+            return
+        self._thread = threading.Thread(
+            target=self._refresh_loop, name="prompt-refresh", daemon=True
         )
-        from agents.conversation_agent import _DEFAULT_CONVERSATION_SYSTEM_PROMPT
+        self._thread.start()
+
+    def stop_background_refresh(self) -> None:
+        self._stop.set()
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(self._refresh_seconds):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning("Prompt refresh failed: %s", e)
+
+
+# Shared by all invocations in this container
+prompt_registry = PromptRegistry(
+    {
+        "router": load_router_system_prompt,
+        "conversation": load_conversation_system_prompt,
+    },
+    defaults={
+        "router": _default_router_prompt,
+        "conversation": _default_conversation_prompt,
+    },
+)
+
 
-        return _DEFAULT_CONVERSATION_SYSTEM_PROMPT
+_CONSTANTS = {
+    "ROUTER_SYSTEM_PROMPT": "router",
+    "CONVERSATION_SYSTEM_PROMPT": "conversation",
+}
 
 
-# Export as module-level constants for backward compatibility
-# Evaluated once at module load time (Lambda cold start)
-ROUTER_SYSTEM_PROMPT = get_router_system_prompt()
-CONVERSATION_SYSTEM_PROMPT = get_conversation_system_prompt()
+def __getattr__(name: str) -> str:
+    # ROUTER_SYSTEM_PROMPT / CONVERSATION_SYSTEM_PROMPT for backward compatibility.
+    # Resolved on access rather than at import so importing this module does not
+    # call SSM on the container's startup path; use prompt_registry.render() for
+    # team/channel-specific prompts.
+    if name in _CONSTANTS:
+        return prompt_registry.template(_CONSTANTS[name]).text
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
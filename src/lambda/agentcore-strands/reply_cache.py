@@ -0,0 +1,300 @@
+"""Semantic cache of Conversation Agent replies for repeated questions.
+
+Teams ask the same questions over and over ("how do I deploy to staging?").
+Incoming messages are embedded with a pluggable embedding function and looked up
+among earlier replies of the same team/channel; a reply whose question is at
+least REPLY_CACHE_THRESHOLD cosine-similar is returned without a Conversation
+Agent call.
+
+Similarity alone cannot tell "VPN password for the dev env" from "...the prod
+env" or "restart server 1" from "restart server 2" (both score above 0.8), so a
+cached question must also have exactly the same key tokens: numbers, ASCII
+words other than common function words, and kanji/katakana runs. Rephrasings
+that differ only in function words or hiragana still match.
+
+The default embedder is HashingEmbedder (character n-gram feature hashing):
+deterministic, dependency-free and good at catching rephrasings that share most
+of their wording. Replace it with set_embedder() for a real embedding model.
+
+Lookups go through a random-hyperplane LSH index per scope, so a lookup compares
+against a bounded number of candidates instead of every stored entry.
+
+Invalidation:
+- entries expire after REPLY_CACHE_TTL_SECONDS
+- the scope includes the prompt version, so prompt changes start a fresh cache
+- invalidate(team_id, channel_id) drops a scope explicitly
+- beyond REPLY_CACHE_MAX_ENTRIES the oldest entries are evicted
+
+Cached replies are not written to Memory and ignore the conversation history,
+so the cache is opt-in (REPLY_CACHE_ENABLED=true).
+"""
+
+import logging
+import math
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+REPLY_CACHE_ENABLED = os.environ.get("REPLY_CACHE_ENABLED", "false").lower() == "true"
+REPLY_CACHE_THRESHOLD = float(os.environ.get("REPLY_CACHE_THRESHOLD", "0.85"))
+REPLY_CACHE_TTL_SECONDS = float(os.environ.get("REPLY_CACHE_TTL_SECONDS", "86400"))
+REPLY_CACHE_MAX_ENTRIES = int(os.environ.get("REPLY_CACHE_MAX_ENTRIES", "100000"))
+
+Embedder = Callable[[str], Sequence[float]]
+
+_SLACK_REFERENCE = re.compile(r"<[@#!][^>]*>")
+_PUNCTUATION = re.compile(r"[!?.,、。！？，．…~〜]+")
+_WHITESPACE = re.compile(r"\s+")
+_TOKEN = re.compile(r"\d+|[a-z][a-z'_-]*|[\u4e00-\u9fff\u30a0-\u30ff]+")
+
+# English function words that may differ between rephrasings of the same question
+_FUNCTION_WORDS = frozenset(
+    """a an the to for of in on at by with from about into as and or but if then
+    is are was were be been am do does did done can could would should will shall may might must
+    i me my we us our you your he she it its they them their this that these those there here
+    how what when where why which who whom whose please pls plz hi hey hello thanks thank
+    any some get got know tell let just again also still now not no yes ok""".split()
+)
+
+
+def normalize_question(text: str) -> str:
+    """Question text without Slack references or punctuation, lower-cased with whitespace collapsed."""
+    text = _PUNCTUATION.sub(" ", _SLACK_REFERENCE.sub("", text))
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+def key_tokens(normalized: str) -> frozenset[str]:
+    """Tokens two questions must share exactly to reuse a reply (see the module docstring)."""
+    return frozenset(
+        token for token in _TOKEN.findall(normalized) if token not in _FUNCTION_WORDS
+    )
+
+
+class HashingEmbedder:
+    """Deterministic embedder hashing character n-grams into a fixed-size unit vector."""
+
+    def __init__(self, dim: int = 256, ngram: int = 3) -> None:
+        self.dim = dim
+        self.ngram = ngram
+
+    def __call__(self, text: str) -> list[float]:
+        vector = [0.0] * self.dim
+        padded = f" {text} "
+        for i in range(max(1, len(padded) - self.ngram + 1)):
+            h = zlib.crc32(padded[i : i + self.ngram].encode())
+            vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+
+SparseVector = dict[int, float]
+
+
+def _to_sparse(vector: Sequence[float]) -> SparseVector:
+    """Unit-normalized non-zero components of a vector."""
+    norm = math.sqrt(sum(v * v for v in vector))
+    return {i: v / norm for i, v in enumerate(vector) if v} if norm else {}
+
+
+def _dot(a: SparseVector, b: SparseVector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(i, 0.0) for i, v in a.items())
+
+
+@lru_cache(maxsize=4)
+def _hyperplanes(dim: int, count: int, seed: int) -> list[list[float]]:
+    """Random hyperplanes shared by every index; row d holds component d of each plane."""
+    rng = random.Random(seed)
+    return [[rng.gauss(0.0, 1.0) for _ in range(count)] for _ in range(dim)]
+
+
+class LSHIndex:
+    """Random-hyperplane LSH index for cosine similarity.
+
+    Each of num_tables tables hashes a vector to num_bits sign bits. Candidates
+    are the entries sharing a bucket in any table; the max_candidates sharing
+    the most buckets are ranked by exact cosine. Vectors are kept sparse, so the
+    hashing embedder's vectors cost a few dozen components each.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        num_tables: int = 16,
+        num_bits: int = 10,
+        max_candidates: int = 64,
+        seed: int = 0,
+    ) -> None:
+        self._planes = _hyperplanes(dim, num_tables * num_bits, seed)
+        self._num_bits = num_bits
+        self._max_candidates = max_candidates
+        self._tables: list[dict[int, set[int]]] = [{} for _ in range(num_tables)]
+        self._vectors: dict[int, SparseVector] = {}
+        self._signatures: dict[int, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def _signature(self, vector: SparseVector) -> list[int]:
+        projections = [0.0] * len(self._planes[0])
+        for i, v in vector.items():
+            projections = [p + v * c for p, c in zip(projections, self._planes[i])]
+        signature = []
+        for start in range(0, len(projections), self._num_bits):
+            bits = 0
+            for p in projections[start : start + self._num_bits]:
+                bits = (bits << 1) | (p >= 0)
+            signature.append(bits)
+        return signature
+
+    def add(self, item_id: int, vector: Sequence[float]) -> None:
+        sparse = _to_sparse(vector)
+        signature = self._signature(sparse)
+        for table, bucket in zip(self._tables, signature):
+            table.setdefault(bucket, set()).add(item_id)
+        self._vectors[item_id] = sparse
+        self._signatures[item_id] = signature
+
+    def remove(self, item_id: int) -> None:
+        signature = self._signatures.pop(item_id, None)
+        if signature is None:
+            return
+        del self._vectors[item_id]
+        for table, bucket in zip(self._tables, signature):
+            members = table.get(bucket)
+            if members is not None:
+                members.discard(item_id)
+                if not members:
+                    del table[bucket]
+
+    def candidates(self, vector: Sequence[float]) -> list[tuple[int, float]]:
+        """(item_id, cosine similarity) of the candidates, most similar first."""
+        sparse = _to_sparse(vector)
+        collisions: Counter[int] = Counter()
+        for table, bucket in zip(self._tables, self._signature(sparse)):
+            collisions.update(table.get(bucket, ()))
+        scored = [
+            (item_id, _dot(sparse, self._vectors[item_id]))
+            for item_id, _ in collisions.most_common(self._max_candidates)
+        ]
+        scored.sort(key=lambda candidate: candidate[1], reverse=True)
+        return scored
+
+
+@dataclass
+class _Entry:
+    scope: tuple
+    reply: dict
+    expires_at: float
+    key_tokens: frozenset[str]
+
+
+class ReplyCache:
+    """Scoped semantic cache of Conversation Agent results (stored as dicts)."""
+
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        threshold: float = REPLY_CACHE_THRESHOLD,
+        ttl_seconds: float = REPLY_CACHE_TTL_SECONDS,
+        max_entries: int = REPLY_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._embedder: Embedder = embedder or HashingEmbedder()
+        self._threshold = threshold
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._indexes: dict[tuple, LSHIndex] = {}
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def set_embedder(self, embedder: Embedder) -> None:
+        """Replace the embedding function (drops all entries: old vectors are incomparable)."""
+        with self._lock:
+            self._embedder = embedder
+            self._indexes.clear()
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, scope: tuple, question: str) -> Optional[tuple[dict, float]]:
+        """(cached reply, similarity) for a similar earlier question in scope, or None.
+
+        Candidates are tried most similar first; expired ones are dropped and
+        ones whose key tokens differ are skipped.
+        """
+        normalized = normalize_question(question)
+        vector = self._embedder(normalized)
+        tokens = key_tokens(normalized)
+        with self._lock:
+            index = self._indexes.get(scope)
+            if index is None:
+                return None
+            now = self._clock()
+            for item_id, similarity in index.candidates(vector):
+                if similarity < self._threshold:
+                    break
+                entry = self._entries[item_id]
+                if entry.expires_at <= now:
+                    self._remove(item_id)
+                    continue
+                if entry.key_tokens == tokens:
+                    return dict(entry.reply), similarity
+            return None
+
+    def store(self, scope: tuple, question: str, reply: dict) -> None:
+        """Cache the reply to question within scope."""
+        normalized = normalize_question(question)
+        vector = self._embedder(normalized)
+        with self._lock:
+            item_id = self._next_id
+            self._next_id += 1
+            index = self._indexes.get(scope)
+            if index is None:
+                index = self._indexes[scope] = LSHIndex(len(vector))
+            index.add(item_id, vector)
+            self._entries[item_id] = _Entry(
+                scope, dict(reply), self._clock() + self._ttl_seconds, key_tokens(normalized)
+            )
+            while len(self._entries) > self._max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, team_id: Optional[str] = None, channel_id: Optional[str] = None) -> None:
+        """Drop entries whose scope matches the given team and/or channel (all when neither)."""
+        with self._lock:
+            for item_id in [
+                item_id
+                for item_id, entry in self._entries.items()
+                if (team_id is None or entry.scope[0] == team_id)
+                and (channel_id is None or entry.scope[1] == channel_id)
+            ]:
+                self._remove(item_id)
+
+    def _remove(self, item_id: int) -> None:
+        entry = self._entries.pop(item_id)
+        index = self._indexes[entry.scope]
+        index.remove(item_id)
+        if not len(index):
+            del self._indexes[entry.scope]
+
+
+def reply_scope(team_id: str, channel_id: str, version: str = "") -> tuple:
+    """Cache scope for a team/channel under a prompt version."""
+    return (team_id, channel_id, version)
+
+
+# Shared by all invocations in this container
+reply_cache = ReplyCache()
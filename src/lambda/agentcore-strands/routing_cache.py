@@ -0,0 +1,158 @@
+"""Cache of Router decisions keyed on normalized message fingerprints.
+
+Stand-up templates, status lines and greetings arrive again and again with only
+dates, numbers or user references changed; each one used to cost a Router
+Agent call. The fingerprint covers the normalized text (lower-cased, whitespace
+collapsed, digits and Slack references masked), the routing-relevant flags
+(is_mentioned, is_dm, channel_kind, is_in_thread) and the Router prompt version.
+
+Entries live in an in-process TTL + LRU tier and, when one is set with
+set_shared_tier(), in a shared tier as well (e.g. ElastiCache or DynamoDB
+implementing SharedTier). Mentions and DMs bypass the cache: the Router must
+reply to them and picks reply_mode/typing_style from the conversation.
+
+Note that a cached decision ignores the conversation history the Router would
+have seen in Memory, so the cache is opt-in (ROUTING_CACHE_ENABLED=true).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Protocol
+
+from envelope import MessageEnvelope
+
+logger = logging.getLogger(__name__)
+
+ROUTING_CACHE_ENABLED = os.environ.get("ROUTING_CACHE_ENABLED", "false").lower() == "true"
+ROUTING_CACHE_TTL_SECONDS = float(os.environ.get("ROUTING_CACHE_TTL_SECONDS", "600"))
+ROUTING_CACHE_MAX_ENTRIES = int(os.environ.get("ROUTING_CACHE_MAX_ENTRIES", "1024"))
+
+_SLACK_REFERENCE = re.compile(r"<[@#!][^>]*>")
+_DIGITS = re.compile(r"\d+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class SharedTier(Protocol):
+    """Cache shared between containers (values are JSON strings)."""
+
+    def get(self, key: str) -> Optional[str]: ...
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None: ...
+
+
+def normalize_text(text: str) -> str:
+    """Text with Slack references and digits masked, lower-cased and whitespace collapsed."""
+    text = _SLACK_REFERENCE.sub("<ref>", text)
+    text = _DIGITS.sub("0", text)
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+def fingerprint(envelope: MessageEnvelope, version: str = "") -> str:
+    """Cache key for the message's routing decision."""
+    digest = hashlib.sha256()
+    for part in (
+        version,
+        normalize_text(envelope.text),
+        str(envelope.is_mentioned),
+        str(envelope.is_dm),
+        envelope.channel_kind,
+        str(envelope.is_in_thread),
+    ):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class RoutingCache:
+    """TTL + LRU cache of Router decisions (stored as dicts) with an optional shared tier."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = ROUTING_CACHE_TTL_SECONDS,
+        max_entries: int = ROUTING_CACHE_MAX_ENTRIES,
+        shared: Optional[SharedTier] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._shared = shared
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def bypasses(envelope: MessageEnvelope) -> bool:
+        """Mentions and DMs are always routed by the Router Agent."""
+        return envelope.is_mentioned or envelope.is_dm
+
+    def set_shared_tier(self, shared: Optional[SharedTier]) -> None:
+        self._shared = shared
+
+    def get(self, key: str) -> Optional[dict]:
+        """Cached decision for key, or None (counts a hit or a miss)."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry[1])
+            if entry is not None:
+                del self._entries[key]
+
+        decision = self._get_shared(key)
+        with self._lock:
+            if decision is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._put_local(key, decision, now)
+        return dict(decision)
+
+    def put(self, key: str, decision: dict) -> None:
+        """Store a Router decision in both tiers."""
+        with self._lock:
+            self._put_local(key, dict(decision), self._clock())
+        if self._shared is not None:
+            try:
+                self._shared.set(key, json.dumps(decision), self._ttl_seconds)
+            except Exception as e:
+                logger.warning("Routing cache shared tier write failed: %s", e)
+
+    def _put_local(self, key: str, decision: dict, now: float) -> None:
+        self._entries[key] = (now + self._ttl_seconds, decision)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_shared(self, key: str) -> Optional[dict]:
+        if self._shared is None:
+            return None
+        try:
+            value = self._shared.get(key)
+            return json.loads(value) if value is not None else None
+        except Exception as e:
+            logger.warning("Routing cache shared tier read failed: %s", e)
+            return None
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by all invocations in this container
+routing_cache = RoutingCache()
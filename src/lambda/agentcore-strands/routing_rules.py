@@ -0,0 +1,275 @@
+"""Deterministic routing rules evaluated before the LLM Router.
+
+Clear-cut messages (mentions, DMs, emoji-only, URL-only, acknowledgements,
+quiet hours...) are decided without a model call. Rules are compiled from a
+declarative spec; the first matching rule wins and messages no rule matches fall
+through to the Router Agent.
+
+Spec (JSON, or YAML when PyYAML is installed)::
+
+    {
+      "utc_offset": "+09:00",
+      "rules": [
+        {"name": "mention", "when": {"is_mentioned": true}, "decision": "reply"},
+        {"name": "emoji_only", "when": {"emoji_only": true}, "decision": "ignore"},
+        {"name": "ack", "when": {"text_in": ["了解", "ok", "👍"]}, "decision": "ignore"},
+        {"name": "night", "when": {"channels": ["C0123"], "quiet_hours": "22:00-07:00"},
+         "decision": "ignore"}
+      ]
+    }
+
+Conditions in "when" are ANDed:
+    is_mentioned / is_dm / is_in_thread (bool), channel_kind (list), channels (list),
+    emoji_only / url_only / code_only (bool), text_in (list), max_chars (int),
+    quiet_hours ("HH:MM-HH:MM" in utc_offset local time, may wrap midnight)
+
+A "reply" decision may also set "route" (simple_reply / full_reply, default
+full_reply), "reply_mode" (default: thread when in a thread, else channel) and
+"typing_style" (default: short).
+
+Environment:
+    SSM_ROUTING_RULES: SSM parameter holding the spec (optional)
+    ROUTING_RULES_FILE: Local spec file, used when SSM_ROUTING_RULES is not set
+        (optional, re-read only when its modification time or size changes)
+"""
+
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from aws_lambda_powertools.utilities.parameters import get_parameter
+
+from envelope import MessageEnvelope
+
+logger = logging.getLogger(__name__)
+
+_MENTION = re.compile(r"<[@#!][^>]*>")
+_SLACK_EMOJI = re.compile(r":[a-z0-9_+'\-]+:")
+_UNICODE_EMOJI = re.compile("[\U0001f000-\U0001faff☀-➿⬀-⯿️‍⃣]")
+_URL = re.compile(r"<https?://[^>]+>|https?://\S+")
+_CODE = re.compile(r"```.*?```|`[^`\n]+`", re.DOTALL)
+_ACK_PUNCTUATION = " \t\n!！?？。．.、,，~〜ー"
+
+
+@dataclass(frozen=True)
+class RuleDecision:
+    """Routing decision made by a rule (same fields as the Router's output)."""
+
+    rule: str
+    should_reply: bool
+    route: str
+    reply_mode: str
+    typing_style: str
+
+
+def _strip_mentions(text: str) -> str:
+    return _MENTION.sub("", text).strip()
+
+
+def normalize_ack(text: str) -> str:
+    """Normalize text for acknowledgement matching (no mentions, case or trailing punctuation)."""
+    return _strip_mentions(text).lower().strip(_ACK_PUNCTUATION)
+
+
+def is_emoji_only(text: str) -> bool:
+    body = _strip_mentions(text)
+    return bool(body) and not _UNICODE_EMOJI.sub("", _SLACK_EMOJI.sub("", body)).strip()
+
+
+def is_url_only(text: str) -> bool:
+    body = _strip_mentions(text)
+    return bool(body) and not _URL.sub("", body).strip()
+
+
+def is_code_only(text: str) -> bool:
+    body = _strip_mentions(text)
+    return bool(body) and not _CODE.sub("", body).strip()
+
+
+def _parse_utc_offset(value: str) -> timezone:
+    sign = -1 if value.startswith("-") else 1
+    hours, _, minutes = value.lstrip("+-").partition(":")
+    return timezone(sign * timedelta(hours=int(hours), minutes=int(minutes or 0)))
+
+
+def _parse_quiet_hours(value: str) -> tuple[int, int]:
+    """"22:00-07:00" -> (start, end) in minutes since midnight."""
+    start, _, end = value.partition("-")
+
+    def minutes(hhmm: str) -> int:
+        hours, _, mins = hhmm.strip().partition(":")
+        return int(hours) * 60 + int(mins or 0)
+
+    return minutes(start), minutes(end)
+
+
+def _in_window(now_minutes: int, window: tuple[int, int]) -> bool:
+    start, end = window
+    if start <= end:
+        return start <= now_minutes < end
+    return now_minutes >= start or now_minutes < end
+
+
+Condition = Callable[[MessageEnvelope, datetime], bool]
+
+
+def _compile_condition(key: str, value: Any) -> Condition:
+    if key in ("is_mentioned", "is_dm", "is_in_thread"):
+        expected = bool(value)
+        return lambda envelope, now: getattr(envelope, key) is expected
+    if key == "channel_kind":
+        kinds = frozenset(value)
+        return lambda envelope, now: envelope.channel_kind in kinds
+    if key == "channels":
+        channels = frozenset(value)
+        return lambda envelope, now: envelope.channel_id in channels
+    if key in ("emoji_only", "url_only", "code_only"):
+        check = {"emoji_only": is_emoji_only, "url_only": is_url_only, "code_only": is_code_only}[key]
+        expected = bool(value)
+        return lambda envelope, now: check(envelope.text) is expected
+    if key == "text_in":
+        words = frozenset(normalize_ack(word) for word in value)
+        return lambda envelope, now: normalize_ack(envelope.text) in words
+    if key == "max_chars":
+        limit = int(value)
+        return lambda envelope, now: len(_strip_mentions(envelope.text)) <= limit
+    if key == "quiet_hours":
+        window = _parse_quiet_hours(value)
+        return lambda envelope, now: _in_window(now.hour * 60 + now.minute, window)
+    raise ValueError(f"Unknown routing rule condition: {key}")
+
+
+@dataclass(frozen=True)
+class _Rule:
+    name: str
+    conditions: tuple[Condition, ...]
+    decision: str
+    route: str
+    reply_mode: Optional[str]
+    typing_style: str
+
+    def decide(self, envelope: MessageEnvelope) -> RuleDecision:
+        if self.decision == "reply":
+            return RuleDecision(
+                rule=self.name,
+                should_reply=True,
+                route=self.route,
+                reply_mode=self.reply_mode or ("thread" if envelope.is_in_thread else "channel"),
+                typing_style=self.typing_style,
+            )
+        return RuleDecision(
+            rule=self.name,
+            should_reply=False,
+            route="ignore",
+            reply_mode=self.reply_mode or "thread",
+            typing_style="none",
+        )
+
+
+class RoutingRules:
+    """Compiled rule set; evaluate() returns the first matching rule's decision."""
+
+    def __init__(self, rules: tuple[_Rule, ...] = (), tz: timezone = timezone.utc) -> None:
+        self._rules = rules
+        self._tz = tz
+
+    @classmethod
+    def compile(cls, spec: dict) -> "RoutingRules":
+        """Compile a spec dict (raises ValueError on an invalid spec)."""
+        rules = []
+        for index, raw in enumerate(spec.get("rules", [])):
+            decision = raw.get("decision")
+            if decision not in ("reply", "ignore"):
+                raise ValueError(f"Rule {index}: decision must be 'reply' or 'ignore'")
+            route = raw.get("route", "full_reply")
+            if route not in ("simple_reply", "full_reply"):
+                raise ValueError(f"Rule {index}: route must be 'simple_reply' or 'full_reply'")
+            rules.append(
+                _Rule(
+                    name=raw.get("name", f"rule{index}"),
+                    conditions=tuple(
+                        _compile_condition(key, value) for key, value in raw.get("when", {}).items()
+                    ),
+                    decision=decision,
+                    route=route,
+                    reply_mode=raw.get("reply_mode"),
+                    typing_style=raw.get("typing_style", "short"),
+                )
+            )
+        return cls(tuple(rules), _parse_utc_offset(spec.get("utc_offset", "+00:00")))
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def evaluate(
+        self,
+        envelope: MessageEnvelope,
+        now: Optional[datetime] = None,
+    ) -> Optional[RuleDecision]:
+        """Decision of the first matching rule, or None to fall through to the LLM Router."""
+        if not self._rules:
+            return None
+        local_now = (now or datetime.now(timezone.utc)).astimezone(self._tz)
+        for rule in self._rules:
+            if all(condition(envelope, local_now) for condition in rule.conditions):
+                return rule.decide(envelope)
+        return None
+
+
+def parse_spec(raw: str) -> dict:
+    """Parse a JSON spec, or YAML when PyYAML is available and the text is not JSON."""
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("Routing rules spec is not valid JSON (install PyYAML for YAML specs)")
+        return yaml.safe_load(raw)
+
+
+_EMPTY = RoutingRules()
+_compiled: tuple[str, RoutingRules] | None = None
+# (path, mtime_ns, size, text) of the last spec file read
+_file_spec: tuple[str, int, int, str] | None = None
+
+
+def _load_raw_spec() -> Optional[str]:
+    param_name = os.environ.get("SSM_ROUTING_RULES")
+    if param_name:
+        return get_parameter(param_name, max_age=300)
+
+    path = os.environ.get("ROUTING_RULES_FILE")
+    if path:
+        return _read_spec_file(path)
+    return None
+
+
+def _read_spec_file(path: str) -> str:
+    """Spec file text, re-read only when the file's mtime or size changed."""
+    global _file_spec
+    stat = os.stat(path)
+    if _file_spec is None or _file_spec[:3] != (path, stat.st_mtime_ns, stat.st_size):
+        with open(path, encoding="utf-8") as f:
+            _file_spec = (path, stat.st_mtime_ns, stat.st_size, f.read())
+    return _file_spec[3]
+
+
+def get_routing_rules() -> RoutingRules:
+    """Current rule set, recompiled only when the spec text changes (empty on any error)."""
+    global _compiled
+    try:
+        raw = _load_raw_spec()
+        if raw is None:
+            return _EMPTY
+        if _compiled is None or _compiled[0] != raw:
+            _compiled = (raw, RoutingRules.compile(parse_spec(raw)))
+            logger.info("Compiled %d routing rules", len(_compiled[1]))
+        return _compiled[1]
+    except Exception as e:
+        logger.warning("Failed to load routing rules, using the LLM Router only: %s", e)
+        return _EMPTY
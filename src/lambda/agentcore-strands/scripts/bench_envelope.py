@@ -0,0 +1,127 @@
+"""Micro-benchmark of the pre-filter on the typed envelope vs the old prompt parsing.
+
+For the same AgentCore payloads, times the per-message work up to the pre-filter
+decision:
+
+- legacy: format the Slack context into the prompt text (``_build_user_message``),
+  then split it back apart and search it for "is_mentioned: True"
+- envelope: ``MessageEnvelope.from_payload`` + ``graph._prefilter``
+- prefilter only: ``graph._prefilter`` on envelopes built beforehand
+
+Both paths must agree on which messages are skipped. Payloads are a mix of
+short chatter, ordinary messages and long pasted text.
+
+Usage (from src/lambda/agentcore-strands)::
+
+    uv run python scripts/bench_envelope.py --messages 20000
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+logging.disable(logging.INFO)
+
+from envelope import MessageEnvelope  # noqa: E402
+from graph import _prefilter  # noqa: E402
+
+
+def legacy_build_user_message(prompt: str, metadata: dict) -> str:
+    """handler._build_user_message before the envelope."""
+    slack_meta = metadata.get("slack", {})
+    ts = slack_meta.get("ts", "")
+    thread_ts = slack_meta.get("thread_ts", "")
+    is_in_thread = bool(thread_ts and thread_ts != ts)
+    return "\n".join(
+        [
+            f"User message: {prompt}",
+            "",
+            "Slack context:",
+            f"- is_mentioned: {slack_meta.get('is_mentioned', False)}",
+            f"- is_dm: {slack_meta.get('is_dm', False)}",
+            f"- channel_kind: {slack_meta.get('channel_kind', 'unknown')}",
+            f"- is_in_thread: {is_in_thread}",
+        ]
+    )
+
+
+def legacy(payload: dict) -> bool:
+    user_message = legacy_build_user_message(payload["prompt"], payload["metadata"])
+    text_only = user_message.split("\n\nSlack context:")[0].replace("User message: ", "").strip()
+    is_mentioned = "is_mentioned: True" in user_message
+    return len(text_only) <= 3 and not is_mentioned
+
+
+def envelope(payload: dict) -> bool:
+    message = MessageEnvelope.from_payload(payload["prompt"], payload["metadata"])
+    return _prefilter(message) is not None
+
+
+def payloads(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    texts = [
+        lambda: rng.choice(["ok", "👍", "了解", "thx", "w"]),
+        lambda: "デプロイの手順を教えてください。staging で確認しています。" * rng.randint(1, 5),
+        lambda: "ログを貼ります\n" + "ERROR something failed at line 42\n" * rng.randint(50, 300),
+    ]
+    result = []
+    for n in range(count):
+        text = rng.choices(texts, weights=[4, 5, 1])[0]()
+        result.append(
+            {
+                "prompt": text,
+                "metadata": {
+                    "slack": {
+                        "team_id": "T1",
+                        "channel_id": "C1",
+                        "user_id": "U1",
+                        "ts": f"1700000000.{n:06d}",
+                        "thread_ts": "1700000000.000000" if n % 2 else "",
+                        "is_mentioned": rng.random() < 0.2,
+                        "is_dm": False,
+                        "channel_kind": "public",
+                    }
+                },
+            }
+        )
+    return result
+
+
+def measure(decide, items: list[dict], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for payload in items:
+            decide(payload)
+        best = min(best, time.perf_counter() - started)
+    return best / len(items)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    items = payloads(args.messages, args.seed)
+    skipped = [legacy(p) for p in items]
+    if skipped != [envelope(p) for p in items]:
+        raise SystemExit("legacy and envelope pre-filters disagree")
+
+    envelopes = [MessageEnvelope.from_payload(p["prompt"], p["metadata"]) for p in items]
+    baseline = measure(legacy, items, args.repeat)
+    current = measure(envelope, items, args.repeat)
+    decision = measure(_prefilter, envelopes, args.repeat)
+    print(f"{len(items)} messages, {sum(skipped) / len(items):.1%} skipped by the pre-filter")
+    print(f"legacy:          {baseline * 1e6:.2f}us/message")
+    print(f"envelope:        {current * 1e6:.2f}us/message ({baseline / current:.2f}x)")
+    print(f"prefilter only:  {decision * 1e6:.2f}us/message ({baseline / decision:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
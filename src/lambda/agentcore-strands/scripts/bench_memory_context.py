@@ -0,0 +1,184 @@
+"""Compare model input tokens with and without the memory context budget.
+
+Replays messages through graph.run_orchestration with FakeModel
+(scripts/fake_model.py) as both agents and FakeMemoryData
+(scripts/fake_memory.py) as AgentCore Memory, seeded with long-term records of
+varying length and relevance. Two runs over the same messages:
+
+- before: the stock AgentCoreMemorySessionManager with the fixed per-namespace
+  top_k the bot used before context_budget.py (5 / 10 / 3)
+- after: BudgetedMemorySessionManager (token budget per agent and route)
+
+Reported per run: Router and Conversation input tokens per message (estimated
+by FakeModel from the request size, system prompt and history included) and
+the change from before to after.
+
+--corpus is a JSONL replay, one message per line; "route" is the decision the
+fake Router returns for it (ignore / simple_reply / full_reply)::
+
+    {"text": "...", "channel_id": "C1", "is_mentioned": true, "route": "simple_reply"}
+
+Usage (from src/lambda/agentcore-strands)::
+
+    uv run python scripts/bench_memory_context.py --messages 60
+    uv run python scripts/bench_memory_context.py --corpus replay.jsonl
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+for name in ("SSM_ROUTER_SYSTEM_PROMPT", "SSM_CONVERSATION_SYSTEM_PROMPT", "SSM_ROUTING_RULES"):
+    os.environ.pop(name, None)
+logging.disable(logging.WARNING)
+
+import graph  # noqa: E402
+from agent_pool import memory_classes  # noqa: E402
+from envelope import MessageEnvelope  # noqa: E402
+from fake_memory import FakeMemoryData, attach_fake_memory  # noqa: E402
+from fake_model import FakeModel  # noqa: E402
+
+MEMORY_ID = "mem-bench"
+TEAM_ID = "T_BENCH"
+
+# graph.py's retrieval config before the token budget
+LEGACY_TOP_K = {
+    "/preferences/{actorId}": (5, 0.7),
+    "/facts/{actorId}": (10, 0.3),
+    "/summaries/{actorId}/{sessionId}": (3, 0.5),
+}
+
+_ROUTE_MARKER = "route:"
+_FACTS = [
+    "{n} 番目のサービスの本番デプロイは火曜と木曜の 15 時まで。",
+    "チーム {n} のオンコールは PagerDuty のローテーションで週替わり、引き継ぎは月曜 10 時。",
+    "プロジェクト {n} のステージング環境は staging-{n}.example.com、VPN 経由でのみアクセス可能。"
+    " 認証は SSO で、権限の追加は #infra-requests に依頼する。",
+]
+
+
+def seed_records(rng: random.Random, channels: int) -> dict[str, list[dict]]:
+    """Long-term records per resolved namespace, scores spread over 0.2-0.95."""
+
+    def records(count: int, prefix: str) -> list[dict]:
+        return [
+            {
+                "content": {"text": f"{prefix}: " + rng.choice(_FACTS).format(n=n) * rng.randint(1, 3)},
+                "score": rng.uniform(0.2, 0.95),
+            }
+            for n in range(count)
+        ]
+
+    namespaces = {
+        f"/preferences/{TEAM_ID}": records(15, "好み"),
+        f"/facts/{TEAM_ID}": records(60, "事実"),
+    }
+    for c in range(channels):
+        namespaces[f"/summaries/{TEAM_ID}/C{c:04d}"] = records(8, "要約")
+    return namespaces
+
+
+def synthetic_corpus(count: int, channels: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    routes = ["ignore"] * 3 + ["simple_reply"] * 4 + ["full_reply"] * 3
+    return [
+        {
+            "text": f"<@U_BOT> 質問 {n}: 先週のデプロイで何が変わったか教えてください",
+            "channel_id": f"C{rng.randrange(channels):04d}",
+            "is_mentioned": True,
+            "route": rng.choice(routes),
+        }
+        for n in range(count)
+    ]
+
+
+def router_output(messages: list) -> dict:
+    """The route given in the replayed message (after _ROUTE_MARKER)."""
+    query = messages[-1]["content"][-1].get("text", "")
+    route = query.split(_ROUTE_MARKER, 1)[1].split()[0] if _ROUTE_MARKER in query else "full_reply"
+    return {
+        "should_reply": route != "ignore",
+        "route": route,
+        "typing_style": "short",
+        "reason": "replay",
+    }
+
+
+def legacy_retrieval_config(retrieval_config_class) -> dict:
+    return {
+        namespace: retrieval_config_class(top_k=top_k, relevance_score=relevance_score)
+        for namespace, (top_k, relevance_score) in LEGACY_TOP_K.items()
+    }
+
+
+def run(corpus: list[dict], records: dict[str, list[dict]], budgeted: bool) -> tuple[int, int]:
+    """(Router input tokens, Conversation input tokens) over the corpus."""
+    router_model = FakeModel(outputs={"RouterResponse": router_output})
+    conversation_model = FakeModel(
+        outputs={"ConversationResponse": {"reply_text": "先週は認証基盤の更新がありました。"}}
+    )
+    graph.ROUTER_MODEL_ID = router_model
+    graph.CONVERSATION_MODEL_ID = conversation_model
+
+    original_class, original_config = graph.budgeted_session_manager_class, graph.retrieval_config
+    if not budgeted:
+        stock_class = memory_classes()[2]
+        graph.budgeted_session_manager_class = lambda: stock_class
+        graph.retrieval_config = legacy_retrieval_config
+    restore = attach_fake_memory(graph, FakeMemoryData(records=records))
+    try:
+        for message in corpus:
+            envelope = MessageEnvelope(
+                text=f"{message['text']} {_ROUTE_MARKER}{message['route']}",
+                team_id=TEAM_ID,
+                channel_id=message["channel_id"],
+                is_mentioned=message.get("is_mentioned", False),
+                channel_kind="public",
+            )
+            graph.run_orchestration(
+                envelope, memory_id=MEMORY_ID, session_id=envelope.channel_id, actor_id=TEAM_ID
+            )
+    finally:
+        restore()
+        graph.budgeted_session_manager_class, graph.retrieval_config = original_class, original_config
+    return router_model.input_token_total, conversation_model.input_token_total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="JSONL replay corpus (default: synthetic)")
+    parser.add_argument("--messages", type=int, default=60, help="synthetic corpus size")
+    parser.add_argument("--channels", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if memory_classes() is None:
+        raise SystemExit("bedrock_agentcore is not installed")
+    if args.corpus:
+        corpus = [json.loads(line) for line in args.corpus.read_text().splitlines() if line.strip()]
+    else:
+        corpus = synthetic_corpus(args.messages, args.channels, args.seed)
+    channels = len({message["channel_id"] for message in corpus})
+    records = seed_records(random.Random(args.seed), max(channels, args.channels))
+
+    before = run(corpus, records, budgeted=False)
+    after = run(corpus, records, budgeted=True)
+    routes = {route: sum(m["route"] == route for m in corpus) for route in ("ignore", "simple_reply", "full_reply")}
+    print(f"corpus: {len(corpus)} messages on {channels} channels, routes={routes}")
+    for label, index in (("router", 0), ("conversation", 1)):
+        print(
+            f"{label:>12}: before={before[index] / len(corpus):.0f} after={after[index] / len(corpus):.0f} "
+            f"input tokens/message ({after[index] / max(before[index], 1) - 1:+.1%})"
+        )
+    print(f"{'total':>12}: {sum(after) / max(sum(before), 1) - 1:+.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Benchmark the orchestration overhead per message, excluding model time.
+
+Runs graph.run_orchestration on mentioned messages (Router -> Conversation)
+with FakeModel (scripts/fake_model.py) answering instantly for both agents, so
+everything measured is the orchestration itself: agent and session manager
+construction, session restore, memory retrieval, hooks and structured output
+handling. Compared:
+
+- fresh: agents built for every message (reuse_agents=False, thread affinity)
+- pooled: agents reused from agent_pool (reuse_agents=True, channel affinity)
+
+With --memory the real BudgetedMemorySessionManager runs against FakeMemoryData
+(scripts/fake_memory.py), each Memory API call sleeping --memory-latency-ms.
+One warm-up message per channel runs before the measurement.
+
+Usage (from src/lambda/agentcore-strands)::
+
+    uv run python scripts/bench_orchestration.py --messages 200
+    uv run python scripts/bench_orchestration.py --memory --memory-latency-ms 20
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+for name in ("SSM_ROUTER_SYSTEM_PROMPT", "SSM_CONVERSATION_SYSTEM_PROMPT", "SSM_ROUTING_RULES"):
+    os.environ.pop(name, None)
+logging.disable(logging.WARNING)
+
+import graph  # noqa: E402
+from agent_pool import agent_pool  # noqa: E402
+from envelope import MessageEnvelope  # noqa: E402
+from fake_memory import FakeMemoryData, attach_fake_memory  # noqa: E402
+from fake_model import FakeModel  # noqa: E402
+
+MEMORY_ID = "mem-bench"
+
+ROUTER_OUTPUT = {
+    "should_reply": True,
+    "route": "full_reply",
+    "reply_mode": "thread",
+    "typing_style": "short",
+    "reason": "メンションされたため返信",
+}
+CONVERSATION_OUTPUT = {
+    "reply_text": "デプロイは main へのマージ後に自動で実行されます。",
+    "reply_mode": "thread",
+    "typing_style": "short",
+}
+
+
+def messages(count: int, channels: int) -> list[MessageEnvelope]:
+    """Distinct mentioned messages spread over the channels."""
+    return [
+        MessageEnvelope(
+            text=f"<@U_BOT> 質問 {n}: ステージングへのデプロイ手順を教えてください",
+            team_id="T_BENCH",
+            channel_id=f"C{n % channels:04d}",
+            user_id=f"U{n % 7:04d}",
+            ts=f"{1700000000 + n}.000100",
+            is_mentioned=True,
+            channel_kind="public",
+        )
+        for n in range(count)
+    ]
+
+
+def run(envelopes: list[MessageEnvelope], reuse_agents: bool, memory: bool) -> list[float]:
+    """Seconds per message."""
+    samples = []
+    for envelope in envelopes:
+        started = time.perf_counter()
+        result = graph.run_orchestration(
+            envelope,
+            memory_id=MEMORY_ID if memory else None,
+            session_id=envelope.channel_id,
+            actor_id=envelope.team_id,
+            reuse_agents=reuse_agents,
+        )
+        samples.append(time.perf_counter() - started)
+        if not result.get("reply_text"):
+            raise RuntimeError(f"unexpected result: {result}")
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--channels", type=int, default=5)
+    parser.add_argument("--memory", action="store_true", help="use the fake Memory backend")
+    parser.add_argument("--memory-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    router_model = FakeModel(outputs={"RouterResponse": ROUTER_OUTPUT})
+    conversation_model = FakeModel(outputs={"ConversationResponse": CONVERSATION_OUTPUT})
+    graph.ROUTER_MODEL_ID = router_model
+    graph.CONVERSATION_MODEL_ID = conversation_model
+
+    warmup = messages(args.channels, args.channels)
+    measured = messages(args.messages, args.channels)
+    print(
+        f"{args.messages} messages on {args.channels} channels, "
+        f"memory={'fake (%.0fms/call)' % args.memory_latency_ms if args.memory else 'off'}"
+    )
+    for label, reuse_agents in (("fresh", False), ("pooled", True)):
+        agent_pool.clear()
+        backend = FakeMemoryData(latency=args.memory_latency_ms / 1000)
+        if args.memory:
+            restore = attach_fake_memory(graph, backend)
+        try:
+            run(warmup, reuse_agents, args.memory)
+            calls_before = router_model.calls + conversation_model.calls
+            backend.calls.clear()
+            samples = run(measured, reuse_agents, args.memory)
+        finally:
+            if args.memory:
+                restore()
+        model_calls = router_model.calls + conversation_model.calls - calls_before
+        memory_calls = sum(backend.calls.values())
+        samples.sort()
+        print(
+            f"{label:>7}: p50={statistics.median(samples) * 1e3:.2f}ms "
+            f"p95={samples[int(len(samples) * 0.95)] * 1e3:.2f}ms "
+            f"mean={statistics.fmean(samples) * 1e3:.2f}ms "
+            f"model_calls/msg={model_calls / len(samples):.1f} "
+            f"memory_calls/msg={memory_calls / len(samples):.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark reply_cache lookups with 100k cached questions in one scope.
+
+Fills a ReplyCache (default HashingEmbedder and LSH index) with --entries
+distinct synthetic questions in a single team/channel scope, then times:
+
+- store: per inserted entry while filling the cache
+- lookup (hit): rephrasings of stored questions (mentions, punctuation,
+  function words, hiragana); also reports how many were found, out of those
+  an exact comparison with the stored question accepts (LSH recall)
+- lookup (miss): questions that differ from stored ones only in a key token
+  (service, number or environment), which must not hit
+- linear scan: the exact-cosine scan over every stored entry that the LSH
+  index replaces, on a few of the same lookups
+
+Usage (from src/lambda/agentcore-strands)::
+
+    uv run python scripts/bench_reply_cache.py
+    uv run python scripts/bench_reply_cache.py --entries 20000 --lookups 2000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from reply_cache import (  # noqa: E402
+    REPLY_CACHE_THRESHOLD,
+    HashingEmbedder,
+    ReplyCache,
+    _dot,
+    _to_sparse,
+    key_tokens,
+    normalize_question,
+)
+
+SCOPE = ("T_BENCH", "C_BENCH", "v1")
+REPLY = {"should_reply": True, "reply_text": "cached reply"}
+
+_VERBS = ["deploy", "restart", "roll back", "scale", "rotate the keys of", "check the logs of"]
+_SERVICES = ["billing", "search", "gateway", "auth", "reports", "ingest", "notifier", "scheduler"]
+_ENVS = ["staging", "production", "dev", "qa"]
+_TEMPLATES = [
+    (
+        "How do I {verb} the {service} service in {env}?",
+        "<@U_BOT> how can i {verb} the {service} service in {env}??",
+    ),
+    ("What is the runbook to {verb} {service} on {env}", "what's the runbook to {verb} {service} on {env}?"),
+    ("Who owns {service} in {env} and can I {verb} it?", "who owns {service} in {env}, and can i {verb} it"),
+    ("{env} の {service} を {verb} する手順は？", "<@U_BOT> {env} の {service} を {verb} する手順はどこですか"),
+    ("{service} が {env} で落ちたら {verb} してもいい？", "{service} が {env} で落ちたときは {verb} してもいいですか？"),
+]
+
+
+def question(rng: random.Random, n: int) -> tuple[str, str]:
+    """(stored question, rephrasing) for entry n; the key tokens are unique per n.
+
+    The rephrasings differ in mentions, punctuation, function words and hiragana.
+    """
+    stored, rephrased = rng.choice(_TEMPLATES)
+    fields = {
+        "verb": rng.choice(_VERBS),
+        "service": f"{rng.choice(_SERVICES)} {n}",
+        "env": rng.choice(_ENVS),
+    }
+    return stored.format(**fields), rephrased.format(**fields)
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    return sorted(samples)[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def report(label: str, samples: list[float]) -> None:
+    print(
+        f"{label:>13}: p50={statistics.median(samples) * 1e3:.3f}ms "
+        f"p99={percentile(samples, 0.99) * 1e3:.3f}ms (n={len(samples)})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument("--linear-lookups", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cache = ReplyCache(max_entries=args.entries)
+    pairs = [question(rng, n) for n in range(args.entries)]
+
+    store_samples = []
+    for stored, _ in pairs:
+        started = time.perf_counter()
+        cache.store(SCOPE, stored, REPLY)
+        store_samples.append(time.perf_counter() - started)
+    print(f"{len(cache)} entries in one scope")
+    report("store", store_samples)
+
+    probes = rng.sample(range(args.entries), min(args.lookups, args.entries))
+    hit_samples, found = [], 0
+    for n in probes:
+        started = time.perf_counter()
+        hit = cache.lookup(SCOPE, pairs[n][1])
+        hit_samples.append(time.perf_counter() - started)
+        found += hit is not None
+    report("lookup (hit)", hit_samples)
+    embedder = HashingEmbedder()
+
+    def findable(n: int) -> bool:
+        stored, rephrased = (normalize_question(text) for text in pairs[n])
+        similarity = _dot(_to_sparse(embedder(stored)), _to_sparse(embedder(rephrased)))
+        return similarity >= REPLY_CACHE_THRESHOLD and key_tokens(stored) == key_tokens(rephrased)
+
+    accepted = sum(map(findable, probes))
+    print(
+        f"{'found':>13}: {found / len(probes):.1%} of the rephrasings "
+        f"({accepted / len(probes):.1%} similar enough; recall {found / max(accepted, 1):.1%})"
+    )
+
+    miss_samples, false_hits = [], 0
+    for n in probes:
+        near_miss = pairs[n][0].replace(f" {n} ", f" {n + args.entries} ")
+        started = time.perf_counter()
+        hit = cache.lookup(SCOPE, near_miss)
+        miss_samples.append(time.perf_counter() - started)
+        false_hits += hit is not None
+    report("lookup (miss)", miss_samples)
+    print(f"{'false hits':>13}: {false_hits}")
+
+    # What a lookup costs without the index: exact cosine against every stored question
+    vectors = [_to_sparse(embedder(normalize_question(stored))) for stored, _ in pairs]
+    linear_samples = []
+    for n in probes[: args.linear_lookups]:
+        started = time.perf_counter()
+        query = _to_sparse(embedder(normalize_question(pairs[n][1])))
+        max(_dot(query, vector) for vector in vectors)
+        linear_samples.append(time.perf_counter() - started)
+    report("linear scan", linear_samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Replay a message corpus through the routing cache and report its hit rate.
+
+Messages are replayed in ts order through RoutingCache (the clock follows the
+message timestamps). Mentions and DMs bypass the cache as in production; every
+other miss stands for a Router Agent call whose decision is then cached.
+Reported per ROUTING_CACHE_TTL_SECONDS value:
+
+- local: one container's in-process tier (all messages reach it)
+- containers: the messages spread over --containers containers by channel,
+  each with its own in-process tier
+- +shared: the same containers sharing one SharedTier (in memory here)
+
+--corpus is a JSONL file, one message per line (ts in epoch seconds)::
+
+    {"text": "...", "channel_id": "C1", "ts": "1700000000.000100", "thread_ts": "",
+     "is_mentioned": false, "is_dm": false, "channel_kind": "public"}
+
+Without --corpus a synthetic day of traffic is used: stand-up templates, CI and
+deploy notifications, greetings and acknowledgements with changing numbers and
+user references, mixed with one-off questions and mentions.
+
+Usage (from src/lambda/agentcore-strands)::
+
+    uv run python scripts/bench_routing_cache.py --messages 20000
+    uv run python scripts/bench_routing_cache.py --corpus replay.jsonl --ttl 300 600 3600
+"""
+
+import argparse
+import json
+import random
+import sys
+import zlib
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from envelope import MessageEnvelope  # noqa: E402
+from routing_cache import RoutingCache, fingerprint  # noqa: E402
+
+DECISION = {"should_reply": False, "route": "ignore", "reason": "replay"}
+
+_TEMPLATES = [
+    "本日の作業: PR #{n} のレビュー、チケット {n} の調査",
+    "Deploy #{n} to production succeeded ({n}s)",
+    "CI build {n} failed on main: test_{n} <@U{n}>",
+    "おはようございます",
+    "お疲れさまでした、お先に失礼します",
+    "了解です、{n} 時までに対応します",
+    "<@U{n}> ありがとうございます！",
+    "定例の議事録です: https://example.com/docs/{n}",
+]
+
+
+class ReplayClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class InMemorySharedTier:
+    def __init__(self, clock: ReplayClock) -> None:
+        self._clock = clock
+        self._values: dict[str, tuple[float, str]] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._values.get(key)
+        return entry[1] if entry and entry[0] > self._clock.now else None
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        self._values[key] = (self._clock.now + ttl_seconds, value)
+
+
+def synthetic_corpus(size: int, channels: int, seed: int) -> list[dict]:
+    """A day of channel traffic; about 60% template-like messages."""
+    rng = random.Random(seed)
+    corpus = []
+    for n in range(size):
+        ts = 1700000000 + 86400 * n / size
+        if rng.random() < 0.6:
+            text = rng.choice(_TEMPLATES).format(n=rng.randrange(1, 500))
+        else:
+            text = f"質問 {rng.getrandbits(32):08x}: この設定の意味を教えてください"
+        corpus.append(
+            {
+                "text": text,
+                "channel_id": f"C{rng.randrange(channels):04d}",
+                "ts": f"{ts:.6f}",
+                "thread_ts": "",
+                "is_mentioned": rng.random() < 0.1,
+                "channel_kind": "public",
+            }
+        )
+    return corpus
+
+
+def envelope_of(message: dict) -> MessageEnvelope:
+    return MessageEnvelope(
+        text=message["text"],
+        channel_id=message.get("channel_id", ""),
+        ts=message.get("ts", ""),
+        thread_ts=message.get("thread_ts", ""),
+        is_mentioned=message.get("is_mentioned", False),
+        is_dm=message.get("is_dm", False),
+        channel_kind=message.get("channel_kind", "unknown"),
+    )
+
+
+def replay(
+    corpus: list[dict], ttl: float, max_entries: int, containers: int, shared: bool
+) -> tuple[int, int]:
+    """(cacheable messages, cache hits)."""
+    clock = ReplayClock()
+    shared_tier = InMemorySharedTier(clock) if shared else None
+    caches = [
+        RoutingCache(ttl_seconds=ttl, max_entries=max_entries, shared=shared_tier, clock=clock)
+        for _ in range(containers)
+    ]
+    cacheable = 0
+    for message in corpus:
+        envelope = envelope_of(message)
+        if RoutingCache.bypasses(envelope):
+            continue
+        cacheable += 1
+        clock.now = float(envelope.ts)
+        cache = caches[zlib.crc32(envelope.channel_id.encode()) % containers]
+        key = fingerprint(envelope, "v1")
+        if cache.get(key) is None:
+            cache.put(key, DECISION)
+    return cacheable, sum(cache.hits for cache in caches)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="JSONL replay corpus (default: synthetic)")
+    parser.add_argument("--messages", type=int, default=20000, help="synthetic corpus size")
+    parser.add_argument("--channels", type=int, default=40)
+    parser.add_argument("--containers", type=int, default=4)
+    parser.add_argument("--ttl", type=float, nargs="+", default=[60, 600, 3600])
+    parser.add_argument("--max-entries", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = [json.loads(line) for line in args.corpus.read_text().splitlines() if line.strip()]
+    else:
+        corpus = synthetic_corpus(args.messages, args.channels, args.seed)
+    corpus.sort(key=lambda message: float(message.get("ts") or 0))
+
+    print(f"corpus: {len(corpus)} messages, max_entries={args.max_entries}")
+    print(f"{'ttl':>7} {'local':>7} {f'{args.containers} containers':>13} {'+shared':>8}  router calls saved")
+    for ttl in args.ttl:
+        rates = []
+        for containers, shared in ((1, False), (args.containers, False), (args.containers, True)):
+            cacheable, hits = replay(corpus, ttl, args.max_entries, containers, shared)
+            rates.append(hits / cacheable if cacheable else 0.0)
+        print(
+            f"{ttl:>6.0f}s {rates[0]:>7.1%} {rates[1]:>13.1%} {rates[2]:>8.1%}  "
+            f"{rates[2] * cacheable / len(corpus):.1%} of all messages (+shared)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Report the share of messages resolved without an LLM call on a labelled corpus.
+
+Runs Step 0 of the orchestration (graph._screen: the pre-filter, then the
+routing rules) over a corpus of Slack messages labelled "reply" or "ignore" and
+reports:
+
+- the share decided by the pre-filter, by each rule, and left to the Router Agent
+- how often the pre-filter / rule decisions agree with the labels
+- the Step 0 time per message
+
+--corpus is a JSONL file, one message per line::
+
+    {"text": "...", "is_mentioned": false, "is_dm": false, "channel_kind": "public",
+     "channel_id": "C1", "ts": "1700000000.000100", "thread_ts": "", "label": "ignore"}
+
+Without --corpus a synthetic corpus (questions, mentions, DMs, chatter,
+acknowledgements, emoji, URLs and code snippets) is used. --rules is a spec file
+as read through ROUTING_RULES_FILE (default: DEFAULT_SPEC below).
+
+Usage (from src/lambda/agentcore-strands)::
+
+    uv run python scripts/bench_routing_rules.py --messages 5000
+    uv run python scripts/bench_routing_rules.py --corpus labelled.jsonl --rules rules.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.pop("SSM_ROUTING_RULES", None)
+logging.disable(logging.WARNING)
+
+from envelope import MessageEnvelope  # noqa: E402
+from graph import _screen  # noqa: E402
+from routing_rules import get_routing_rules  # noqa: E402
+
+DEFAULT_SPEC = {
+    "utc_offset": "+09:00",
+    "rules": [
+        {"name": "mention", "when": {"is_mentioned": True}, "decision": "reply"},
+        {"name": "dm", "when": {"is_dm": True}, "decision": "reply"},
+        {"name": "emoji_only", "when": {"emoji_only": True}, "decision": "ignore"},
+        {"name": "url_only", "when": {"url_only": True}, "decision": "ignore"},
+        {
+            "name": "ack",
+            "when": {"text_in": ["了解", "了解です", "ありがとうございます", "ok", "👍", "承知しました"]},
+            "decision": "ignore",
+        },
+    ],
+}
+
+_QUESTIONS = ["デプロイ手順を教えてください", "このエラーの原因わかる人いますか", "明日の定例は何時からでしたっけ"]
+_CHATTER = ["今日は暑いですね", "ランチ行ってきます", "やっとビルド通った", "会議室どこだっけ…あった"]
+
+
+def synthetic_corpus(size: int, seed: int) -> list[dict]:
+    """Labelled messages in rough proportions of a busy team channel."""
+    rng = random.Random(seed)
+    kinds = [
+        (12, lambda: {"text": f"<@U_BOT> {rng.choice(_QUESTIONS)}", "is_mentioned": True}, "reply"),
+        (5, lambda: {"text": rng.choice(_QUESTIONS), "is_dm": True, "channel_kind": "im"}, "reply"),
+        (15, lambda: {"text": rng.choice(_QUESTIONS)}, "reply"),
+        (25, lambda: {"text": rng.choice(_CHATTER)}, "ignore"),
+        (15, lambda: {"text": rng.choice(["了解です！", "ありがとうございます。", "OK", "👍"])}, "ignore"),
+        (8, lambda: {"text": rng.choice([":tada:", ":+1: :pray:", "🙏🙏"])}, "ignore"),
+        (6, lambda: {"text": f"https://example.com/pull/{rng.randrange(1000)}"}, "ignore"),
+        (4, lambda: {"text": "```\nTraceback (most recent call last):\n  ...\n```"}, "reply"),
+        (10, lambda: {"text": rng.choice(["w", "草", "はい", "!"])}, "ignore"),
+    ]
+    weights = [weight for weight, _, _ in kinds]
+    corpus = []
+    for n in range(size):
+        _, make, label = rng.choices(kinds, weights)[0]
+        ts = f"{1700000000 + n}.000100"
+        thread_ts = ts if rng.random() < 0.7 else f"{1700000000 + n - 5}.000100"
+        corpus.append(
+            {"channel_id": f"C{n % 8:04d}", "channel_kind": "public", "ts": ts, "thread_ts": thread_ts}
+            | make()
+            | {"label": label}
+        )
+    return corpus
+
+
+def envelope_of(message: dict) -> MessageEnvelope:
+    return MessageEnvelope(
+        text=message["text"],
+        channel_id=message.get("channel_id", ""),
+        ts=message.get("ts", ""),
+        thread_ts=message.get("thread_ts", ""),
+        is_mentioned=message.get("is_mentioned", False),
+        is_dm=message.get("is_dm", False),
+        channel_kind=message.get("channel_kind", "unknown"),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="labelled JSONL (default: synthetic corpus)")
+    parser.add_argument("--rules", type=Path, help="routing rules spec file (default: DEFAULT_SPEC)")
+    parser.add_argument("--messages", type=int, default=5000, help="synthetic corpus size")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = [json.loads(line) for line in args.corpus.read_text().splitlines() if line.strip()]
+    else:
+        corpus = synthetic_corpus(args.messages, args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rules_path = args.rules
+        if rules_path is None:
+            rules_path = Path(tmp) / "rules.json"
+            rules_path.write_text(json.dumps(DEFAULT_SPEC), encoding="utf-8")
+        os.environ["ROUTING_RULES_FILE"] = str(rules_path)
+
+        envelopes = [envelope_of(message) for message in corpus]
+        started = time.perf_counter()
+        screened = [_screen(envelope) for envelope in envelopes]
+        elapsed = time.perf_counter() - started
+
+        deciders: Counter = Counter()
+        agreed: Counter = Counter()
+        for message, envelope, (prefiltered, rule_output) in zip(corpus, envelopes, screened):
+            if prefiltered is not None:
+                decider, should_reply = "pre-filter", prefiltered["should_reply"]
+            elif rule_output is not None:
+                rule = get_routing_rules().evaluate(envelope).rule
+                decider, should_reply = f"rule {rule}", rule_output.should_reply
+            else:
+                deciders["Router Agent"] += 1
+                continue
+            deciders[decider] += 1
+            agreed[decider] += should_reply == (message["label"] == "reply")
+
+    total = len(corpus)
+    print(f"corpus: {total} messages, {Counter(m['label'] for m in corpus)['reply'] / total:.1%} labelled reply")
+    for decider, count in deciders.most_common():
+        agreement = f"  agrees with label {agreed[decider] / count:>6.1%}" if decider in agreed else ""
+        print(f"  {decider:<16} {count / total:>6.1%}{agreement}")
+    resolved = total - deciders["Router Agent"]
+    print(
+        f"resolved without an LLM call: {resolved / total:.1%} "
+        f"(agrees with label: {sum(agreed.values()) / max(resolved, 1):.1%})"
+    )
+    print(f"Step 0 time: {elapsed / total * 1e6:.1f}us/message")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Report the latency saved and the tokens wasted by the speculative Conversation Agent.
+
+Runs graph.run_orchestration on mentioned messages with FakeModel
+(scripts/fake_model.py) standing in for both agents, once with
+SPECULATIVE_CONVERSATION off and once on. The fake Router ignores a share of the
+messages (--ignore-rate); for those a speculative Conversation call is
+discarded. Reported per run:
+
+- p50/mean latency of the replied and of the ignored messages
+- Conversation Agent tokens; the extra tokens of the speculative run are the
+  tokens wasted on discarded calls
+
+With --memory the real BudgetedMemorySessionManager runs against FakeMemoryData
+(scripts/fake_memory.py), so the session restore of the speculative agent's own
+session manager is included.
+
+Usage (from src/lambda/agentcore-strands)::
+
+    uv run python scripts/bench_speculation.py --messages 20 --ignore-rate 0.2
+    uv run python scripts/bench_speculation.py --memory --memory-latency-ms 30
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ["SPECULATIVE_CONVERSATION"] = "true"
+for name in ("SSM_ROUTER_SYSTEM_PROMPT", "SSM_CONVERSATION_SYSTEM_PROMPT", "SSM_ROUTING_RULES"):
+    os.environ.pop(name, None)
+logging.disable(logging.WARNING)
+
+import graph  # noqa: E402
+import speculation  # noqa: E402
+from envelope import MessageEnvelope  # noqa: E402
+from fake_memory import FakeMemoryData, attach_fake_memory  # noqa: E402
+from fake_model import FakeModel  # noqa: E402
+
+MEMORY_ID = "mem-bench"
+IGNORED_MARKER = "（独り言）"
+
+
+def router_output(messages: list) -> dict:
+    """Ignore the messages carrying IGNORED_MARKER, reply to the rest."""
+    query = messages[-1]["content"][-1].get("text", "")
+    if IGNORED_MARKER in query:
+        return {"should_reply": False, "route": "ignore", "reason": "独り言のため返信不要"}
+    return {"should_reply": True, "route": "full_reply", "typing_style": "short", "reason": "メンション"}
+
+
+def messages(count: int, ignore_rate: float, seed: int) -> list[MessageEnvelope]:
+    rng = random.Random(seed)
+    envelopes = []
+    for n in range(count):
+        marker = IGNORED_MARKER if rng.random() < ignore_rate else ""
+        envelopes.append(
+            MessageEnvelope(
+                text=f"<@U_BOT> 質問 {n}{marker}: 昨日の障害の経緯をまとめてもらえますか",
+                team_id="T_BENCH",
+                channel_id=f"C{n % 3:04d}",
+                ts=f"{1700000000 + n}.000100",
+                is_mentioned=True,
+                channel_kind="public",
+            )
+        )
+    return envelopes
+
+
+def tokens(model: FakeModel) -> int:
+    return model.input_token_total + model.calls * model.output_tokens
+
+
+def run(envelopes: list[MessageEnvelope], memory: bool) -> dict[str, list[float]]:
+    """Seconds per message, by outcome ("replied" / "ignored")."""
+    samples: dict[str, list[float]] = {"replied": [], "ignored": []}
+    for envelope in envelopes:
+        started = time.perf_counter()
+        result = graph.run_orchestration(
+            envelope,
+            memory_id=MEMORY_ID if memory else None,
+            session_id=envelope.channel_id,
+            actor_id=envelope.team_id,
+        )
+        samples["replied" if result["should_reply"] else "ignored"].append(
+            time.perf_counter() - started
+        )
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--ignore-rate", type=float, default=0.2)
+    parser.add_argument("--router-latency-ms", type=float, default=300.0)
+    parser.add_argument("--conversation-latency-ms", type=float, default=800.0)
+    parser.add_argument("--memory", action="store_true", help="use the fake Memory backend")
+    parser.add_argument("--memory-latency-ms", type=float, default=20.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    envelopes = messages(args.messages, args.ignore_rate, args.seed)
+    print(
+        f"{len(envelopes)} mentioned messages, router={args.router_latency_ms:.0f}ms, "
+        f"conversation={args.conversation_latency_ms:.0f}ms, "
+        f"memory={'fake (%.0fms/call)' % args.memory_latency_ms if args.memory else 'off'}"
+    )
+
+    results = {}
+    for label, enabled in (("sequential", False), ("speculative", True)):
+        speculation.SPECULATIVE_CONVERSATION = enabled
+        graph.ROUTER_MODEL_ID = FakeModel(
+            outputs={"RouterResponse": router_output}, latency=args.router_latency_ms / 1000
+        )
+        conversation_model = FakeModel(
+            outputs={"ConversationResponse": {"reply_text": "昨日の障害は DB の接続数上限が原因でした。"}},
+            latency=args.conversation_latency_ms / 1000,
+        )
+        graph.CONVERSATION_MODEL_ID = conversation_model
+        restore = None
+        if args.memory:
+            restore = attach_fake_memory(graph, FakeMemoryData(args.memory_latency_ms / 1000))
+        try:
+            samples = run(envelopes, args.memory)
+            if enabled:
+                # Discarded calls keep running; wait for them before counting their tokens
+                speculation._executor.shutdown(wait=True)
+        finally:
+            if restore:
+                restore()
+        results[label] = (samples, tokens(conversation_model))
+
+        line = [f"{label:>11}:"]
+        for outcome, values in samples.items():
+            if values:
+                line.append(
+                    f"{outcome} p50={statistics.median(values) * 1e3:.0f}ms "
+                    f"mean={statistics.fmean(values) * 1e3:.0f}ms (n={len(values)})"
+                )
+        line.append(f"conversation calls={conversation_model.calls} tokens={tokens(conversation_model)}")
+        print("  ".join(line))
+
+    sequential, sequential_tokens = results["sequential"]
+    speculative, speculative_tokens = results["speculative"]
+    replied = len(sequential["replied"])
+    saved = sum(sequential["replied"]) - sum(speculative["replied"])
+    wasted = speculative_tokens - sequential_tokens
+    print(
+        f"latency saved: {saved / max(replied, 1) * 1e3:.0f}ms per replied message; "
+        f"tokens wasted: {wasted} ({wasted / max(sequential_tokens, 1):.1%} more conversation tokens)"
+    )
+
+
+if __name__ == "__main__":
+    main()
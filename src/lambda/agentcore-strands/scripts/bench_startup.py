@@ -0,0 +1,119 @@
+"""Benchmark the AgentCore Runtime cold start.
+
+Starts handler.py the way the container does, through scripts/fake_runtime.py
+which swaps the Bedrock models for FakeModel (scripts/fake_model.py), then
+measures:
+
+- ready: time until GET /ping answers
+- first_invocation: time until the first POST /invocations returns
+
+The first invocation is a mention, so it goes through the orchestration import,
+prompt loading, the Router Agent and the Conversation Agent like a real first
+reply; only the model calls themselves are instant. No Bedrock, Memory or SSM
+access is needed (AGENTCORE_MEMORY_ID and SSM_* are removed from the
+environment).
+
+Usage (from src/lambda/agentcore-strands)::
+
+    uv run python scripts/bench_startup.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+RUNTIME_DIR = Path(__file__).resolve().parent.parent
+PORT = 8080
+
+# A mention: routed by the Router Agent and answered by the Conversation Agent
+PAYLOAD = {
+    "prompt": "<@U_BOT> ステージングへのデプロイ手順を教えてください",
+    "metadata": {
+        "slack": {
+            "team_id": "T_BENCH",
+            "channel_id": "C_BENCH",
+            "ts": "1700000000.000100",
+            "is_mentioned": True,
+            "channel_kind": "public",
+        }
+    },
+}
+
+
+def _wait_for_ping(deadline: float) -> None:
+    while True:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{PORT}/ping", timeout=1) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        if time.monotonic() > deadline:
+            raise TimeoutError("runtime did not answer /ping")
+        time.sleep(0.01)
+
+
+def _invoke() -> dict:
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{PORT}/invocations",
+        data=json.dumps(PAYLOAD).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=60) as response:
+        return json.loads(response.read())
+
+
+def measure_once(timeout: float) -> tuple[float, float]:
+    """(seconds until ready, seconds until the first invocation returned)."""
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key != "AGENTCORE_MEMORY_ID" and not key.startswith("SSM_")
+    }
+    started = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, "scripts/fake_runtime.py"],
+        cwd=RUNTIME_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_ping(started + timeout)
+        ready = time.monotonic() - started
+        result = _invoke()
+        first_invocation = time.monotonic() - started
+        if not result.get("reply_text"):
+            raise RuntimeError(f"unexpected result: {result}")
+        return ready, first_invocation
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for /ping")
+    args = parser.parse_args()
+
+    samples = [measure_once(args.timeout) for _ in range(args.runs)]
+    for label, values in (
+        ("ready", [ready for ready, _ in samples]),
+        ("first_invocation", [first for _, first in samples]),
+    ):
+        print(
+            f"{label:>16}: median={statistics.median(values):.3f}s "
+            f"min={min(values):.3f}s max={max(values):.3f}s (n={len(values)})"
+        )
+
+
+if __name__ == "__main__":
+    main()
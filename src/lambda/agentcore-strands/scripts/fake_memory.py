@@ -0,0 +1,144 @@
+"""Fake AgentCore Memory data plane for the benchmarks (no AWS access).
+
+FakeMemoryData stands in for the ``bedrock-agentcore`` boto3 client that
+AgentCoreMemorySessionManager uses through its MemoryClient, so the real
+(Budgeted)MemorySessionManager runs unchanged: session restore, event writes and
+long-term memory retrieval all go through it. Events are kept in memory per
+(actor, session); long-term records are seeded per namespace. Each call can
+sleep to simulate the service latency.
+
+Use attach_fake_memory() to point the session managers created by graph.py at
+one FakeMemoryData instance.
+"""
+
+import itertools
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+
+class FakeMemoryData:
+    """In-memory replacement for the bedrock-agentcore data plane client.
+
+    Args:
+        latency: Seconds to sleep per API call
+        records: Long-term memory records per namespace, as
+            [{"content": {"text": ...}, "score": ...}, ...]
+    """
+
+    def __init__(self, latency: float = 0.0, records: Optional[dict[str, list[dict]]] = None) -> None:
+        self.latency = latency
+        self.records = records or {}
+        self.events: dict[tuple[str, str], list[dict]] = {}
+        self.calls: dict[str, int] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _call(self, name: str) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def create_event(
+        self,
+        actorId: str,
+        sessionId: str,
+        payload: list,
+        eventTimestamp: Optional[datetime] = None,
+        metadata: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> dict:
+        self._call("create_event")
+        event = {
+            "eventId": f"event-{next(self._ids):08d}",
+            "actorId": actorId,
+            "sessionId": sessionId,
+            "eventTimestamp": eventTimestamp or datetime.now(timezone.utc),
+            "payload": payload,
+            "metadata": metadata or {},
+        }
+        with self._lock:
+            self.events.setdefault((actorId, sessionId), []).append(event)
+        return {"event": event}
+
+    def list_events(
+        self,
+        actorId: str,
+        sessionId: str,
+        maxResults: int = 100,
+        filter: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> dict:
+        """Newest first, like the service (no pagination)."""
+        self._call("list_events")
+        expected = {
+            condition["left"]["metadataKey"]: condition["right"]["metadataValue"]["stringValue"]
+            for condition in (filter or {}).get("eventMetadata", [])
+        }
+        with self._lock:
+            events = list(reversed(self.events.get((actorId, sessionId), [])))
+        matched = [
+            event
+            for event in events
+            if all(
+                event["metadata"].get(key, {}).get("stringValue") == value
+                for key, value in expected.items()
+            )
+        ]
+        return {"events": matched[:maxResults]}
+
+    def get_event(self, actorId: str, sessionId: str, eventId: str, **kwargs: Any) -> dict:
+        self._call("get_event")
+        with self._lock:
+            events = self.events.get((actorId, sessionId), [])
+            return {"event": next(event for event in events if event["eventId"] == eventId)}
+
+    def delete_event(self, actorId: str, sessionId: str, eventId: str, **kwargs: Any) -> dict:
+        self._call("delete_event")
+        with self._lock:
+            events = self.events.get((actorId, sessionId), [])
+            events[:] = [event for event in events if event["eventId"] != eventId]
+        return {}
+
+    def retrieve_memory_records(self, searchCriteria: dict, **kwargs: Any) -> dict:
+        self._call("retrieve_memory_records")
+        namespace = kwargs.get("namespace") or kwargs.get("namespacePath") or ""
+        records = sorted(self.records.get(namespace, []), key=lambda r: r["score"], reverse=True)
+        return {"memoryRecordSummaries": records[: searchCriteria.get("topK", 10)]}
+
+
+class _FakeBotoSession:
+    """boto3.Session handing out the fake client (for the session manager's boto_session)."""
+
+    def __init__(self, backend: FakeMemoryData, region_name: str = "us-east-1") -> None:
+        self.backend = backend
+        self.region_name = region_name
+
+    def client(self, service_name: str, **kwargs: Any) -> FakeMemoryData:
+        return self.backend
+
+
+def attach_fake_memory(graph: Any, backend: FakeMemoryData) -> Callable:
+    """Make graph._create_session_manager build real session managers backed by backend.
+
+    The session restore runs in the session manager's constructor, so the fake
+    client is passed in through its boto_session argument.
+
+    Returns:
+        A function restoring the original session manager class
+    """
+    original = graph.budgeted_session_manager_class
+    session_manager_class = original()
+
+    class FakeBackedSessionManager(session_manager_class):
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            super().__init__(*args, boto_session=_FakeBotoSession(backend), **kwargs)
+
+    graph.budgeted_session_manager_class = lambda: FakeBackedSessionManager
+
+    def restore() -> None:
+        graph.budgeted_session_manager_class = original
+
+    return restore
@@ -0,0 +1,105 @@
+"""Fake Strands model provider for the benchmarks (no Bedrock access).
+
+FakeModel answers structured-output calls with a fixed tool use of the
+requested output model (RouterResponse, ConversationResponse, ...) and plain
+calls with fixed text streamed in chunks. Each call can sleep to simulate the
+model's latency and reports token usage like Bedrock does, so AgentResult
+metrics and the speculation waste accounting work as in production.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Any, AsyncIterator, Optional
+
+from strands.models import Model
+
+
+class FakeModel(Model):
+    """Model returning canned answers.
+
+    Args:
+        outputs: Tool input per structured output model name
+            (e.g. {"RouterResponse": {...}}); a callable receives the
+            messages and returns the input
+        text: Reply for calls without structured output
+        latency: Seconds to sleep per call
+        input_tokens: Input token count reported per call (None: estimate
+            from the request size, 4 characters per token)
+        output_tokens: Output token count reported per call
+    """
+
+    def __init__(
+        self,
+        outputs: Optional[dict[str, Any]] = None,
+        text: str = "了解しました。",
+        latency: float = 0.0,
+        input_tokens: Optional[int] = None,
+        output_tokens: int = 50,
+    ) -> None:
+        self.outputs = outputs or {}
+        self.text = text
+        self.latency = latency
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.calls = 0
+        self.input_token_total = 0
+        self._lock = threading.Lock()
+
+    def update_config(self, **model_config: Any) -> None:
+        pass
+
+    def get_config(self) -> dict:
+        return {"model_id": "fake"}
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        raise NotImplementedError("FakeModel answers structured output through the tool")
+        yield  # pragma: no cover
+
+    async def stream(
+        self,
+        messages: list,
+        tool_specs: Optional[list] = None,
+        system_prompt: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[dict]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        input_tokens = self.input_tokens
+        if input_tokens is None:
+            size = len(system_prompt or "") + len(json.dumps(messages, ensure_ascii=False, default=str))
+            input_tokens = size // 4
+        with self._lock:
+            self.calls += 1
+            self.input_token_total += input_tokens
+
+        yield {"messageStart": {"role": "assistant"}}
+        spec = next((s for s in tool_specs or [] if s["name"] in self.outputs), None)
+        if spec is not None:
+            output = self.outputs[spec["name"]]
+            tool_input = output(messages) if callable(output) else output
+            yield {
+                "contentBlockStart": {
+                    "start": {"toolUse": {"name": spec["name"], "toolUseId": f"fake-{self.calls}"}}
+                }
+            }
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": json.dumps(tool_input)}}}}
+            yield {"contentBlockStop": {}}
+            stop_reason = "tool_use"
+        else:
+            for start in range(0, len(self.text), 20):
+                yield {"contentBlockDelta": {"delta": {"text": self.text[start : start + 20]}}}
+            yield {"contentBlockStop": {}}
+            stop_reason = "end_turn"
+        yield {"messageStop": {"stopReason": stop_reason}}
+        yield {
+            "metadata": {
+                "usage": {
+                    "inputTokens": input_tokens,
+                    "outputTokens": self.output_tokens,
+                    "totalTokens": input_tokens + self.output_tokens,
+                },
+                "metrics": {"latencyMs": int(self.latency * 1000)},
+            }
+        }
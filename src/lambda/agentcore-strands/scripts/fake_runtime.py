@@ -0,0 +1,61 @@
+"""Run handler.py as the container does, with FakeModel in place of Bedrock.
+
+Used by bench_startup.py. The Router and Conversation models are replaced when
+graph is first imported (by the handler's preload thread or the first
+request), so startup imports nothing the real runtime would not: strands is
+still loaded in the background after the server starts.
+
+Usage (from src/lambda/agentcore-strands)::
+
+    uv run python scripts/fake_runtime.py
+"""
+
+import importlib.abc
+import importlib.machinery
+import runpy
+import sys
+from pathlib import Path
+
+RUNTIME_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RUNTIME_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+ROUTER_OUTPUT = {
+    "should_reply": True,
+    "route": "full_reply",
+    "reply_mode": "thread",
+    "typing_style": "short",
+    "reason": "メンションされたため返信",
+}
+CONVERSATION_OUTPUT = {"reply_text": "デプロイは main へのマージ後に自動で実行されます。"}
+
+
+def _use_fake_models(graph) -> None:
+    from fake_model import FakeModel
+
+    graph.ROUTER_MODEL_ID = FakeModel(outputs={"RouterResponse": ROUTER_OUTPUT})
+    graph.CONVERSATION_MODEL_ID = FakeModel(outputs={"ConversationResponse": CONVERSATION_OUTPUT})
+
+
+class _PatchGraphOnImport(importlib.abc.MetaPathFinder):
+    """Run _use_fake_models on the graph module right after it is executed."""
+
+    def find_spec(self, name, path, target=None):
+        if name != "graph":
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(name, path)
+        if spec is None:
+            return None
+        exec_module = spec.loader.exec_module
+
+        def exec_and_patch(module) -> None:
+            exec_module(module)
+            _use_fake_models(module)
+
+        spec.loader.exec_module = exec_and_patch
+        return spec
+
+
+if __name__ == "__main__":
+    sys.meta_path.insert(0, _PatchGraphOnImport())
+    runpy.run_path(str(RUNTIME_DIR / "handler.py"), run_name="__main__")
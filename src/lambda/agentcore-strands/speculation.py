@@ -0,0 +1,106 @@
+"""Speculative Conversation Agent execution.
+
+When the Router is all but certain to say "reply" (by default: the bot was
+mentioned or the message is a DM), the Conversation Agent can start at the same
+time as the Router instead of after it. If the Router then decides to ignore the
+message, the speculative result is discarded.
+
+A running model call cannot be cancelled, so a discarded call keeps running in
+the background; its token usage is logged as wasted once it finishes. Its turn
+is also written to the session's short-term memory like any other call, which is
+why the default policy only speculates where the Router is required to reply.
+
+Enable with SPECULATIVE_CONVERSATION=true. The policy can be replaced with
+set_speculation_policy().
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from envelope import MessageEnvelope
+
+logger = logging.getLogger(__name__)
+
+SPECULATIVE_CONVERSATION = os.environ.get("SPECULATIVE_CONVERSATION", "false").lower() == "true"
+SPECULATION_MAX_WORKERS = int(os.environ.get("SPECULATION_MAX_WORKERS", "4"))
+
+_executor = ThreadPoolExecutor(
+    max_workers=SPECULATION_MAX_WORKERS, thread_name_prefix="speculative-conversation"
+)
+
+
+def default_speculation_policy(envelope: MessageEnvelope) -> bool:
+    """Speculate when the Router prompt requires a reply anyway."""
+    return envelope.is_mentioned or envelope.is_dm
+
+
+_policy: Callable[[MessageEnvelope], bool] = default_speculation_policy
+
+
+def set_speculation_policy(policy: Callable[[MessageEnvelope], bool]) -> None:
+    """Replace the policy deciding which messages get a speculative Conversation call."""
+    global _policy
+    _policy = policy
+
+
+def should_speculate(envelope: MessageEnvelope) -> bool:
+    """Whether to start the Conversation Agent alongside the Router for this message."""
+    if not SPECULATIVE_CONVERSATION:
+        return False
+    try:
+        return bool(_policy(envelope))
+    except Exception as e:
+        logger.warning("Speculation policy failed, not speculating: %s", e)
+        return False
+
+
+def total_tokens(agent_result: Any) -> int:
+    """Total tokens used by a Strands AgentResult (0 when unavailable)."""
+    metrics = getattr(agent_result, "metrics", None)
+    usage = getattr(metrics, "accumulated_usage", None) or {}
+    return int(usage.get("totalTokens", 0))
+
+
+class SpeculativeCall:
+    """A Conversation Agent call started before the Router has decided."""
+
+    def __init__(
+        self,
+        fn: Callable[[], Any],
+        executor: ThreadPoolExecutor = _executor,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self._started_at = clock()
+        self._finished_at: Optional[float] = None
+        self._future: Future = executor.submit(self._run, fn)
+
+    def _run(self, fn: Callable[[], Any]) -> Any:
+        try:
+            return fn()
+        finally:
+            self._finished_at = self._clock()
+
+    def result(self, router_seconds: float) -> Any:
+        """Wait for the speculative result and log the latency saved versus running it afterwards."""
+        agent_result = self._future.result()
+        conversation_seconds = (self._finished_at or self._clock()) - self._started_at
+        logger.info(
+            "Speculative conversation used: saved=%.2fs (router=%.2fs, conversation=%.2fs)",
+            min(router_seconds, conversation_seconds),
+            router_seconds,
+            conversation_seconds,
+        )
+        return agent_result
+
+    def discard(self, reason: str) -> None:
+        """Drop the result; the wasted tokens are logged once the call finishes."""
+
+        def log_waste(future: Future) -> None:
+            wasted = 0 if future.exception() is not None else total_tokens(future.result())
+            logger.info("Speculative conversation discarded (%s): wasted_tokens=%d", reason, wasted)
+
+        self._future.add_done_callback(log_waste)
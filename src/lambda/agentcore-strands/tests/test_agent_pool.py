@@ -0,0 +1,128 @@
+"""Tests for agent_pool.py."""
+
+from types import SimpleNamespace
+
+import pytest
+
+import handler
+from agent_pool import AgentPool
+
+KEY = ("memory", "C1", "T1", ("v1", "v1"))
+
+
+class FakeAgent:
+    def __init__(self, session_manager) -> None:
+        self.session_manager = session_manager
+        self.messages: list[dict] = []
+
+
+def session_manager():
+    return SimpleNamespace(config=SimpleNamespace(context_tag="user_context"))
+
+
+def test_entry_is_reused_across_checkouts():
+    pool = AgentPool()
+
+    with pool.checkout(KEY, session_manager) as first:
+        agent = first.agent("router", FakeAgent)
+    with pool.checkout(KEY, session_manager) as second:
+        assert second is first
+        assert second.agent("router", FakeAgent) is agent
+
+
+def test_checkout_without_reuse_builds_fresh_agents_every_time():
+    pool = AgentPool()
+
+    with pool.checkout(KEY, session_manager, reuse=False) as first:
+        first.agent("router", FakeAgent)
+    with pool.checkout(KEY, session_manager, reuse=False) as second:
+        assert second is not first
+        assert second.agents == {}
+    with pool.checkout(KEY, session_manager) as pooled:
+        assert pooled is not first and pooled is not second
+
+
+def test_busy_entry_is_not_handed_out_twice():
+    pool = AgentPool()
+    with pool.checkout(KEY, session_manager) as first:
+        pass
+
+    with pool.checkout(KEY, session_manager) as pooled:
+        with pool.checkout(KEY, session_manager) as concurrent:
+            assert pooled is first
+            assert concurrent is not first
+    with pool.checkout(KEY, session_manager) as again:
+        assert again is first
+
+
+def test_failed_entry_is_discarded():
+    pool = AgentPool()
+
+    with pool.checkout(KEY, session_manager) as first:
+        first.mark_failed()
+    with pool.checkout(KEY, session_manager) as second:
+        assert second is not first
+
+
+def test_entry_marked_not_to_be_returned_is_discarded():
+    pool = AgentPool()
+
+    with pool.checkout(KEY, session_manager) as first:
+        first.discard()
+    with pool.checkout(KEY, session_manager) as second:
+        assert second is not first
+        assert not second.failed
+
+
+def test_exception_discards_the_entry():
+    pool = AgentPool()
+
+    with pytest.raises(RuntimeError):
+        with pool.checkout(KEY, session_manager) as first:
+            raise RuntimeError("model error")
+    with pool.checkout(KEY, session_manager) as second:
+        assert second is not first
+
+
+def test_least_recently_used_session_is_evicted():
+    pool = AgentPool(max_sessions=1)
+    other = ("memory", "C2", "T1", ("v1", "v1"))
+
+    with pool.checkout(KEY, session_manager) as first:
+        pass
+    with pool.checkout(other, session_manager):
+        pass
+    with pool.checkout(KEY, session_manager) as again:
+        assert again is not first
+
+
+def test_release_strips_the_retrieved_memory_context():
+    pool = AgentPool()
+
+    with pool.checkout(KEY, session_manager) as entry:
+        agent = entry.agent("conversation", FakeAgent)
+        agent.messages = [
+            {"role": "user", "content": [{"text": "<user_context>facts</user_context>"}, {"text": "hi"}]},
+            {"role": "assistant", "content": [{"text": "hello"}]},
+        ]
+
+    assert agent.messages[0]["content"] == [{"text": "hi"}]
+    assert agent.messages[1]["content"] == [{"text": "hello"}]
+
+
+def test_agents_without_memory_forget_the_request():
+    pool = AgentPool()
+
+    with pool.checkout(KEY, lambda: None) as entry:
+        agent = entry.agent("router", FakeAgent)
+        agent.messages.append({"role": "user", "content": [{"text": "hi"}]})
+
+    assert agent.messages == []
+
+
+@pytest.mark.parametrize(
+    "metadata, expected",
+    [({"session_affinity": "channel"}, True), ({"session_affinity": "thread"}, False), ({}, False)],
+)
+def test_agents_are_reused_only_with_channel_affinity(metadata, expected):
+    assert handler._reuse_agents(metadata) is expected
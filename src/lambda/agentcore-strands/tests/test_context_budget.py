@@ -0,0 +1,172 @@
+"""Tests for context_budget.py."""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import context_budget
+import graph
+from context_budget import (
+    Record,
+    assemble,
+    budgeted_session_manager_class,
+    context_budget as budget_for,
+    retrieval_config,
+)
+
+PREFERENCES = "/preferences/{actorId}"
+FACTS = "/facts/{actorId}"
+SUMMARIES = "/summaries/{actorId}/{sessionId}"
+
+
+@pytest.mark.parametrize(
+    "agent_name, route, expected",
+    [
+        ("router", None, context_budget.MEMORY_CONTEXT_TOKENS_ROUTER),
+        ("router", "simple_reply", context_budget.MEMORY_CONTEXT_TOKENS_ROUTER),
+        ("conversation", "simple_reply", context_budget.MEMORY_CONTEXT_TOKENS_SIMPLE_REPLY),
+        ("conversation", "full_reply", context_budget.MEMORY_CONTEXT_TOKENS_FULL_REPLY),
+        ("conversation", None, context_budget.MEMORY_CONTEXT_TOKENS_FULL_REPLY),
+    ],
+)
+def test_budget_by_agent_and_route(agent_name, route, expected):
+    assert budget_for(agent_name, route, "amazon.nova-lite-v1:0") == expected
+
+
+def test_budget_is_capped_by_the_model_context_window(monkeypatch):
+    monkeypatch.setattr(context_budget, "MEMORY_CONTEXT_MAX_FRACTION", 0.001)
+
+    assert budget_for("conversation", "full_reply", "amazon.nova-micro-v1:0") == 128
+
+
+def test_retrieval_top_k_follows_the_largest_budget(monkeypatch):
+    monkeypatch.setattr(context_budget, "MEMORY_CONTEXT_TOKENS_FULL_REPLY", 1600)
+    monkeypatch.setattr(context_budget, "MEMORY_RECORD_TOKENS", 80)
+
+    config = retrieval_config(SimpleNamespace)
+
+    assert {namespace: c.top_k for namespace, c in config.items()} == {
+        PREFERENCES: 4,
+        FACTS: 10,
+        SUMMARIES: 6,
+    }
+    assert config[PREFERENCES].relevance_score == 0.7
+
+
+def test_each_namespace_is_trimmed_to_its_share():
+    records = [Record(FACTS, f"fact {i}", 0.9 - i / 100, 20) for i in range(10)]
+
+    kept, dropped = assemble(records, budget=100)
+
+    # Facts get 50 of their own and the 50 nobody else used
+    assert [r.text for r in kept] == [f"fact {i}" for i in range(5)]
+    assert len(dropped) == 5
+
+
+def test_namespace_share_is_reserved_before_overflow():
+    records = [Record(FACTS, f"fact {i}", 0.9, 20) for i in range(10)]
+    records.append(Record(PREFERENCES, "likes tea", 0.71, 20))
+
+    kept, _ = assemble(records, budget=100)
+
+    assert kept[0].text == "likes tea"
+    assert sum(r.tokens for r in kept) <= 100
+
+
+class FakeMemoryClient:
+    def __init__(self, memories: dict[str, list[dict]]) -> None:
+        self.memories = memories
+        self.threads: list[str] = []
+
+    def retrieve_memories(self, memory_id, namespace_path, query, top_k):
+        self.threads.append(threading.current_thread().name)
+        return self.memories.get(namespace_path, [])
+
+
+def make_session_manager(route, memories):
+    cls = budgeted_session_manager_class()
+    if cls is None:
+        pytest.skip("bedrock_agentcore not installed")
+    manager = cls.__new__(cls)
+    manager.config = SimpleNamespace(
+        memory_id="memory",
+        actor_id="T1",
+        session_id="C1",
+        context_tag="user_context",
+        retrieval_config=retrieval_config(
+            lambda **kwargs: SimpleNamespace(strategy_id=None, **kwargs)
+        ),
+    )
+    manager.memory_client = FakeMemoryClient(memories)
+    manager.route = route
+    return manager
+
+
+def memory_event(agent_name="conversation"):
+    agent = SimpleNamespace(
+        name=agent_name,
+        model=SimpleNamespace(config={"model_id": "amazon.nova-lite-v1:0"}),
+        messages=[{"role": "user", "content": [{"text": "hello"}]}],
+    )
+    return SimpleNamespace(agent=agent)
+
+
+@pytest.mark.parametrize("route, expected_facts", [("simple_reply", 20), ("full_reply", 75)])
+def test_session_manager_budget_follows_the_route(route, expected_facts):
+    # 20 tokens each (80 ASCII characters)
+    facts = [
+        {"content": {"text": f"{i:03d}" + "x" * 77}, "score": 0.9 - i / 1000} for i in range(100)
+    ]
+    manager = make_session_manager(route, {"/facts/T1": facts})
+    event = memory_event()
+
+    manager.retrieve_customer_context(event)
+
+    content = event.agent.messages[-1]["content"]
+    assert content[-1] == {"text": "hello"}
+    assert content[0]["text"].count("\n") + 1 == expected_facts
+
+
+def test_namespaces_are_retrieved_on_the_shared_executor(monkeypatch):
+    manager = make_session_manager("full_reply", {})
+    # A per-call executor would fail here
+    monkeypatch.setattr(context_budget, "ThreadPoolExecutor", None)
+
+    manager.retrieve_customer_context(memory_event())
+    manager.retrieve_customer_context(memory_event())
+
+    threads = manager.memory_client.threads
+    assert len(threads) == 2 * len(context_budget.NAMESPACES)
+    assert all(name.startswith("memory-retrieval") for name in threads)
+
+
+def test_create_session_manager_uses_the_budgeted_class(monkeypatch):
+    created = {}
+
+    class FakeSessionManager:
+        def __init__(self, agentcore_memory_config, region_name):
+            created["config"] = agentcore_memory_config
+
+    monkeypatch.setattr(
+        graph,
+        "memory_classes",
+        lambda: (SimpleNamespace, lambda **kwargs: SimpleNamespace(**kwargs), object),
+    )
+    monkeypatch.setattr(graph, "budgeted_session_manager_class", lambda: FakeSessionManager)
+
+    session_manager = graph._create_session_manager("memory", "C1", "T1")
+
+    assert isinstance(session_manager, FakeSessionManager)
+    assert set(created["config"].retrieval_config) == {PREFERENCES, FACTS, SUMMARIES}
+    assert created["config"].retrieval_config[FACTS].top_k == retrieval_config(SimpleNamespace)[
+        FACTS
+    ].top_k
+
+
+def test_set_memory_route_reaches_the_session_manager():
+    session_manager = SimpleNamespace(route=None)
+
+    graph._set_memory_route(SimpleNamespace(session_manager=session_manager), "simple_reply")
+
+    assert session_manager.route == "simple_reply"
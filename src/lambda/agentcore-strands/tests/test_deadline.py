@@ -0,0 +1,66 @@
+"""Tests for deadline.py and the deadline fallback in the orchestration."""
+
+import pytest
+
+import graph
+from deadline import Deadline, budget_of
+from envelope import MessageEnvelope
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def deadline_in(seconds: float, clock: FakeClock) -> Deadline:
+    return Deadline.from_metadata({"deadline_ms": (clock.now + seconds) * 1000}, clock=clock)
+
+
+@pytest.mark.parametrize(
+    "remaining, expected",
+    [(60, "ok"), (30, "ok"), (29.9, "tight"), (5, "tight"), (4.9, "exhausted"), (-1, "exhausted")],
+)
+def test_budget_thresholds(remaining, expected):
+    clock = FakeClock()
+
+    assert deadline_in(remaining, clock).budget(tight_seconds=30, exhausted_seconds=5) == expected
+
+
+def test_budget_follows_the_clock():
+    clock = FakeClock()
+    deadline = deadline_in(40, clock)
+
+    assert deadline.remaining() == pytest.approx(40)
+    clock.now += 36
+    assert deadline.budget(tight_seconds=30, exhausted_seconds=5) == "exhausted"
+
+
+@pytest.mark.parametrize("value", [None, "1700000000000", True])
+def test_missing_or_invalid_deadline_is_ignored(value):
+    assert Deadline.from_metadata({"deadline_ms": value}) is None
+    assert budget_of(None) == "ok"
+
+
+@pytest.mark.parametrize(
+    "is_mentioned, is_dm, should_reply",
+    [(True, False, True), (False, True, True), (False, False, False)],
+)
+def test_exhausted_budget_replies_with_fallback_only_when_addressed(is_mentioned, is_dm, should_reply):
+    clock = FakeClock()
+    envelope = MessageEnvelope(
+        text="could you check the deploy status?",
+        channel_id="D1" if is_dm else "C1",
+        is_mentioned=is_mentioned,
+        is_dm=is_dm,
+        channel_kind="dm" if is_dm else "public",
+    )
+
+    router_output, result = graph._route(envelope, None, None, deadline_in(1, clock))
+
+    assert router_output is None
+    assert result["should_reply"] is should_reply
+    assert result["reason"] == "Deadline budget exhausted"
+    assert (result["reply_text"] == graph.DEADLINE_FALLBACK_REPLY) is should_reply
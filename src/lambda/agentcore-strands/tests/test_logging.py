@@ -0,0 +1,26 @@
+"""Tests for the request correlation IDs in the runtime logs."""
+
+import io
+import logging
+
+import handler
+from log_utils import clear_correlation_ids, install
+
+
+def test_invoke_logs_carry_the_slack_ids():
+    stream = io.StringIO()
+    log_handler = logging.StreamHandler(stream)
+    log_handler.setFormatter(logging.Formatter("%(message)s"))
+    root = logging.getLogger()
+    root.addHandler(log_handler)
+    install(root)
+    try:
+        result = handler.invoke(
+            {"prompt": "", "metadata": {"slack": {"channel_id": "C1", "ts": "171.0"}}}
+        )
+    finally:
+        root.removeHandler(log_handler)
+        clear_correlation_ids()
+
+    assert result["reason"] == "Empty prompt"
+    assert "[channel_id=C1 ts=171.0] Empty prompt received" in stream.getvalue()
@@ -0,0 +1,34 @@
+"""Tests for the startup preload in handler.py."""
+
+import sys
+
+import handler
+import prompt_loader
+
+
+def test_background_refresh_starts_even_when_the_preload_fails(monkeypatch):
+    started = []
+
+    def fail() -> bool:
+        raise ConnectionError("SSM unavailable")
+
+    monkeypatch.setattr(prompt_loader.prompt_registry, "refresh", fail)
+    monkeypatch.setattr(
+        prompt_loader.prompt_registry, "start_background_refresh", lambda: started.append(True)
+    )
+
+    handler._preload()
+
+    assert started == [True]
+
+
+def test_background_refresh_starts_when_the_import_fails(monkeypatch):
+    started = []
+    monkeypatch.setitem(sys.modules, "graph", None)  # import graph raises ImportError
+    monkeypatch.setattr(
+        prompt_loader.prompt_registry, "start_background_refresh", lambda: started.append(True)
+    )
+
+    handler._preload()
+
+    assert started == [True]
@@ -0,0 +1,131 @@
+"""Tests for prompt_loader.py."""
+
+import pytest
+
+import prompt_loader
+from prompt_loader import PromptRegistry
+
+
+class FakeParameterStore:
+    """SSM stand-in whose parameters can be changed or made to fail."""
+
+    def __init__(self, **values: str) -> None:
+        self.values = dict(values)
+        self.failing = False
+
+    def loader(self, name: str):
+        def load() -> str:
+            if self.failing:
+                raise ConnectionError("SSM unavailable")
+            return self.values[name]
+
+        return load
+
+
+def make_registry(store: FakeParameterStore, variables_loader=dict) -> PromptRegistry:
+    return PromptRegistry(
+        {"router": store.loader("router")},
+        variables_loader=variables_loader,
+        refresh_seconds=0,
+        defaults={"router": lambda: "default router prompt"},
+    )
+
+
+def test_refresh_picks_up_a_changed_prompt():
+    store = FakeParameterStore(router="v1 prompt")
+    registry = make_registry(store)
+    first = registry.template("router")
+
+    store.values["router"] = "v2 prompt"
+
+    assert registry.refresh() is True
+    assert registry.template("router").text == "v2 prompt"
+    assert registry.template("router").version != first.version
+    assert registry.refresh() is False
+
+
+def test_failed_refresh_keeps_the_last_good_prompt():
+    store = FakeParameterStore(router="ssm prompt")
+    registry = make_registry(store)
+    before = registry.render("router")
+
+    store.failing = True
+
+    assert registry.refresh() is False
+    assert registry.render("router") == before
+    assert registry.template("router").text == "ssm prompt"
+
+
+def test_default_is_used_only_until_the_first_successful_load():
+    store = FakeParameterStore(router="ssm prompt")
+    store.failing = True
+    registry = make_registry(store)
+
+    assert registry.template("router").text == "default router prompt"
+
+    store.failing = False
+    assert registry.refresh() is True
+    assert registry.template("router").text == "ssm prompt"
+
+    store.failing = True
+    assert registry.refresh() is False
+    assert registry.template("router").text == "ssm prompt"
+
+
+def test_failure_without_a_default_is_raised():
+    store = FakeParameterStore()
+    store.failing = True
+    registry = PromptRegistry({"router": store.loader("router")}, variables_loader=dict)
+
+    with pytest.raises(ConnectionError):
+        registry.refresh()
+
+
+def test_failed_variables_reload_keeps_the_previous_variables():
+    store = FakeParameterStore(router="I am $bot_name")
+    variables = {"default": {"bot_name": "bot"}}
+
+    def load_variables() -> dict:
+        if store.failing:
+            raise ConnectionError("SSM unavailable")
+        return variables
+
+    registry = make_registry(store, load_variables)
+    assert registry.render("router").text == "I am bot"
+
+    store.failing = True
+    assert registry.refresh() is False
+    assert registry.render("router").text == "I am bot"
+
+
+def test_channel_variables_override_team_and_default():
+    store = FakeParameterStore(router="I am $bot_name in $place")
+    variables = {
+        "default": {"bot_name": "bot", "place": "slack"},
+        "teams": {"T1": {"bot_name": "team-bot"}},
+        "channels": {"C1": {"place": "#general"}},
+    }
+    registry = make_registry(store, lambda: variables)
+
+    assert registry.render("router").text == "I am bot in slack"
+    assert registry.render("router", "T1", "C1").text == "I am team-bot in #general"
+    assert registry.render("router", "T1", "C1") is registry.render("router", "T1", "C1")
+
+
+def test_unrendered_prompt_keeps_the_template_version():
+    store = FakeParameterStore(router="plain prompt")
+    registry = make_registry(store)
+
+    assert registry.render("router").version == registry.template("router").version
+
+
+def test_public_getter_falls_back_to_the_default(monkeypatch):
+    def fail(name, max_age):
+        raise ConnectionError("SSM unavailable")
+
+    monkeypatch.setenv("SSM_ROUTER_SYSTEM_PROMPT", "/slack-assistant/router-prompt")
+    monkeypatch.setattr(prompt_loader, "get_parameter", fail)
+
+    with pytest.raises(ConnectionError):
+        prompt_loader.load_router_system_prompt()
+    assert prompt_loader.get_router_system_prompt() == prompt_loader._default_router_prompt()
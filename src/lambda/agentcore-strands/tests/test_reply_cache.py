@@ -0,0 +1,129 @@
+"""Tests for reply_cache.py."""
+
+import pytest
+
+from reply_cache import LSHIndex, ReplyCache, key_tokens, normalize_question
+
+SCOPE = ("T1", "C1", "v1")
+REPLY = {"should_reply": True, "reply_text": "Run `make deploy-staging`."}
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(clock: FakeClock = None, **kwargs) -> ReplyCache:
+    return ReplyCache(clock=clock or FakeClock(), **kwargs)
+
+
+def test_rephrased_question_hits():
+    cache = make_cache()
+    cache.store(SCOPE, "How do I deploy to staging?", REPLY)
+
+    hit = cache.lookup(SCOPE, "<@U1> how do i deploy to staging??")
+
+    assert hit is not None
+    assert hit[0] == REPLY
+    assert hit[1] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize(
+    "stored, asked",
+    [
+        ("VPN password for the dev env", "VPN password for the prod env"),
+        ("restart server 1", "restart server 2"),
+        ("how do I deploy to staging", "how do I deploy to production"),
+        ("ステージング環境のURLは？", "本番環境のURLは？"),
+    ],
+)
+def test_questions_differing_in_key_tokens_miss(stored, asked):
+    cache = make_cache(threshold=0.0)
+    cache.store(SCOPE, stored, REPLY)
+
+    assert cache.lookup(SCOPE, asked) is None
+
+
+def test_key_tokens_ignore_function_words_and_hiragana():
+    assert key_tokens(normalize_question("How do I deploy to staging?")) == {"deploy", "staging"}
+    assert key_tokens(normalize_question("how can we deploy to staging")) == {"deploy", "staging"}
+    assert key_tokens(normalize_question("ステージングのURLは")) == {"ステージング", "url"}
+
+
+def test_other_scopes_are_not_searched():
+    cache = make_cache()
+    cache.store(SCOPE, "How do I deploy to staging?", REPLY)
+
+    assert cache.lookup(("T1", "C2", "v1"), "How do I deploy to staging?") is None
+    assert cache.lookup(("T1", "C1", "v2"), "How do I deploy to staging?") is None
+
+
+def test_expired_best_match_falls_back_to_the_next_candidate():
+    clock = FakeClock()
+    cache = make_cache(clock, threshold=0.5, ttl_seconds=10)
+    cache.store(SCOPE, "how do I deploy to staging", {"reply_text": "old"})
+    clock.now = 5
+    cache.store(SCOPE, "how do I deploy to staging please", {"reply_text": "new"})
+
+    clock.now = 12
+    hit = cache.lookup(SCOPE, "how do I deploy to staging")
+
+    assert hit is not None and hit[0] == {"reply_text": "new"}
+    # The expired entry was dropped on the way
+    assert len(cache) == 1
+
+
+def test_mismatching_best_match_falls_back_to_the_next_candidate():
+    cache = make_cache(threshold=0.5)
+    cache.store(SCOPE, "restart server 1 now", {"reply_text": "server 1"})
+    cache.store(SCOPE, "please restart the server 2", {"reply_text": "server 2"})
+
+    hit = cache.lookup(SCOPE, "restart server 2 now")
+
+    assert hit is not None and hit[0] == {"reply_text": "server 2"}
+
+
+def test_everything_expires():
+    clock = FakeClock()
+    cache = make_cache(clock, ttl_seconds=10)
+    cache.store(SCOPE, "How do I deploy to staging?", REPLY)
+
+    clock.now = 10
+    assert cache.lookup(SCOPE, "How do I deploy to staging?") is None
+    assert len(cache) == 0
+
+
+def test_oldest_entries_are_evicted():
+    cache = make_cache(max_entries=2)
+    for n in ("alpha", "beta", "gamma"):
+        cache.store(SCOPE, f"what is project {n}", {"reply_text": n})
+
+    assert len(cache) == 2
+    assert cache.lookup(SCOPE, "what is project alpha") is None
+    assert cache.lookup(SCOPE, "what is project gamma")[0] == {"reply_text": "gamma"}
+
+
+def test_invalidate_by_channel():
+    cache = make_cache()
+    cache.store(SCOPE, "How do I deploy to staging?", REPLY)
+    cache.store(("T1", "C2", "v1"), "How do I deploy to staging?", REPLY)
+
+    cache.invalidate(channel_id="C1")
+
+    assert cache.lookup(SCOPE, "How do I deploy to staging?") is None
+    assert cache.lookup(("T1", "C2", "v1"), "How do I deploy to staging?") is not None
+
+
+def test_lsh_candidates_are_sorted_by_similarity():
+    index = LSHIndex(dim=4)
+    index.add(1, [1.0, 0.0, 0.0, 0.0])
+    index.add(2, [0.9, 0.1, 0.0, 0.0])
+    index.add(3, [0.7, 0.7, 0.0, 0.0])
+
+    similarities = [similarity for _, similarity in index.candidates([1.0, 0.0, 0.0, 0.0])]
+
+    assert similarities == sorted(similarities, reverse=True)
+    assert index.candidates([1.0, 0.0, 0.0, 0.0])[0][0] == 1
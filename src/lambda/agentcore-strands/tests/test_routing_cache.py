@@ -0,0 +1,139 @@
+"""Tests for routing_cache.py."""
+
+from typing import Optional
+
+from envelope import MessageEnvelope
+from routing_cache import RoutingCache, fingerprint, normalize_text
+
+DECISION = {
+    "should_reply": False,
+    "route": "ignore",
+    "reply_mode": "thread",
+    "typing_style": "none",
+    "reason": "chatter",
+}
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeSharedTier:
+    def __init__(self, fail: bool = False) -> None:
+        self.values: dict[str, str] = {}
+        self.ttls: dict[str, float] = {}
+        self.fail = fail
+
+    def get(self, key: str) -> Optional[str]:
+        if self.fail:
+            raise ConnectionError("shared tier down")
+        return self.values.get(key)
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        if self.fail:
+            raise ConnectionError("shared tier down")
+        self.values[key] = value
+        self.ttls[key] = ttl_seconds
+
+
+def make_cache(clock: FakeClock = None, **kwargs) -> RoutingCache:
+    return RoutingCache(clock=clock or FakeClock(), **kwargs)
+
+
+def test_fingerprint_ignores_numbers_references_case_and_whitespace():
+    first = MessageEnvelope(text="Stand-up 10/14:  <@U123> done with PR 42", channel_kind="public")
+    second = MessageEnvelope(text="stand-up 10/15: <@U999> done with pr 7", channel_kind="public")
+
+    assert normalize_text(first.text) == "stand-up 0/0: <ref> done with pr 0"
+    assert fingerprint(first, "v1") == fingerprint(second, "v1")
+
+
+def test_fingerprint_covers_the_flags_and_the_prompt_version():
+    base = MessageEnvelope(text="good morning", channel_kind="public")
+
+    assert fingerprint(base, "v1") != fingerprint(base, "v2")
+    assert fingerprint(base) != fingerprint(MessageEnvelope(text="good morning", channel_kind="private"))
+    assert fingerprint(base) != fingerprint(
+        MessageEnvelope(text="good morning", channel_kind="public", ts="2", thread_ts="1")
+    )
+    assert fingerprint(base) != fingerprint(MessageEnvelope(text="good afternoon", channel_kind="public"))
+
+
+def test_mentions_and_dms_bypass_the_cache():
+    assert RoutingCache.bypasses(MessageEnvelope(text="hi", is_mentioned=True))
+    assert RoutingCache.bypasses(MessageEnvelope(text="hi", is_dm=True))
+    assert not RoutingCache.bypasses(MessageEnvelope(text="hi"))
+
+
+def test_hit_returns_a_copy_and_counts():
+    cache = make_cache()
+    cache.put("k", DECISION)
+
+    hit = cache.get("k")
+    hit["route"] = "full_reply"
+
+    assert cache.get("k") == DECISION
+    assert cache.get("other") is None
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert cache.hit_rate() == 2 / 3
+
+
+def test_entries_expire_after_the_ttl():
+    clock = FakeClock()
+    cache = make_cache(clock, ttl_seconds=60)
+    cache.put("k", DECISION)
+
+    clock.now = 59.9
+    assert cache.get("k") == DECISION
+    clock.now = 60
+    assert cache.get("k") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = make_cache(max_entries=2)
+    cache.put("a", DECISION)
+    cache.put("b", DECISION)
+    cache.get("a")
+    cache.put("c", DECISION)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == DECISION
+    assert cache.get("c") == DECISION
+
+
+def test_shared_tier_is_written_and_fills_the_local_tier():
+    clock = FakeClock()
+    shared = FakeSharedTier()
+    writer = make_cache(clock, ttl_seconds=120, shared=shared)
+    reader = make_cache(clock, ttl_seconds=120, shared=shared)
+
+    writer.put("k", DECISION)
+    assert shared.ttls == {"k": 120}
+
+    assert reader.get("k") == DECISION
+    shared.values.clear()
+    assert reader.get("k") == DECISION  # now served from the local tier
+
+
+def test_shared_tier_errors_count_as_misses():
+    cache = make_cache(shared=FakeSharedTier(fail=True))
+
+    cache.put("k", DECISION)  # the local tier is still written
+    assert cache.get("k") == DECISION
+    assert cache.get("other") is None
+    assert cache.misses == 1
+
+
+def test_clear_resets_entries_and_counters():
+    cache = make_cache()
+    cache.put("k", DECISION)
+    cache.get("k")
+
+    cache.clear()
+
+    assert cache.get("k") is None
+    assert (cache.hits, cache.misses) == (0, 1)
@@ -0,0 +1,162 @@
+"""Tests for routing_rules.py."""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+import routing_rules
+from envelope import MessageEnvelope
+from routing_rules import RoutingRules, is_code_only, is_emoji_only, is_url_only, normalize_ack
+
+SPEC = {
+    "utc_offset": "+09:00",
+    "rules": [
+        {"name": "mention", "when": {"is_mentioned": True}, "decision": "reply"},
+        {"name": "emoji_only", "when": {"emoji_only": True}, "decision": "ignore"},
+        {"name": "ack", "when": {"text_in": ["了解", "OK", "👍"]}, "decision": "ignore"},
+        {
+            "name": "night",
+            "when": {"channels": ["C_NIGHT"], "quiet_hours": "22:00-07:00"},
+            "decision": "ignore",
+        },
+        {
+            "name": "dm",
+            "when": {"is_dm": True, "max_chars": 20},
+            "decision": "reply",
+            "route": "simple_reply",
+            "typing_style": "none",
+        },
+    ],
+}
+
+NOON_JST = datetime(2026, 1, 1, 3, 0, tzinfo=timezone.utc)
+MIDNIGHT_JST = datetime(2026, 1, 1, 15, 0, tzinfo=timezone.utc)
+
+
+def evaluate(text: str, now: datetime = NOON_JST, **flags):
+    return RoutingRules.compile(SPEC).evaluate(MessageEnvelope(text=text, **flags), now=now)
+
+
+def test_first_matching_rule_wins():
+    decision = evaluate("👍", is_mentioned=True)
+
+    assert decision.rule == "mention"
+    assert decision.should_reply is True
+    assert decision.route == "full_reply"
+    assert decision.typing_style == "short"
+
+
+def test_reply_mode_defaults_to_the_thread_when_in_a_thread():
+    assert evaluate("hi", is_mentioned=True, ts="2.0", thread_ts="1.0").reply_mode == "thread"
+    assert evaluate("hi", is_mentioned=True, ts="1.0").reply_mode == "channel"
+
+
+def test_ignore_decision():
+    decision = evaluate(":tada: 🎉")
+
+    assert decision.rule == "emoji_only"
+    assert decision.should_reply is False
+    assert decision.route == "ignore"
+    assert decision.typing_style == "none"
+
+
+@pytest.mark.parametrize("text", ["了解", "了解！", "ok!", "<@U1> OK。"])
+def test_acknowledgements_are_normalized(text):
+    assert evaluate(text).rule == "ack"
+
+
+def test_quiet_hours_use_the_spec_utc_offset_and_wrap_midnight():
+    assert evaluate("deploy done?", now=MIDNIGHT_JST, channel_id="C_NIGHT").rule == "night"
+    assert evaluate("deploy done?", now=NOON_JST, channel_id="C_NIGHT") is None
+    assert evaluate("deploy done?", now=MIDNIGHT_JST, channel_id="C_DAY") is None
+
+
+def test_conditions_are_anded():
+    decision = evaluate("short question", is_dm=True)
+
+    assert decision.rule == "dm"
+    assert decision.route == "simple_reply"
+    assert evaluate("a much longer question about the deploy pipeline", is_dm=True) is None
+
+
+def test_unmatched_message_falls_through():
+    assert evaluate("could someone review my PR?") is None
+
+
+def test_empty_rule_set_falls_through():
+    assert RoutingRules.compile({}).evaluate(MessageEnvelope(text="hi")) is None
+
+
+@pytest.mark.parametrize(
+    "rule, message",
+    [
+        ({"when": {}, "decision": "maybe"}, "decision"),
+        ({"when": {}, "decision": "reply", "route": "ignore"}, "route"),
+        ({"when": {"sentiment": "angry"}, "decision": "ignore"}, "Unknown routing rule condition"),
+    ],
+)
+def test_invalid_spec_is_rejected(rule, message):
+    with pytest.raises(ValueError, match=message):
+        RoutingRules.compile({"rules": [rule]})
+
+
+def test_message_classifiers():
+    assert is_emoji_only(":white_check_mark: ✅") is True
+    assert is_emoji_only("done ✅") is False
+    assert is_url_only("<https://example.com|example>") is True
+    assert is_url_only("see https://example.com") is False
+    assert is_code_only("```\nls -la\n```") is True
+    assert is_code_only("run `ls`") is False
+    assert normalize_ack("<@U1> OK!!") == "ok"
+
+
+def test_rules_are_recompiled_only_when_the_spec_changes(tmp_path, monkeypatch):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(SPEC), encoding="utf-8")
+    monkeypatch.delenv("SSM_ROUTING_RULES", raising=False)
+    monkeypatch.setenv("ROUTING_RULES_FILE", str(path))
+    monkeypatch.setattr(routing_rules, "_compiled", None)
+    monkeypatch.setattr(routing_rules, "_file_spec", None)
+
+    first = routing_rules.get_routing_rules()
+    assert routing_rules.get_routing_rules() is first
+    assert len(first) == len(SPEC["rules"])
+
+    path.write_text(json.dumps({"rules": SPEC["rules"][:1]}), encoding="utf-8")
+    assert len(routing_rules.get_routing_rules()) == 1
+
+
+def test_spec_file_is_read_only_when_it_changes(tmp_path, monkeypatch):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(SPEC), encoding="utf-8")
+    monkeypatch.delenv("SSM_ROUTING_RULES", raising=False)
+    monkeypatch.setenv("ROUTING_RULES_FILE", str(path))
+    monkeypatch.setattr(routing_rules, "_compiled", None)
+    monkeypatch.setattr(routing_rules, "_file_spec", None)
+    reads = []
+
+    def counting_open(*args, **kwargs):
+        reads.append(args[0])
+        return open(*args, **kwargs)
+
+    monkeypatch.setattr(routing_rules, "open", counting_open, raising=False)
+
+    for _ in range(3):
+        routing_rules.get_routing_rules()
+    assert len(reads) == 1
+
+    path.write_text(json.dumps({"rules": SPEC["rules"][:1]}), encoding="utf-8")
+    assert len(routing_rules.get_routing_rules()) == 1
+    assert len(reads) == 2
+
+
+def test_broken_spec_disables_the_rules(tmp_path, monkeypatch):
+    path = tmp_path / "rules.json"
+    path.write_text('{"rules": [{"decision": "maybe"}]}', encoding="utf-8")
+    monkeypatch.delenv("SSM_ROUTING_RULES", raising=False)
+    monkeypatch.setenv("ROUTING_RULES_FILE", str(path))
+    monkeypatch.setattr(routing_rules, "_compiled", None)
+    monkeypatch.setattr(routing_rules, "_file_spec", None)
+
+    assert len(routing_rules.get_routing_rules()) == 0
@@ -0,0 +1,116 @@
+"""Tests for the speculative Conversation Agent in the orchestration."""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import graph
+from agent_pool import AgentPool
+from envelope import MessageEnvelope
+
+ENVELOPE = MessageEnvelope(
+    text="could you summarize yesterday's incident?", team_id="T1", channel_id="C1", is_mentioned=True
+)
+PROMPTS = SimpleNamespace(
+    conversation=SimpleNamespace(text="conversation prompt", version="v1"),
+    router=SimpleNamespace(text="router prompt", version="v1"),
+    version=("v1", "v1"),
+)
+REPLY = graph.RouterResponse(should_reply=True, route="full_reply", reason="mentioned")
+IGNORE = graph.RouterResponse(should_reply=False, route="ignore", reason="chatter")
+
+
+class Recorder:
+    """Fake session managers and conversation agents recording who used what."""
+
+    def __init__(self) -> None:
+        self.created: list[object] = []
+        self.created_on: list[str] = []
+        self.conversation_managers: list[object] = []
+        self.router_manager: object = None
+        self.conversation_started = threading.Event()
+
+    def session_manager(self) -> object:
+        manager = object()
+        self.created.append(manager)
+        self.created_on.append(threading.current_thread().name)
+        return manager
+
+    def build_conversation(self, system_prompt, session_manager, model=None):
+        self.conversation_managers.append(session_manager)
+
+        def call(prompt):
+            self.conversation_started.set()
+            return SimpleNamespace(structured_output=graph.ConversationResponse(reply_text="summary"))
+
+        return call
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    recorder = Recorder()
+    monkeypatch.setattr(graph, "should_speculate", lambda envelope: True)
+    monkeypatch.setattr(graph, "_build_conversation", recorder.build_conversation)
+    return recorder
+
+
+def route_with(recorder: Recorder, router_output):
+    def route(envelope, pooled, prompts, deadline=None, screened=None):
+        recorder.router_manager = pooled.session_manager
+        # The speculative call really runs alongside the Router
+        assert recorder.conversation_started.wait(5)
+        if router_output.should_reply:
+            return router_output, None
+        return None, {"should_reply": False, "route": "ignore", "reason": router_output.reason}
+
+    return route
+
+
+def test_speculative_agent_has_its_own_session_manager(recorder, monkeypatch):
+    monkeypatch.setattr(graph, "_route", route_with(recorder, REPLY))
+
+    with AgentPool().checkout(("m", "C1", "T1", PROMPTS.version), recorder.session_manager) as pooled:
+        result = graph._run_orchestration(ENVELOPE, pooled, PROMPTS, None)
+
+    assert result["reply_text"] == "summary"
+    [speculative_manager] = recorder.conversation_managers
+    assert speculative_manager is not recorder.router_manager
+    assert len(recorder.created) == 2
+
+
+def test_speculative_agent_is_built_off_the_router_path(recorder, monkeypatch):
+    monkeypatch.setattr(graph, "_route", route_with(recorder, REPLY))
+
+    with AgentPool().checkout(("m", "C1", "T1", PROMPTS.version), recorder.session_manager) as pooled:
+        graph._run_orchestration(ENVELOPE, pooled, PROMPTS, None)
+
+    speculative_thread = recorder.created_on[recorder.created.index(recorder.conversation_managers[0])]
+    assert speculative_thread.startswith("speculative-conversation")
+    assert pooled.discarded and not pooled.failed
+
+
+def test_entry_is_not_kept_after_speculation(recorder, monkeypatch):
+    monkeypatch.setattr(graph, "_route", route_with(recorder, IGNORE))
+    pool = AgentPool()
+    key = ("m", "C1", "T1", PROMPTS.version)
+
+    with pool.checkout(key, recorder.session_manager) as pooled:
+        result = graph._run_orchestration(ENVELOPE, pooled, PROMPTS, None)
+    with pool.checkout(key, recorder.session_manager) as again:
+        assert again is not pooled
+
+    assert result["should_reply"] is False
+
+
+def test_routing_rules_are_evaluated_once_per_message(recorder, monkeypatch):
+    evaluated = []
+    rules = SimpleNamespace(evaluate=lambda envelope: evaluated.append(envelope))
+    monkeypatch.setattr(graph, "get_routing_rules", lambda: rules)
+    monkeypatch.setattr(graph, "_call_router", lambda *args: (REPLY, None))
+
+    with AgentPool().checkout(("m", "C1", "T1", PROMPTS.version), recorder.session_manager) as pooled:
+        result = graph._run_orchestration(ENVELOPE, pooled, PROMPTS, None)
+
+    assert result["reply_text"] == "summary"
+    assert evaluated == [ENVELOPE]
@@ -0,0 +1,66 @@
+"""Tests for the streaming orchestration."""
+
+import threading
+from types import SimpleNamespace
+
+import graph
+from agent_pool import AgentPool
+from envelope import MessageEnvelope
+
+ENVELOPE = MessageEnvelope(text="please write the release notes", team_id="T1", channel_id="C1")
+PROMPTS = SimpleNamespace(
+    conversation=SimpleNamespace(text="conversation prompt", version="v1"),
+    router=SimpleNamespace(text="router prompt", version="v1"),
+    version=("v1", "v1"),
+)
+KEY = ("m", "C1", "T1", PROMPTS.version)
+REPLY = graph.RouterResponse(should_reply=True, route="full_reply", reason="asked")
+
+
+class StreamingAgent:
+    """Streams two chunks, then blocks until released."""
+
+    def __init__(self) -> None:
+        self.callback_handler = None
+        self.messages: list[dict] = []
+        self.release = threading.Event()
+        self.finished = threading.Event()
+
+    def __call__(self, prompt):
+        self.callback_handler(data="Release ")
+        self.callback_handler(data="notes")
+        self.release.wait(5)
+        self.finished.set()
+        return SimpleNamespace()
+
+
+def test_full_stream(monkeypatch):
+    agent = StreamingAgent()
+    agent.release.set()
+    monkeypatch.setattr(graph, "_route", lambda *args: (REPLY, None))
+    monkeypatch.setattr(graph, "_build_streaming_conversation", lambda *args: agent)
+
+    with AgentPool().checkout(KEY, lambda: None) as pooled:
+        events = list(graph._stream_orchestration(ENVELOPE, pooled, PROMPTS, None))
+
+    assert [e.get("type") for e in events] == ["route", "reply_delta", "reply_delta", None]
+    assert events[-1]["reply_text"] == "Release notes"
+
+
+def test_entry_is_not_pooled_while_an_abandoned_stream_is_running(monkeypatch):
+    agent = StreamingAgent()
+    monkeypatch.setattr(graph, "_route", lambda *args: (REPLY, None))
+    monkeypatch.setattr(graph, "_build_streaming_conversation", lambda *args: agent)
+    pool = AgentPool()
+
+    with pool.checkout(KEY, lambda: None) as pooled:
+        stream = graph._stream_orchestration(ENVELOPE, pooled, PROMPTS, None)
+        assert next(stream)["type"] == "route"
+        assert next(stream)["type"] == "reply_delta"
+        stream.close()
+
+    assert pooled.failed is True
+    assert not agent.finished.is_set()
+    with pool.checkout(KEY, lambda: None) as again:
+        assert again is not pooled
+    agent.release.set()
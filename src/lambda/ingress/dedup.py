@@ -0,0 +1,153 @@
+"""Slack イベント重複排除
+
+Slack は ack が遅れると同じイベントを再送する（X-Slack-Retry-Num）。
+Step Functions の実行名衝突に頼らず、Ingress で重複を弾くためのキャッシュ。
+
+- プロセス内 LRU（TTL 付き）で同一コンテナへの再送を即座に判定
+- 共有ストア（DynamoDB 互換）でコンテナをまたいだ再送を判定
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Protocol
+
+logger = logging.getLogger()
+
+
+class DedupStore(Protocol):
+    """重複排除用の共有ストア"""
+
+    def put_if_absent(self, key: str, ttl_seconds: int) -> bool:
+        """キーが未登録なら登録して True、登録済みなら False を返す"""
+        ...
+
+    def delete(self, key: str) -> None:
+        """キーの登録を取り消す"""
+        ...
+
+
+class InMemoryDedupStore:
+    """プロセス内で完結する共有ストア（ローカル実行・テスト用）"""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._items: dict[str, float] = {}
+
+    def put_if_absent(self, key: str, ttl_seconds: int) -> bool:
+        now = self._clock()
+        expires_at = self._items.get(key)
+        if expires_at is not None and expires_at > now:
+            return False
+        self._items[key] = now + ttl_seconds
+        return True
+
+    def delete(self, key: str) -> None:
+        self._items.pop(key, None)
+
+
+class DynamoDBDedupStore:
+    """DynamoDB の条件付き書き込みを使った共有ストア
+
+    テーブルはパーティションキー `pk`（文字列）を持ち、
+    `expires_at` を TTL 属性として設定しておくこと。
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        client: Any = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if client is None:
+            import boto3
+
+            client = boto3.client("dynamodb")
+        self._client = client
+        self._table_name = table_name
+        self._clock = clock
+
+    def put_if_absent(self, key: str, ttl_seconds: int) -> bool:
+        now = int(self._clock())
+        try:
+            self._client.put_item(
+                TableName=self._table_name,
+                Item={
+                    "pk": {"S": key},
+                    "expires_at": {"N": str(now + ttl_seconds)},
+                },
+                # TTL による削除は遅延するため、期限切れのアイテムは上書きを許可
+                ConditionExpression="attribute_not_exists(pk) OR expires_at < :now",
+                ExpressionAttributeValues={":now": {"N": str(now)}},
+            )
+            return True
+        except self._client.exceptions.ConditionalCheckFailedException:
+            return False
+
+    def delete(self, key: str) -> None:
+        self._client.delete_item(TableName=self._table_name, Key={"pk": {"S": key}})
+
+
+class EventDeduplicator:
+    """プロセス内 LRU + 共有ストアによる重複判定"""
+
+    def __init__(
+        self,
+        store: DedupStore | None = None,
+        ttl_seconds: int = 600,
+        max_entries: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._store = store
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._seen: OrderedDict[str, float] = OrderedDict()
+
+    def is_duplicate(self, key: str) -> bool:
+        """初出のキーなら記録して False、既出なら True を返す"""
+        now = self._clock()
+
+        expires_at = self._seen.get(key)
+        if expires_at is not None:
+            if expires_at > now:
+                self._seen.move_to_end(key)
+                return True
+            del self._seen[key]
+
+        if self._store is not None:
+            try:
+                if not self._store.put_if_absent(key, self._ttl_seconds):
+                    self._remember(key, now)
+                    return True
+            except Exception as e:
+                # 共有ストア障害時は処理を止めない（実行名の衝突で最終的に弾かれる）
+                logger.warning(f"Dedup store error, falling back to local cache: {e}")
+
+        self._remember(key, now)
+        return False
+
+    def forget(self, key: str) -> None:
+        """記録を取り消す（後段への受け渡しに失敗し、Slack の再送で処理し直す場合）"""
+        self._seen.pop(key, None)
+        if self._store is not None:
+            try:
+                self._store.delete(key)
+            except Exception as e:
+                logger.warning(f"Failed to forget dedup key {key}: {e}")
+
+    def _remember(self, key: str, now: float) -> None:
+        self._seen[key] = now + self._ttl_seconds
+        self._seen.move_to_end(key)
+        while len(self._seen) > self._max_entries:
+            self._seen.popitem(last=False)
+
+
+def build_dedup_key(payload: dict[str, Any]) -> str:
+    """重複判定キーを構築（event_id 優先、なければ channel と ts）"""
+    event_id = payload.get("event_id")
+    if event_id:
+        return f"event:{event_id}"
+
+    slack_event = payload.get("event", {})
+    return f"message:{slack_event.get('channel', '')}:{slack_event.get('ts', '')}"
@@ -0,0 +1,232 @@
+"""正規化イベントのディスパッチ
+
+Ingress から Step Functions への受け渡し方法を切り替える。
+
+- sync: Ingress 内で start_execution を呼んでから Slack に ack する（従来動作）
+- queue: キューに積んだら即座に ack し、ドレイナーがまとめて start_execution する
+- direct: Step Functions を経由せず、パイプライン Lambda（AgentCore 呼び出し〜Slack 投稿）を非同期実行する
+
+キューは SQS 互換のインターフェース（send_message）で差し替え可能。
+ドレイナーはマイクロバッチ（同一スレッドへの連投を 1 実行にまとめる）にも対応する。
+"""
+
+import json
+import logging
+from typing import Any, Protocol
+
+logger = logging.getLogger()
+
+
+def build_execution_name(normalized_event: dict[str, Any]) -> str:
+    """Step Functions の実行名を構築（同一メッセージの二重実行防止を兼ねる）"""
+    return f"{normalized_event['channel_id']}-{normalized_event['ts'].replace('.', '-')}"
+
+
+def start_execution(
+    sfn_client: Any,
+    state_machine_arn: str,
+    normalized_event: dict[str, Any],
+) -> None:
+    """Step Functions の実行を開始（既存の実行名は重複として無視）"""
+    execution_name = build_execution_name(normalized_event)
+    try:
+        sfn_client.start_execution(
+            stateMachineArn=state_machine_arn,
+            name=execution_name,
+            input=json.dumps(normalized_event),
+        )
+        logger.info(f"Started Step Functions execution: {execution_name}")
+    except sfn_client.exceptions.ExecutionAlreadyExists:
+        # 重複排除キャッシュをすり抜けた再送（別コンテナなど）
+        logger.info(f"Execution already exists: {execution_name}")
+
+
+class Dispatcher(Protocol):
+    """正規化イベントの受け渡し先"""
+
+    def dispatch(self, normalized_event: dict[str, Any]) -> None: ...
+
+
+class StepFunctionsDispatcher:
+    """同期的に Step Functions を開始する"""
+
+    def __init__(self, sfn_client: Any, state_machine_arn: str) -> None:
+        self._sfn_client = sfn_client
+        self._state_machine_arn = state_machine_arn
+
+    def dispatch(self, normalized_event: dict[str, Any]) -> None:
+        start_execution(self._sfn_client, self._state_machine_arn, normalized_event)
+
+
+class QueueDispatcher:
+    """SQS 互換キューに積む（start_execution はドレイナーが行う）"""
+
+    def __init__(self, sqs_client: Any, queue_url: str) -> None:
+        self._sqs_client = sqs_client
+        self._queue_url = queue_url
+
+    def dispatch(self, normalized_event: dict[str, Any]) -> None:
+        self._sqs_client.send_message(
+            QueueUrl=self._queue_url,
+            MessageBody=json.dumps(normalized_event),
+        )
+        logger.info(f"Queued event: {build_execution_name(normalized_event)}")
+
+
+class LambdaDispatcher:
+    """パイプライン Lambda を非同期実行する（Step Functions を経由しない）
+
+    InvocationType=Event のため、Lambda サービスがイベントを受け付けた時点で返る。
+    二重返信を避けるため、パイプライン Lambda の非同期実行の再試行は CDK で無効化している。
+    """
+
+    def __init__(self, lambda_client: Any, function_name: str) -> None:
+        self._lambda_client = lambda_client
+        self._function_name = function_name
+
+    def dispatch(self, normalized_event: dict[str, Any]) -> None:
+        self._lambda_client.invoke(
+            FunctionName=self._function_name,
+            InvocationType="Event",
+            Payload=json.dumps(normalized_event).encode(),
+        )
+        logger.info(f"Invoked pipeline: {build_execution_name(normalized_event)}")
+
+
+class InMemoryQueue:
+    """SQS 互換のプロセス内キュー（ローカル実行・テスト用）
+
+    receive_records() は SQS イベントソースと同じ形式のレコードを返すため、
+    そのまま drain_records() に渡せる。
+    """
+
+    def __init__(self) -> None:
+        self._messages: list[tuple[str, str]] = []
+        self._next_id = 0
+
+    def send_message(self, QueueUrl: str, MessageBody: str) -> dict[str, Any]:  # noqa: N803
+        self._next_id += 1
+        self._messages.append((str(self._next_id), MessageBody))
+        return {"MessageId": str(self._next_id)}
+
+    def receive_records(self, max_records: int = 10) -> list[dict[str, Any]]:
+        records = [
+            {"messageId": message_id, "eventSource": "aws:sqs", "body": body}
+            for message_id, body in self._messages[:max_records]
+        ]
+        del self._messages[:max_records]
+        return records
+
+
+class MicroBatcher:
+    """同一ユーザーによる同一チャンネル・スレッドへの連投を 1 つの正規化イベントにまとめる
+
+    別ユーザーの発言はまとめない（返信先・発言者・メンション有無が混ざるため）。
+
+    Slack の ts を基準に、先頭メッセージから window_ms 以内かつ
+    max_events 件以内のメッセージを同じバッチとして扱う。
+    """
+
+    def __init__(self, window_ms: int = 50, max_events: int = 10) -> None:
+        self._window_seconds = window_ms / 1000
+        self._max_events = max_events
+
+    def group(self, events: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        """イベントをユーザー・チャンネル・スレッド単位のバッチに分割"""
+        by_thread: dict[tuple[str, str, str], list[dict[str, Any]]] = {}
+        for event in sorted(events, key=lambda e: float(e.get("ts") or 0)):
+            # チャンネル直下のメッセージ（thread_ts == ts）はチャンネル単位でまとめる
+            thread_ts = event.get("thread_ts", "")
+            key = (
+                event.get("channel_id", ""),
+                "" if thread_ts == event.get("ts") else thread_ts,
+                event.get("user_id", ""),
+            )
+            by_thread.setdefault(key, []).append(event)
+
+        batches: list[list[dict[str, Any]]] = []
+        for thread_events in by_thread.values():
+            batch: list[dict[str, Any]] = []
+            for event in thread_events:
+                if batch and (
+                    len(batch) >= self._max_events
+                    or float(event["ts"]) - float(batch[0]["ts"]) > self._window_seconds
+                ):
+                    batches.append(batch)
+                    batch = []
+                batch.append(event)
+            if batch:
+                batches.append(batch)
+        return batches
+
+
+def merge_batch(batch: list[dict[str, Any]]) -> dict[str, Any]:
+    """同一ユーザーのバッチを 1 つの正規化イベントにまとめる
+
+    最新メッセージの ts を代表とし、本文は投稿順に連結する。
+    いずれかでメンションされていれば is_mentioned とする。
+    期限（deadline_ms）は最も早いものに合わせる。
+    """
+    if len(batch) == 1:
+        return batch[0]
+
+    merged = dict(batch[-1])
+    merged["text"] = "\n".join(event.get("text", "") for event in batch)
+    merged["is_mentioned"] = any(event.get("is_mentioned") for event in batch)
+    deadlines = [event["deadline_ms"] for event in batch if event.get("deadline_ms")]
+    if deadlines:
+        merged["deadline_ms"] = min(deadlines)
+    merged["batch_size"] = len(batch)
+    merged["batched_ts"] = [event.get("ts", "") for event in batch]
+    return merged
+
+
+def is_queue_event(event: dict[str, Any]) -> bool:
+    """SQS イベントソースからの呼び出しかどうかを判定"""
+    records = event.get("Records")
+    return bool(records) and records[0].get("eventSource") == "aws:sqs"
+
+
+def drain_records(
+    records: list[dict[str, Any]],
+    sfn_client: Any,
+    state_machine_arn: str,
+    batcher: MicroBatcher | None = None,
+) -> dict[str, Any]:
+    """キューのレコードをまとめて Step Functions に渡す
+
+    Args:
+        records: SQS イベントソースのレコード
+        sfn_client: Step Functions クライアント
+        state_machine_arn: State Machine ARN
+        batcher: 指定時は連投をまとめて 1 実行にする
+
+    Returns:
+        dict: SQS の部分バッチレスポンス（失敗したレコードのみ再配信させる）
+    """
+    failures = []
+    events = []
+    for record in records:
+        try:
+            normalized_event = json.loads(record["body"])
+        except json.JSONDecodeError:
+            logger.error(f"Dropping malformed queued event {record.get('messageId')}")
+            continue
+        normalized_event["_message_id"] = record.get("messageId")
+        events.append(normalized_event)
+
+    batches = batcher.group(events) if batcher else [[event] for event in events]
+
+    for batch in batches:
+        message_ids = [event.pop("_message_id") for event in batch]
+        try:
+            start_execution(sfn_client, state_machine_arn, merge_batch(batch))
+        except Exception as e:
+            logger.error(f"Failed to dispatch queued events {message_ids}: {e}")
+            failures.extend({"itemIdentifier": message_id} for message_id in message_ids)
+
+    logger.info(
+        f"Drained {len(events)} queued events in {len(batches)} executions "
+        f"({len(failures)} failed)"
+    )
+    return {"batchItemFailures": failures}
@@ -10,8 +10,7 @@ Slack Events API Ingress Lambda
 - Slack には常に速やかに 200 を返す（3 秒以内）
 """
 
-import hashlib
-import hmac
+import base64
 import json
 import logging
 import os
@@ -20,33 +19,126 @@ from typing import Any
 
 import boto3
 
+from dedup import DynamoDBDedupStore, EventDeduplicator, build_dedup_key
+from dispatch import (
+    Dispatcher,
+    LambdaDispatcher,
+    MicroBatcher,
+    QueueDispatcher,
+    StepFunctionsDispatcher,
+    build_execution_name,
+    drain_records,
+    is_queue_event,
+)
+from log_utils import LazyJson, bind_correlation_ids, clear_correlation_ids, install
+from prefilter import classify_raw_body, json_loads
+from signature import SlackSignatureVerifier, parse_signing_secrets
+from ssm_params import get_slack_bot_user_id, get_slack_signing_secret
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
+install(logger)
 
+# イベント受信から返信までの持ち時間（正規化イベントの deadline_ms として後段に伝播）
+EVENT_DEADLINE_SECONDS = int(os.environ.get("EVENT_DEADLINE_SECONDS", "110"))
+
+# コンテナ単位で使い回すクライアント（コールドスタート時に一度だけ生成）
+sfn_client = boto3.client("stepfunctions")
+
+# Slack の再送を弾く重複排除キャッシュ（DEDUP_TABLE_NAME 指定時は DynamoDB を共有ストアに使用）
+_dedup_table_name = os.environ.get("DEDUP_TABLE_NAME", "")
+deduplicator = EventDeduplicator(
+    store=DynamoDBDedupStore(_dedup_table_name) if _dedup_table_name else None,
+    ttl_seconds=int(os.environ.get("DEDUP_TTL_SECONDS", "600")),
+)
+
+
+def _build_dispatcher() -> Dispatcher | None:
+    """DISPATCH_MODE に応じたディスパッチャーを構築
+
+    - sync（デフォルト）: Ingress 内で Step Functions を開始
+    - queue: DISPATCH_QUEUE_URL のキューに積み、キューのイベントソースとして
+      呼ばれた同じ Lambda がまとめて Step Functions を開始
+    - direct: PIPELINE_FUNCTION_NAME の Lambda を非同期実行（Step Functions を経由しない）
+
+    モードに必要な環境変数が未設定の場合は、初期化を失敗させずに sync として動作する。
+    """
+    dispatch_mode = os.environ.get("DISPATCH_MODE", "sync")
+    if dispatch_mode not in ("sync", "queue", "direct"):
+        logger.error(f"Unknown DISPATCH_MODE {dispatch_mode!r}, falling back to sync")
+        dispatch_mode = "sync"
+
+    if dispatch_mode == "direct":
+        function_name = os.environ.get("PIPELINE_FUNCTION_NAME", "")
+        if function_name:
+            return LambdaDispatcher(boto3.client("lambda"), function_name)
+        logger.error("DISPATCH_MODE=direct requires PIPELINE_FUNCTION_NAME, falling back to sync")
+
+    step_function_arn = os.environ.get("STEP_FUNCTION_ARN", "")
+    if not step_function_arn:
+        return None
+
+    if dispatch_mode == "queue":
+        queue_url = os.environ.get("DISPATCH_QUEUE_URL", "")
+        if queue_url:
+            return QueueDispatcher(boto3.client("sqs"), queue_url)
+        logger.error("DISPATCH_MODE=queue requires DISPATCH_QUEUE_URL, falling back to sync")
+
+    return StepFunctionsDispatcher(sfn_client, step_function_arn)
 
-def verify_slack_signature(
-    signing_secret: str,
-    timestamp: str,
-    body: str,
-    signature: str,
-) -> bool:
-    """Slack のリクエスト署名を検証"""
-    # タイムスタンプが古すぎないかチェック（5分以内）
-    if abs(time.time() - int(timestamp)) > 60 * 5:
-        return False
 
-    # 署名を計算
-    sig_basestring = f"v0:{timestamp}:{body}"
-    computed_signature = (
-        "v0="
-        + hmac.new(
-            signing_secret.encode(),
-            sig_basestring.encode(),
-            hashlib.sha256,
-        ).hexdigest()
+dispatcher = _build_dispatcher()
+
+# ドレイナーのマイクロバッチ設定（BATCH_WINDOW_MS 指定時のみ有効）
+_batch_window_ms = int(os.environ.get("BATCH_WINDOW_MS", "0"))
+batcher = (
+    MicroBatcher(
+        window_ms=_batch_window_ms,
+        max_events=int(os.environ.get("BATCH_MAX_EVENTS", "10")),
     )
+    if _batch_window_ms > 0
+    else None
+)
+
+
+def warm_up() -> None:
+    """SSM パラメータを先読みしてキャッシュを温める
+
+    コンテナ初期化時とウォームアップイベント受信時に呼ばれる。
+    取得に失敗しても初期化は継続し、実リクエスト時に再取得する。
+    """
+    try:
+        get_slack_signing_secret()
+        get_slack_bot_user_id()
+    except Exception as e:
+        logger.warning(f"Failed to warm up SSM parameters: {e}")
+
+
+def is_warmup_event(event: dict[str, Any]) -> bool:
+    """ウォームアップ用イベントかどうかを判定
+
+    - EventBridge スケジュール（source: aws.events）
+    - 明示的な ping（{"warmup": true}）
+    """
+    return event.get("source") == "aws.events" or bool(event.get("warmup"))
+
+
+# Init フェーズで SSM パラメータを解決しておく
+warm_up()
+
 
-    return hmac.compare_digest(computed_signature, signature)
+_verifier_cache: tuple[str, SlackSignatureVerifier] | None = None
+
+
+def get_signature_verifier(signing_secret: str) -> SlackSignatureVerifier:
+    """署名検証器を取得（SSM の値が変わった場合のみ再構築）"""
+    global _verifier_cache
+    if _verifier_cache is None or _verifier_cache[0] != signing_secret:
+        _verifier_cache = (
+            signing_secret,
+            SlackSignatureVerifier(parse_signing_secrets(signing_secret)),
+        )
+    return _verifier_cache[1]
 
 
 def is_bot_message(event: dict[str, Any], bot_user_id: str) -> bool:
@@ -90,7 +182,10 @@ def detect_channel_kind(channel_id: str) -> str:
 
 
 def normalize_event(event: dict[str, Any], bot_user_id: str) -> dict[str, Any]:
-    """Slack イベントを正規化"""
+    """Slack イベントを正規化
+
+    deadline_ms（エポックミリ秒）は後段の各処理が残り時間に応じて処理を簡略化するための期限。
+    """
     channel_id = event.get("channel", "")
     text = event.get("text", "")
     ts = event.get("ts", "")
@@ -113,43 +208,72 @@ def normalize_event(event: dict[str, Any], bot_user_id: str) -> dict[str, Any]:
         "is_mentioned": is_mentioned,
         "is_dm": is_dm,
         "event_type": "message",
+        "deadline_ms": int(time.time() * 1000) + EVENT_DEADLINE_SECONDS * 1000,
     }
 
 
 def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     """Lambda ハンドラー"""
-    logger.info(f"Received event: {json.dumps(event)}")
+    clear_correlation_ids()
 
-    # リクエストボディを取得
-    body = event.get("body", "")
-    if event.get("isBase64Encoded"):
-        import base64
+    # ウォームアップイベントは初期化処理のみ行って終了
+    if is_warmup_event(event):
+        warm_up()
+        logger.info("Handled warm-up event")
+        return {
+            "statusCode": 200,
+            "body": json.dumps({"warmup": True}),
+        }
+
+    # キューからのバッチはドレイナーとして処理
+    if is_queue_event(event):
+        return drain_records(
+            event["Records"],
+            sfn_client,
+            os.environ["STEP_FUNCTION_ARN"],
+            batcher=batcher,
+        )
+
+    logger.info("Received event: %s", LazyJson(event))
 
-        body = base64.b64decode(body).decode("utf-8")
+    # リクエストボディを bytes のまま取得（署名検証・パースで共用）
+    body = event.get("body") or ""
+    if event.get("isBase64Encoded"):
+        body = base64.b64decode(body)
+    else:
+        body = body.encode()
 
     # ヘッダーを取得（小文字に正規化）
     headers = {k.lower(): v for k, v in event.get("headers", {}).items()}
     timestamp = headers.get("x-slack-request-timestamp", "")
     signature = headers.get("x-slack-signature", "")
+    retry_num = headers.get("x-slack-retry-num")
 
-    # SSM Parameter Store から動的に取得
-    from ssm_params import get_slack_bot_user_id, get_slack_signing_secret
-
+    # SSM Parameter Store から動的に取得（キャッシュ済みの値を使用）
     signing_secret = get_slack_signing_secret()
     bot_user_id = get_slack_bot_user_id()
 
     # 署名検証
-    if not verify_slack_signature(signing_secret, timestamp, body, signature):
+    if not get_signature_verifier(signing_secret).verify(timestamp, body, signature):
         logger.warning("Invalid Slack signature")
         return {
             "statusCode": 401,
             "body": json.dumps({"error": "Invalid signature"}),
         }
 
+    # 明らかに処理対象外のイベントはパース前にスキップ
+    skip_reason = classify_raw_body(body)
+    if skip_reason:
+        logger.info(f"Skipping event before parsing: {skip_reason}")
+        return {
+            "statusCode": 200,
+            "body": json.dumps({"ok": True}),
+        }
+
     # ボディをパース
     try:
-        payload = json.loads(body)
-    except json.JSONDecodeError:
+        payload = json_loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
         logger.error("Failed to parse request body")
         return {
             "statusCode": 400,
@@ -185,22 +309,36 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
                 "body": json.dumps({"ok": True}),
             }
 
+        # Slack の再送（または重複配信）はスキップ
+        dedup_key = build_dedup_key(payload)
+        if deduplicator.is_duplicate(dedup_key):
+            logger.info(
+                f"Skipping duplicate event: event_id={payload.get('event_id')}, "
+                f"retry_num={retry_num}"
+            )
+            return {
+                "statusCode": 200,
+                "body": json.dumps({"ok": True}),
+            }
+
         # イベントを正規化
         normalized_event = normalize_event(slack_event, bot_user_id)
         normalized_event["team_id"] = payload.get("team_id", "")
-        logger.info(f"Normalized event: {json.dumps(normalized_event)}")
-
-        # Step Functions を開始
-        step_function_arn = os.environ.get("STEP_FUNCTION_ARN", "")
-        if step_function_arn:
-            sfn_client = boto3.client("stepfunctions")
-            execution_name = f"{normalized_event['channel_id']}-{normalized_event['ts'].replace('.', '-')}"
-            sfn_client.start_execution(
-                stateMachineArn=step_function_arn,
-                name=execution_name,
-                input=json.dumps(normalized_event),
-            )
-            logger.info(f"Started Step Functions execution: {execution_name}")
+        bind_correlation_ids(
+            channel_id=normalized_event["channel_id"],
+            ts=normalized_event["ts"],
+            execution=build_execution_name(normalized_event),
+        )
+        logger.info("Normalized event: %s", LazyJson(normalized_event))
+
+        # Step Functions を開始（queue モードではキューに積むだけ、direct モードではパイプラインを非同期実行）
+        if dispatcher is not None:
+            try:
+                dispatcher.dispatch(normalized_event)
+            except Exception:
+                # 受け渡しに失敗したイベントは Slack の再送で処理し直せるよう記録を取り消す
+                deduplicator.forget(dedup_key)
+                raise
 
     # Slack には即座に 200 を返す
     return {
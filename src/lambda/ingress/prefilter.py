@@ -0,0 +1,77 @@
+"""生ボディでのイベント事前分類
+
+忙しいワークスペースでは届くイベントの大半が処理対象外（bot の発言、
+編集・削除などの subtype 付きイベント、message 以外のイベント）になる。
+JSON を完全にパースする前に、必要なキーだけを生の bytes から探して弾く。
+
+orjson がインストールされていればパースにも使用する（未導入時は標準ライブラリ）。
+判定は保守的に行い、弾けるのは「確実に処理対象外」と分かる場合のみ。
+それ以外は通常どおりパースして is_processable_event / is_bot_message で判定する。
+"""
+
+import json
+import re
+from typing import Any
+
+try:
+    import orjson
+
+    def json_loads(data: bytes) -> Any:
+        """高速な JSON バックエンド（orjson）でパース"""
+        return orjson.loads(data)
+
+except ImportError:
+    json_loads = json.loads
+
+
+# JSON 文字列中にエスケープされて現れる場合（\"subtype\":）にはマッチしない
+_EVENT_CALLBACK = re.compile(rb'"type"\s*:\s*"event_callback"')
+_MESSAGE_TYPE = re.compile(rb'"type"\s*:\s*"message"')
+_SUBTYPE = re.compile(rb'"subtype"\s*:\s*"')
+_BOT_ID = re.compile(rb'"bot_id"\s*:\s*"')
+_TYPE = re.compile(rb'"type"\s*:\s*"([^"\\]*)"')
+_EVENT_OBJECT = re.compile(rb'"event"\s*:\s*\{')
+_NESTING = re.compile(rb"[{}\[\]]")
+
+
+def _event_top_level_keys(body: bytes) -> bytes:
+    """event オブジェクトの先頭から、最初の入れ子（または閉じ括弧）までの範囲
+
+    files[].subtype や attachments[].bot_id のような入れ子のキーを
+    event 自身のキーと取り違えないよう、subtype / bot_id はこの範囲でのみ探す。
+    範囲外にしかない場合はパースして判定する（文字列中の括弧で範囲が
+    短くなっても、パースに回るだけで誤って弾くことはない）。
+    """
+    event = _EVENT_OBJECT.search(body)
+    if event is None:
+        return b""
+    nested = _NESTING.search(body, event.end())
+    return body[event.end() : nested.start() if nested else len(body)]
+
+
+def classify_raw_body(body: bytes) -> str | None:
+    """生ボディから処理対象外のイベントを判定
+
+    Returns:
+        str | None: 処理対象外ならスキップ理由、判定できない場合は None
+    """
+    if not _EVENT_CALLBACK.search(body):
+        return None
+
+    if not _MESSAGE_TYPE.search(body):
+        return "non-message event"
+
+    keys = _event_top_level_keys(body)
+
+    # reaction_added の item.type のような入れ子の "message" を除くため、event 自身の type も見る
+    event_type = _TYPE.search(keys)
+    if event_type and event_type.group(1) != b"message":
+        return "non-message event"
+
+    if _SUBTYPE.search(keys):
+        return "message with subtype"
+
+    if _BOT_ID.search(keys):
+        return "bot message"
+
+    return None
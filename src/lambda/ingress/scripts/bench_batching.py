@@ -0,0 +1,159 @@
+"""マイクロバッチによる Step Functions 実行数とコストの試算
+
+queue モードのドレイナー（drain_records + MicroBatcher）に合成トラフィックを流し、
+10 / 100 / 1000 イベント/分での start_execution 回数と 1 分あたりのコストを
+BATCH_WINDOW_MS ごとに出力する。AWS にはアクセスしない。
+
+トラフィック:
+- チャンネル数 --channels、ユーザーは 1 回の発言で 1〜数件を連投する
+  （件数は平均 --burst-mean の幾何分布、間隔は 0.2〜3 秒の一様分布）
+- SQS イベントソースは CDK の設定どおり最大 10 件・1 秒のバッチでドレイナーを呼ぶ
+
+コスト（1 実行あたり、引数で変更可。デフォルトは試算用の仮定値）:
+- Step Functions Standard: 状態遷移 3 回 × --transition-price
+- invoke-agentcore / post-to-slack の Lambda 呼び出し 2 回 × --lambda-request-price
+- Router Agent の呼び出し 1 回 × --router-call-cost
+ドレイナー自身の Lambda 呼び出し（SQS バッチごと）も加算する。
+
+Usage (src/lambda/ingress で実行)::
+
+    uv run python scripts/bench_batching.py --minutes 10
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dispatch import MicroBatcher, drain_records  # noqa: E402
+
+TRANSITIONS_PER_EXECUTION = 3
+LAMBDA_INVOCATIONS_PER_EXECUTION = 2
+SQS_BATCH_SIZE = 10
+SQS_BATCH_WINDOW_SECONDS = 1.0
+
+
+class CountingStepFunctions:
+    class exceptions:  # noqa: N801
+        class ExecutionAlreadyExists(Exception):
+            pass
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def start_execution(self, **kwargs) -> dict:
+        self.calls += 1
+        return {}
+
+
+def generate_events(
+    rate_per_minute: int, minutes: float, channels: int, burst_mean: float, seed: int
+) -> list[dict]:
+    """正規化イベント相当の合成トラフィック（ts 順）"""
+    rng = random.Random(seed)
+    duration = minutes * 60
+    events: list[dict] = []
+    now = 0.0
+    while True:
+        # バースト（1 ユーザーの連投）の開始間隔は平均イベント間隔 × 平均バースト長
+        now += rng.expovariate(rate_per_minute / 60 / burst_mean)
+        if now > duration:
+            break
+        channel_id = f"C{rng.randrange(channels):03d}"
+        user_id = f"U{rng.randrange(channels * 5):04d}"
+        ts = now
+        burst = 1
+        while rng.random() > 1 / burst_mean:
+            burst += 1
+        for _ in range(burst):
+            events.append(
+                {
+                    "channel_id": channel_id,
+                    "user_id": user_id,
+                    "text": "message",
+                    "ts": f"{1700000000 + ts:.6f}",
+                    "thread_ts": f"{1700000000 + ts:.6f}",
+                    "is_mentioned": False,
+                }
+            )
+            ts += rng.uniform(0.2, 3.0)
+    events.sort(key=lambda e: float(e["ts"]))
+    return events
+
+
+def sqs_batches(events: list[dict]) -> list[list[dict]]:
+    """SQS イベントソースが 1 回のドレイナー呼び出しに渡すレコード列"""
+    batches: list[list[dict]] = []
+    batch: list[dict] = []
+    for event in events:
+        if batch and (
+            len(batch) >= SQS_BATCH_SIZE
+            or float(event["ts"]) - float(batch[0]["ts"]) > SQS_BATCH_WINDOW_SECONDS
+        ):
+            batches.append(batch)
+            batch = []
+        batch.append(event)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def simulate(events: list[dict], window_ms: int) -> tuple[int, int]:
+    """(ドレイナー呼び出し回数, start_execution 回数)"""
+    sfn = CountingStepFunctions()
+    batcher = MicroBatcher(window_ms=window_ms) if window_ms > 0 else None
+    deliveries = sqs_batches(events)
+    for n, delivery in enumerate(deliveries):
+        records = [
+            {"messageId": f"{n}-{i}", "eventSource": "aws:sqs", "body": json.dumps(event)}
+            for i, event in enumerate(delivery)
+        ]
+        drain_records(records, sfn, "arn:aws:states:local:0:stateMachine:bench", batcher=batcher)
+    return len(deliveries), sfn.calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rates", type=int, nargs="+", default=[10, 100, 1000], help="イベント/分")
+    parser.add_argument("--windows-ms", type=int, nargs="+", default=[0, 50, 1000, 3000])
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--burst-mean", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--transition-price", type=float, default=0.000025)
+    parser.add_argument("--lambda-request-price", type=float, default=0.0000002)
+    parser.add_argument("--router-call-cost", type=float, default=0.00006)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    execution_cost = (
+        TRANSITIONS_PER_EXECUTION * args.transition_price
+        + LAMBDA_INVOCATIONS_PER_EXECUTION * args.lambda_request_price
+        + args.router_call_cost
+    )
+
+    print(
+        f"{'events/min':>10} {'window':>7} {'drains/min':>10} {'executions/min':>14} "
+        f"{'saved':>6} {'cost/min':>10}"
+    )
+    for rate in args.rates:
+        events = generate_events(rate, args.minutes, args.channels, args.burst_mean, args.seed)
+        baseline = None
+        for window_ms in args.windows_ms:
+            drains, executions = simulate(events, window_ms)
+            baseline = baseline or executions
+            cost = executions * execution_cost + drains * args.lambda_request_price
+            print(
+                f"{len(events) / args.minutes:>10.1f} {window_ms:>5}ms "
+                f"{drains / args.minutes:>10.1f} "
+                f"{executions / args.minutes:>14.1f} {1 - executions / baseline:>6.1%} "
+                f"${cost / args.minutes:>9.5f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""同期ディスパッチと遅延ディスパッチ（queue モード）の ack 遅延ベンチマーク
+
+AWS にはアクセスせず、Step Functions（start_execution）と SQS（send_message）を
+指定した応答時間のスタブに置き換えて、同じ署名付きメッセージイベントを処理する。
+
+- sync: ack 前に start_execution を呼ぶ（DISPATCH_MODE=sync）
+- queue: キューに積んで ack し、ドレイナーが 10 件ずつ start_execution する（DISPATCH_MODE=queue）
+
+ack までの p50/p99 と、queue モードでドレイナーが実行を開始するまでの 1 イベントあたりの時間を出力する。
+
+Usage (src/lambda/ingress で実行)::
+
+    uv run python scripts/bench_dispatch.py --events 500 --sfn-latency-ms 40 --sqs-latency-ms 8
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from bench_handler import (  # noqa: E402
+    BOT_USER_ID,
+    SIGNING_SECRET,
+    STATE_MACHINE_ARN,
+    FakeStepFunctions,
+    percentile,
+    signed_message_event,
+)
+
+import handler  # noqa: E402
+from dedup import EventDeduplicator  # noqa: E402
+from dispatch import InMemoryQueue, QueueDispatcher, StepFunctionsDispatcher, drain_records  # noqa: E402
+
+
+class FakeQueue(InMemoryQueue):
+    """send_message に応答時間を持たせたキュー"""
+
+    def __init__(self, latency_seconds: float) -> None:
+        super().__init__()
+        self._latency_seconds = latency_seconds
+
+    def send_message(self, QueueUrl: str, MessageBody: str) -> dict:  # noqa: N803
+        time.sleep(self._latency_seconds)
+        return super().send_message(QueueUrl=QueueUrl, MessageBody=MessageBody)
+
+
+def measure_acks(events: list[dict]) -> list[float]:
+    latencies = []
+    for event in events:
+        started = time.perf_counter()
+        response = handler.lambda_handler(event, None)
+        latencies.append(time.perf_counter() - started)
+        assert response["statusCode"] == 200, response
+    return latencies
+
+
+def report(label: str, values: list[float]) -> None:
+    print(
+        f"{label:>18}: p50={statistics.median(values) * 1000:.2f}ms "
+        f"p99={percentile(values, 0.99) * 1000:.2f}ms (n={len(values)})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=300)
+    parser.add_argument("--sfn-latency-ms", type=float, default=40.0)
+    parser.add_argument("--sqs-latency-ms", type=float, default=8.0)
+    args = parser.parse_args()
+
+    handler.get_slack_signing_secret = lambda: SIGNING_SECRET
+    handler.get_slack_bot_user_id = lambda: BOT_USER_ID
+    handler.deduplicator = EventDeduplicator(ttl_seconds=600)
+    logging.getLogger().addHandler(logging.StreamHandler(open(os.devnull, "w")))
+    sfn = FakeStepFunctions(args.sfn_latency_ms / 1000)
+
+    handler.dispatcher = StepFunctionsDispatcher(sfn, STATE_MACHINE_ARN)
+    report("sync ack", measure_acks([signed_message_event(n) for n in range(args.events)]))
+
+    queue = FakeQueue(args.sqs_latency_ms / 1000)
+    handler.dispatcher = QueueDispatcher(queue, "https://sqs.local/dispatch")
+    offset = args.events
+    report("queue ack", measure_acks([signed_message_event(offset + n) for n in range(args.events)]))
+
+    drained = []
+    while records := queue.receive_records(max_records=10):
+        started = time.perf_counter()
+        response = drain_records(records, sfn, STATE_MACHINE_ARN)
+        drained.extend([(time.perf_counter() - started) / len(records)] * len(records))
+        assert not response["batchItemFailures"], response
+    report("queue drain/event", drained)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Ingress Lambda のハンドラー遅延ベンチマーク（コールド / ウォーム）
+
+AWS にはアクセスせず、SSM（aws_lambda_powertools の get_parameter）と
+Step Functions（start_execution）をスタブに置き換えて計測する。
+
+- cold: 新しいプロセスで handler を import（Lambda の Init フェーズ相当）してから
+  最初の署名付きメッセージイベントの処理が終わるまでの時間
+- warm: 同じプロセスでの 2 回目以降の呼び出しの時間
+
+--ssm-latency-ms / --sfn-latency-ms で各 API の応答時間を模擬できる。
+
+Usage (src/lambda/ingress で実行)::
+
+    uv run python scripts/bench_handler.py --cold-runs 20 --warm-runs 200
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+LAMBDA_DIR = Path(__file__).resolve().parent.parent
+
+SIGNING_SECRET = "bench-signing-secret"
+BOT_USER_ID = "U_BOT"
+STATE_MACHINE_ARN = "arn:aws:states:us-east-1:123456789012:stateMachine:bench"
+
+
+def signed_message_event(n: int) -> dict:
+    """署名付きの API Gateway イベント（メッセージごとに ts を変えて重複排除を避ける）"""
+    body = json.dumps(
+        {
+            "type": "event_callback",
+            "team_id": "T_BENCH",
+            "event_id": f"Ev{n}",
+            "event": {
+                "type": "message",
+                "channel": "C_BENCH",
+                "user": "U_USER",
+                "text": f"<@{BOT_USER_ID}> デプロイ手順を教えて #{n}",
+                "ts": f"1700000000.{n:06d}",
+            },
+        }
+    )
+    timestamp = str(int(time.time()))
+    base = f"v0:{timestamp}:{body}".encode()
+    signature = "v0=" + hmac.new(SIGNING_SECRET.encode(), base, hashlib.sha256).hexdigest()
+    return {
+        "body": body,
+        "headers": {
+            "X-Slack-Request-Timestamp": timestamp,
+            "X-Slack-Signature": signature,
+        },
+    }
+
+
+class FakeStepFunctions:
+    """start_execution だけを持つ Step Functions クライアントのスタブ"""
+
+    class exceptions:  # noqa: N801
+        class ExecutionAlreadyExists(Exception):
+            pass
+
+    def __init__(self, latency_seconds: float) -> None:
+        self._latency_seconds = latency_seconds
+
+    def start_execution(self, **kwargs) -> dict:
+        time.sleep(self._latency_seconds)
+        return {"executionArn": f"{STATE_MACHINE_ARN}:{kwargs['name']}"}
+
+
+def run_child(warm_runs: int, ssm_latency: float, sfn_latency: float) -> None:
+    """1 コンテナ分の計測（cold 1 回 + warm warm_runs 回）を JSON で出力"""
+    started = time.perf_counter()
+
+    import aws_lambda_powertools.utilities.parameters as parameters
+
+    values = {
+        "/bench/slack-signing-secret": SIGNING_SECRET,
+        "/bench/slack-bot-user-id": BOT_USER_ID,
+    }
+
+    def get_parameter(name: str, max_age: int = 0) -> str:
+        time.sleep(ssm_latency)
+        return values[name]
+
+    parameters.get_parameter = get_parameter
+
+    import dispatch
+    import handler
+
+    # Lambda のログ出力先の代わり（フォーマットのコストも計測に含める）
+    logging.getLogger().addHandler(logging.StreamHandler(open(os.devnull, "w")))
+    handler.dispatcher = dispatch.StepFunctionsDispatcher(
+        FakeStepFunctions(sfn_latency), STATE_MACHINE_ARN
+    )
+
+    response = handler.lambda_handler(signed_message_event(0), None)
+    cold = time.perf_counter() - started
+    assert response["statusCode"] == 200, response
+
+    warm = []
+    for n in range(1, warm_runs + 1):
+        event = signed_message_event(n)
+        t0 = time.perf_counter()
+        handler.lambda_handler(event, None)
+        warm.append(time.perf_counter() - t0)
+
+    print(json.dumps({"cold": cold, "warm": warm}))
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cold-runs", type=int, default=10, help="起動するプロセス数")
+    parser.add_argument("--warm-runs", type=int, default=200, help="プロセスあたりの warm 呼び出し数")
+    parser.add_argument("--ssm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--sfn-latency-ms", type=float, default=0.0)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.warm_runs, args.ssm_latency_ms / 1000, args.sfn_latency_ms / 1000)
+        return
+
+    env = {
+        **{k: v for k, v in os.environ.items() if k != "DEDUP_TABLE_NAME"},
+        "AWS_DEFAULT_REGION": os.environ.get("AWS_DEFAULT_REGION", "us-east-1"),
+        "SSM_SLACK_SIGNING_SECRET": "/bench/slack-signing-secret",
+        "SSM_SLACK_BOT_USER_ID": "/bench/slack-bot-user-id",
+        "STEP_FUNCTION_ARN": STATE_MACHINE_ARN,
+        "DISPATCH_MODE": "sync",
+    }
+    cold, warm = [], []
+    for _ in range(args.cold_runs):
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--child",
+                f"--warm-runs={args.warm_runs}",
+                f"--ssm-latency-ms={args.ssm_latency_ms}",
+                f"--sfn-latency-ms={args.sfn_latency_ms}",
+            ],
+            cwd=LAMBDA_DIR,
+            env={**env, "PYTHONPATH": str(LAMBDA_DIR)},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        sample = json.loads(output.splitlines()[-1])
+        cold.append(sample["cold"])
+        warm.extend(sample["warm"])
+
+    for label, values in (("cold", cold), ("warm", warm)):
+        print(
+            f"{label:>4}: p50={statistics.median(values) * 1000:.2f}ms "
+            f"p99={percentile(values, 0.99) * 1000:.2f}ms (n={len(values)})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""生ボディでの事前分類（prefilter.py）のベンチマーク
+
+Slack のイベントボディのコーパスに対して、1 イベントあたりの判定時間を比較する。
+
+- full parse: 従来どおり json.loads してから is_processable_event / is_bot_message で判定
+- prefilter: classify_raw_body で弾けるものはパースせず、残りだけ json_loads して判定
+
+あわせて、事前分類で弾いたイベントがフルパースでも処理対象外になることを確認する。
+
+--corpus には記録したボディを 1 行 1 件（JSON）で並べたファイルを指定する。
+未指定時は Slack のイベント形式に沿った合成コーパス（通常の発言・スレッド返信・
+編集・削除・bot の発言・ファイル共有・リアクションなど）を使う。
+
+Usage (src/lambda/ingress で実行)::
+
+    uv run python scripts/bench_prefilter.py --events 20000
+    uv run python scripts/bench_prefilter.py --corpus recorded-events.jsonl
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+logging.disable(logging.WARNING)
+
+from handler import is_bot_message, is_processable_event  # noqa: E402
+from prefilter import classify_raw_body, json_loads  # noqa: E402
+
+BOT_USER_ID = "U_BOT"
+
+
+def _message(rng: random.Random, head: dict | None = None, **extra) -> dict:
+    """message イベント（head のキーは Slack と同じく type の直後に置く）"""
+    words = ["deploy", "staging", "確認", "お願いします", "PR", "レビュー"]
+    text = " ".join(rng.choice(words) for _ in range(rng.randint(3, 40)))
+    return {
+        "type": "message",
+        **(head or {}),
+        "channel": f"C{rng.randrange(50):04d}",
+        "user": f"U{rng.randrange(500):05d}",
+        "text": text,
+        "ts": f"{1700000000 + rng.random() * 1e6:.6f}",
+        "blocks": [
+            {
+                "type": "rich_text",
+                "block_id": "b1",
+                "elements": [
+                    {"type": "rich_text_section", "elements": [{"type": "text", "text": text}]}
+                ],
+            }
+        ],
+        "team": "T0001",
+        "client_msg_id": f"{rng.getrandbits(64):016x}",
+        **extra,
+    }
+
+
+def _events(rng: random.Random) -> dict:
+    """Slack のイベント種別ごとの生成関数と出現比率"""
+    return {
+        "message": (30, lambda: _message(rng)),
+        "thread_reply": (
+            15,
+            lambda: _message(rng, thread_ts=f"{1700000000 + rng.random() * 1e6:.6f}"),
+        ),
+        "message_changed": (
+            10,
+            lambda: {
+                "type": "message",
+                "subtype": "message_changed",
+                "channel": "C0001",
+                "hidden": True,
+                "message": _message(rng),
+                "previous_message": _message(rng),
+                "ts": "1700000000.000200",
+            },
+        ),
+        "message_deleted": (
+            4,
+            lambda: {
+                "type": "message",
+                "subtype": "message_deleted",
+                "channel": "C0001",
+                "hidden": True,
+                "deleted_ts": "1700000000.000100",
+                "previous_message": _message(rng),
+                "ts": "1700000000.000300",
+            },
+        ),
+        "bot_message": (
+            15,
+            lambda: _message(rng, {"subtype": "bot_message", "bot_id": "B0001"}, username="CI"),
+        ),
+        "app_message": (8, lambda: _message(rng, {"bot_id": "B0002"}, app_id="A0002")),
+        "own_message": (3, lambda: {**_message(rng), "user": BOT_USER_ID}),
+        "file_share": (
+            3,
+            lambda: _message(
+                rng,
+                {"subtype": "file_share"},
+                files=[{"id": "F1", "name": "log.txt", "mimetype": "text/plain", "size": 1024}],
+            ),
+        ),
+        "channel_join": (2, lambda: _message(rng, {"subtype": "channel_join"})),
+        "reaction_added": (
+            10,
+            lambda: {
+                "type": "reaction_added",
+                "user": "U00001",
+                "reaction": "+1",
+                "item": {"type": "message", "channel": "C0001", "ts": "1700000000.000100"},
+                "event_ts": "1700000000.000400",
+            },
+        ),
+    }
+
+
+def synthetic_corpus(size: int, seed: int) -> list[bytes]:
+    rng = random.Random(seed)
+    kinds = _events(rng)
+    names = list(kinds)
+    weights = [kinds[name][0] for name in names]
+    corpus = []
+    for n in range(size):
+        event = kinds[rng.choices(names, weights)[0]][1]()
+        payload = {
+            "token": "XXYYZZ",
+            "team_id": "T0001",
+            "api_app_id": "A0001",
+            "event": event,
+            "type": "event_callback",
+            "event_id": f"Ev{n:08d}",
+            "event_time": 1700000000,
+            "authorizations": [{"team_id": "T0001", "user_id": BOT_USER_ID, "is_bot": True}],
+        }
+        corpus.append(json.dumps(payload, ensure_ascii=False).encode())
+    return corpus
+
+
+def is_target(payload: dict) -> bool:
+    event = payload.get("event", {})
+    return is_processable_event(event) and not is_bot_message(event, BOT_USER_ID)
+
+
+def full_parse(body: bytes) -> bool:
+    return is_target(json.loads(body.decode()))
+
+
+def prefiltered(body: bytes) -> bool:
+    if classify_raw_body(body):
+        return False
+    return is_target(json_loads(body))
+
+
+def measure(decide, corpus: list[bytes], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for body in corpus:
+            decide(body)
+        best = min(best, time.perf_counter() - started)
+    return best / len(corpus)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--corpus", type=Path, help="1 行 1 ボディの JSONL（未指定時は合成コーパス）"
+    )
+    parser.add_argument("--events", type=int, default=10000, help="合成コーパスの件数")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = [line.encode() for line in args.corpus.read_text().splitlines() if line.strip()]
+    else:
+        corpus = synthetic_corpus(args.events, args.seed)
+
+    reasons = Counter(classify_raw_body(body) or "parsed" for body in corpus)
+    wrongly_skipped = sum(1 for body in corpus if classify_raw_body(body) and full_parse(body))
+    if wrongly_skipped:
+        raise SystemExit(f"{wrongly_skipped} processable events were skipped by the prefilter")
+
+    average_size = sum(map(len, corpus)) / len(corpus)
+    print(f"corpus: {len(corpus)} bodies, {average_size:.0f} bytes on average")
+    for reason, count in reasons.most_common():
+        print(f"  {reason:<22} {count / len(corpus):>6.1%}")
+    print(f"  {'processable':<22} {sum(map(full_parse, corpus)) / len(corpus):>6.1%}")
+
+    baseline = measure(full_parse, corpus, args.repeat)
+    current = measure(prefiltered, corpus, args.repeat)
+    backend = "orjson" if json_loads is not json.loads else "json"
+    print(f"full parse: {baseline * 1e6:.1f}us/event")
+    print(f"prefilter:  {current * 1e6:.1f}us/event ({backend}, {baseline / current:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Slack 署名検証のマイクロベンチマーク（ボディサイズ 1 KB〜1 MB）
+
+従来の実装（リクエストごとに鍵を encode して hmac.new し、str のボディから
+f-string で基底文字列を組み立てて encode する）と、SlackSignatureVerifier
+（事前に鍵を設定した HMAC を copy() し、bytes のボディをそのまま渡す）の
+1 回あたりの検証時間を比較する。
+
+Usage (src/lambda/ingress で実行)::
+
+    uv run python scripts/bench_signature.py
+"""
+
+import argparse
+import hashlib
+import hmac
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from signature import SlackSignatureVerifier  # noqa: E402
+
+SIGNING_SECRET = "8f742231b10e8888abcd99yyyzzz85a5"
+SIZES = {"1KB": 1024, "10KB": 10 * 1024, "100KB": 100 * 1024, "1MB": 1024 * 1024}
+
+
+def legacy_verify(signing_secret: str, timestamp: str, body: str, signature: str) -> bool:
+    """user-005 以前の verify_slack_signature（API Gateway の str ボディを受け取る）"""
+    if abs(time.time() - int(timestamp)) > 60 * 5:
+        return False
+    sig_basestring = f"v0:{timestamp}:{body}"
+    computed_signature = (
+        "v0="
+        + hmac.new(
+            signing_secret.encode(),
+            sig_basestring.encode(),
+            hashlib.sha256,
+        ).hexdigest()
+    )
+    return hmac.compare_digest(computed_signature, signature)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    verifier = SlackSignatureVerifier([SIGNING_SECRET])
+    print(f"{'size':>6} {'legacy':>12} {'verifier':>12} {'speedup':>8}")
+    for label, size in SIZES.items():
+        raw_body = (b'{"type":"event_callback","event":{"text":"' + b"x" * size)[:size]
+        # 従来の実装は API Gateway の str ボディを受け取っていた
+        text_body = raw_body.decode()
+        timestamp = str(int(time.time()))
+        signature = "v0=" + hmac.new(
+            SIGNING_SECRET.encode(), b"v0:" + timestamp.encode() + b":" + raw_body, hashlib.sha256
+        ).hexdigest()
+        assert legacy_verify(SIGNING_SECRET, timestamp, text_body, signature)
+        assert verifier.verify(timestamp, raw_body, signature)
+
+        number = max(10, 20_000_000 // size)
+        legacy = min(
+            timeit.repeat(
+                lambda: legacy_verify(SIGNING_SECRET, timestamp, text_body, signature),
+                number=number,
+                repeat=args.repeat,
+            )
+        ) / number
+        current = min(
+            timeit.repeat(
+                lambda: verifier.verify(timestamp, raw_body, signature),
+                number=number,
+                repeat=args.repeat,
+            )
+        ) / number
+        print(
+            f"{label:>6} {legacy * 1e6:>10.1f}us {current * 1e6:>10.1f}us "
+            f"{legacy / current:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
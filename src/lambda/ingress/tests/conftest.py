@@ -0,0 +1,6 @@
+"""テスト共通設定"""
+
+import os
+
+# handler.py はインポート時に boto3 クライアントを作成する
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
@@ -0,0 +1,84 @@
+"""dedup.py のテスト"""
+
+from dedup import EventDeduplicator, InMemoryDedupStore, build_dedup_key
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_first_event_is_not_duplicate_and_retry_is():
+    deduplicator = EventDeduplicator(ttl_seconds=60, clock=FakeClock())
+
+    assert deduplicator.is_duplicate("event:Ev1") is False
+    assert deduplicator.is_duplicate("event:Ev1") is True
+    assert deduplicator.is_duplicate("event:Ev2") is False
+
+
+def test_key_expires_after_ttl():
+    clock = FakeClock()
+    deduplicator = EventDeduplicator(ttl_seconds=60, clock=clock)
+    deduplicator.is_duplicate("event:Ev1")
+
+    clock.now += 59
+    assert deduplicator.is_duplicate("event:Ev1") is True
+
+    clock.now += 61
+    assert deduplicator.is_duplicate("event:Ev1") is False
+
+
+def test_least_recently_used_key_is_evicted():
+    deduplicator = EventDeduplicator(ttl_seconds=60, max_entries=2, clock=FakeClock())
+    deduplicator.is_duplicate("a")
+    deduplicator.is_duplicate("b")
+    # a を参照して b を最古にする
+    assert deduplicator.is_duplicate("a") is True
+    deduplicator.is_duplicate("c")
+
+    assert deduplicator.is_duplicate("a") is True
+    assert deduplicator.is_duplicate("b") is False
+
+
+def test_shared_store_catches_retry_on_another_container():
+    clock = FakeClock()
+    store = InMemoryDedupStore(clock=clock)
+    container_a = EventDeduplicator(store=store, ttl_seconds=60, clock=clock)
+    container_b = EventDeduplicator(store=store, ttl_seconds=60, clock=clock)
+
+    assert container_a.is_duplicate("event:Ev1") is False
+    assert container_b.is_duplicate("event:Ev1") is True
+
+
+def test_shared_store_error_falls_back_to_local_cache():
+    class BrokenStore:
+        def put_if_absent(self, key, ttl_seconds):
+            raise RuntimeError("throttled")
+
+        def delete(self, key):
+            raise RuntimeError("throttled")
+
+    deduplicator = EventDeduplicator(store=BrokenStore(), ttl_seconds=60, clock=FakeClock())
+
+    assert deduplicator.is_duplicate("event:Ev1") is False
+    assert deduplicator.is_duplicate("event:Ev1") is True
+
+
+def test_forget_lets_the_retry_through_after_a_failed_dispatch():
+    clock = FakeClock()
+    store = InMemoryDedupStore(clock=clock)
+    container_a = EventDeduplicator(store=store, ttl_seconds=60, clock=clock)
+    container_b = EventDeduplicator(store=store, ttl_seconds=60, clock=clock)
+
+    assert container_a.is_duplicate("event:Ev1") is False
+    container_a.forget("event:Ev1")
+
+    assert container_b.is_duplicate("event:Ev1") is False
+
+
+def test_build_dedup_key_prefers_event_id():
+    assert build_dedup_key({"event_id": "Ev1", "event": {"channel": "C1", "ts": "1.0"}}) == "event:Ev1"
+    assert build_dedup_key({"event": {"channel": "C1", "ts": "1.0"}}) == "message:C1:1.0"
@@ -0,0 +1,158 @@
+"""dispatch.py のテスト（マイクロバッチ・キューのドレイン）"""
+
+import json
+
+from dispatch import (
+    InMemoryQueue,
+    MicroBatcher,
+    QueueDispatcher,
+    drain_records,
+    is_queue_event,
+    merge_batch,
+)
+
+
+def _event(ts: str, user_id: str = "UA", text: str = "hi", **overrides) -> dict:
+    event = {
+        "channel_id": "C1",
+        "user_id": user_id,
+        "text": text,
+        "ts": ts,
+        "thread_ts": ts,
+        "is_mentioned": False,
+        "deadline_ms": 0,
+    }
+    event.update(overrides)
+    return event
+
+
+def test_consecutive_messages_from_one_user_are_merged():
+    batches = MicroBatcher(window_ms=100).group(
+        [_event("100.000", text="first"), _event("100.050", text="second")]
+    )
+
+    assert len(batches) == 1
+    merged = merge_batch(batches[0])
+    assert merged["text"] == "first\nsecond"
+    assert merged["ts"] == "100.050"
+    assert merged["batch_size"] == 2
+
+
+def test_messages_from_different_users_are_not_merged():
+    batches = MicroBatcher(window_ms=100).group(
+        [
+            _event("100.000", user_id="UA", text="<@BOT> help", is_mentioned=True),
+            _event("100.050", user_id="UB", text="lunch?"),
+        ]
+    )
+
+    merged = [merge_batch(batch) for batch in batches]
+    assert [(e["user_id"], e["text"], e["is_mentioned"]) for e in merged] == [
+        ("UA", "<@BOT> help", True),
+        ("UB", "lunch?", False),
+    ]
+
+
+def test_messages_outside_the_window_are_not_merged():
+    batches = MicroBatcher(window_ms=50).group([_event("100.000"), _event("100.200")])
+
+    assert len(batches) == 2
+
+
+def test_merged_deadline_is_the_earliest():
+    merged = merge_batch([_event("100.000", deadline_ms=2000), _event("100.010", deadline_ms=1000)])
+
+    assert merged["deadline_ms"] == 1000
+
+
+class FakeStepFunctions:
+    class exceptions:  # noqa: N801
+        class ExecutionAlreadyExists(Exception):
+            pass
+
+    def __init__(self, fail_texts: tuple[str, ...] = (), existing_names: tuple[str, ...] = ()) -> None:
+        self.fail_texts = fail_texts
+        self.existing_names = existing_names
+        self.started: list[dict] = []
+
+    def start_execution(self, stateMachineArn, name, input):  # noqa: N803
+        normalized_event = json.loads(input)
+        if normalized_event["text"] in self.fail_texts:
+            raise RuntimeError("ThrottlingException")
+        if name in self.existing_names:
+            raise self.exceptions.ExecutionAlreadyExists()
+        self.started.append({"name": name, "input": normalized_event})
+
+
+def _queued(queue: InMemoryQueue, *events: dict) -> list[dict]:
+    dispatcher = QueueDispatcher(queue, "https://sqs/dispatch")
+    for event in events:
+        dispatcher.dispatch(event)
+    return queue.receive_records()
+
+
+def test_queue_event_is_recognized():
+    records = _queued(InMemoryQueue(), _event("100.000"))
+
+    assert is_queue_event({"Records": records}) is True
+    assert is_queue_event({"Records": [{"eventSource": "aws:s3"}]}) is False
+    assert is_queue_event({"body": "{}"}) is False
+
+
+def test_drain_starts_one_execution_per_record():
+    sfn = FakeStepFunctions()
+    records = _queued(InMemoryQueue(), _event("100.000"), _event("200.000", channel_id="C2"))
+
+    response = drain_records(records, sfn, "arn")
+
+    assert response == {"batchItemFailures": []}
+    assert [started["name"] for started in sfn.started] == ["C1-100-000", "C2-200-000"]
+    assert "_message_id" not in sfn.started[0]["input"]
+
+
+def test_drain_reports_only_failed_records():
+    sfn = FakeStepFunctions(fail_texts=("boom",))
+    records = _queued(
+        InMemoryQueue(),
+        _event("100.000", text="ok"),
+        _event("200.000", text="boom", channel_id="C2"),
+        _event("300.000", text="ok", channel_id="C3"),
+    )
+
+    response = drain_records(records, sfn, "arn")
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": records[1]["messageId"]}]}
+    assert len(sfn.started) == 2
+
+
+def test_failed_batch_reports_every_merged_record():
+    sfn = FakeStepFunctions(fail_texts=("first\nsecond",))
+    records = _queued(
+        InMemoryQueue(),
+        _event("100.000", text="first"),
+        _event("100.010", text="second"),
+    )
+
+    response = drain_records(records, sfn, "arn", batcher=MicroBatcher(window_ms=50))
+
+    assert response == {
+        "batchItemFailures": [{"itemIdentifier": record["messageId"]} for record in records]
+    }
+
+
+def test_malformed_record_is_dropped_not_retried():
+    sfn = FakeStepFunctions()
+    records = [{"messageId": "bad", "eventSource": "aws:sqs", "body": "{not json"}]
+    records += _queued(InMemoryQueue(), _event("100.000"))
+
+    response = drain_records(records, sfn, "arn")
+
+    assert response == {"batchItemFailures": []}
+    assert len(sfn.started) == 1
+
+
+def test_existing_execution_is_not_a_failure():
+    sfn = FakeStepFunctions(existing_names=("C1-100-000",))
+    records = _queued(InMemoryQueue(), _event("100.000"))
+
+    assert drain_records(records, sfn, "arn") == {"batchItemFailures": []}
@@ -0,0 +1,175 @@
+"""handler.py の初期化処理とウォームアップのテスト"""
+
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+
+import handler
+from dedup import EventDeduplicator
+from dispatch import InMemoryQueue, LambdaDispatcher, QueueDispatcher, StepFunctionsDispatcher
+
+STATE_MACHINE_ARN = "arn:aws:states:us-east-1:123456789012:stateMachine:bot"
+SIGNING_SECRET = "test-signing-secret"
+BOT_USER_ID = "U_BOT"
+
+
+def signed_event(text: str = "hello", ts: str = "1700000000.000100") -> dict:
+    body = json.dumps(
+        {
+            "type": "event_callback",
+            "team_id": "T1",
+            "event_id": f"Ev{ts}",
+            "event": {"type": "message", "channel": "C1", "user": "U1", "text": text, "ts": ts},
+        }
+    )
+    timestamp = str(int(time.time()))
+    base = f"v0:{timestamp}:{body}".encode()
+    signature = "v0=" + hmac.new(SIGNING_SECRET.encode(), base, hashlib.sha256).hexdigest()
+    return {
+        "body": body,
+        "headers": {"X-Slack-Request-Timestamp": timestamp, "X-Slack-Signature": signature},
+    }
+
+
+class RecordingStepFunctions:
+    class exceptions:  # noqa: N801
+        class ExecutionAlreadyExists(Exception):
+            pass
+
+    def __init__(self) -> None:
+        self.started: list[dict] = []
+
+    def start_execution(self, stateMachineArn, name, input):  # noqa: N803
+        self.started.append({"name": name, "input": json.loads(input)})
+
+
+@pytest.fixture
+def slack(monkeypatch):
+    monkeypatch.setattr(handler, "get_slack_signing_secret", lambda: SIGNING_SECRET)
+    monkeypatch.setattr(handler, "get_slack_bot_user_id", lambda: BOT_USER_ID)
+    monkeypatch.setattr(handler, "deduplicator", EventDeduplicator(ttl_seconds=60))
+    return monkeypatch
+
+
+@pytest.mark.parametrize(
+    "event, expected",
+    [
+        ({"source": "aws.events", "detail-type": "Scheduled Event"}, True),
+        ({"warmup": True}, True),
+        ({"warmup": False}, False),
+        ({"source": "aws.s3"}, False),
+        ({"body": "{}", "headers": {}}, False),
+    ],
+)
+def test_is_warmup_event(event, expected):
+    assert handler.is_warmup_event(event) is expected
+
+
+def test_warmup_event_short_circuits_before_signature_check(monkeypatch):
+    calls = []
+    monkeypatch.setattr(handler, "warm_up", lambda: calls.append("warm_up"))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("SSM must not be read for a warm-up event")
+
+    monkeypatch.setattr(handler, "get_slack_signing_secret", fail)
+
+    response = handler.lambda_handler({"source": "aws.events"}, None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"warmup": True}
+    assert calls == ["warm_up"]
+
+
+def test_warm_up_survives_ssm_errors(monkeypatch):
+    def fail():
+        raise RuntimeError("AccessDenied")
+
+    monkeypatch.setattr(handler, "get_slack_signing_secret", fail)
+
+    handler.warm_up()
+
+
+@pytest.fixture
+def dispatch_env(monkeypatch):
+    for name in ("DISPATCH_MODE", "PIPELINE_FUNCTION_NAME", "DISPATCH_QUEUE_URL"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("STEP_FUNCTION_ARN", STATE_MACHINE_ARN)
+    return monkeypatch
+
+
+@pytest.mark.parametrize(
+    "env, expected",
+    [
+        ({}, StepFunctionsDispatcher),
+        ({"DISPATCH_MODE": "queue", "DISPATCH_QUEUE_URL": "https://sqs/q"}, QueueDispatcher),
+        ({"DISPATCH_MODE": "direct", "PIPELINE_FUNCTION_NAME": "pipeline"}, LambdaDispatcher),
+    ],
+)
+def test_build_dispatcher_by_mode(dispatch_env, env, expected):
+    for name, value in env.items():
+        dispatch_env.setenv(name, value)
+
+    assert isinstance(handler._build_dispatcher(), expected)
+
+
+@pytest.mark.parametrize(
+    "env",
+    [
+        {"DISPATCH_MODE": "queue"},
+        {"DISPATCH_MODE": "direct"},
+        {"DISPATCH_MODE": "fanout"},
+    ],
+)
+def test_build_dispatcher_falls_back_to_sync_on_missing_config(dispatch_env, env):
+    for name, value in env.items():
+        dispatch_env.setenv(name, value)
+
+    assert isinstance(handler._build_dispatcher(), StepFunctionsDispatcher)
+
+
+def test_build_dispatcher_without_state_machine_dispatches_nothing(dispatch_env):
+    dispatch_env.delenv("STEP_FUNCTION_ARN")
+
+    assert handler._build_dispatcher() is None
+
+
+def test_queue_mode_acks_before_the_execution_starts(slack):
+    queue = InMemoryQueue()
+    sfn = RecordingStepFunctions()
+    slack.setattr(handler, "dispatcher", QueueDispatcher(queue, "https://sqs/dispatch"))
+    slack.setattr(handler, "sfn_client", sfn)
+    slack.setenv("STEP_FUNCTION_ARN", STATE_MACHINE_ARN)
+
+    response = handler.lambda_handler(signed_event("deploy please"), None)
+
+    assert response["statusCode"] == 200
+    assert sfn.started == []
+
+    drained = handler.lambda_handler({"Records": queue.receive_records()}, None)
+
+    assert drained == {"batchItemFailures": []}
+    assert [started["input"]["text"] for started in sfn.started] == ["deploy please"]
+
+
+def test_queue_drain_reports_failed_records(slack):
+    class FailingStepFunctions(RecordingStepFunctions):
+        def start_execution(self, stateMachineArn, name, input):  # noqa: N803
+            raise RuntimeError("ServiceUnavailable")
+
+    queue = InMemoryQueue()
+    slack.setattr(handler, "dispatcher", QueueDispatcher(queue, "https://sqs/dispatch"))
+    slack.setattr(handler, "sfn_client", FailingStepFunctions())
+    slack.setenv("STEP_FUNCTION_ARN", STATE_MACHINE_ARN)
+    handler.lambda_handler(signed_event(ts="1700000000.000100"), None)
+    handler.lambda_handler(signed_event(ts="1700000000.000200"), None)
+    records = queue.receive_records()
+
+    drained = handler.lambda_handler({"Records": records}, None)
+
+    assert drained == {
+        "batchItemFailures": [{"itemIdentifier": record["messageId"]} for record in records]
+    }
@@ -0,0 +1,135 @@
+"""log_utils.py のテスト"""
+
+import io
+import logging
+
+import pytest
+
+import log_utils
+from log_utils import (
+    LazyJson,
+    LazyText,
+    bind_correlation_ids,
+    clear_correlation_ids,
+    install,
+    truncate,
+)
+
+
+class CountingValue:
+    """JSON 化（default=str）された回数を数える値"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __str__(self) -> str:
+        self.calls += 1
+        return "value"
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger("test_log_utils")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    logger.addHandler(handler)
+    logger.stream = stream
+    clear_correlation_ids()
+    yield logger
+    logger.removeHandler(handler)
+    clear_correlation_ids()
+
+
+def test_truncate_keeps_short_text_and_caps_long_text():
+    assert truncate("short", max_chars=10) == "short"
+    assert truncate("x" * 25, max_chars=10) == "xxxxxxxxxx...(truncated, 25 chars)"
+
+
+def test_lazy_json_is_not_serialized_below_the_log_level(logger):
+    value = CountingValue()
+    logger.setLevel(logging.WARNING)
+
+    logger.info("Received event: %s", LazyJson({"payload": value}))
+
+    assert value.calls == 0
+    assert logger.stream.getvalue() == ""
+
+
+def test_lazy_json_is_serialized_when_emitted(logger):
+    value = CountingValue()
+
+    logger.info("Received event: %s", LazyJson({"payload": value}))
+
+    assert value.calls > 0
+    assert logger.stream.getvalue() == 'INFO Received event: {"payload": "value"}\n'
+
+
+def test_lazy_json_truncates_large_payloads():
+    rendered = str(LazyJson({"reply_text": "あ" * 5000}, max_chars=100))
+
+    assert rendered.startswith('{"reply_text": "ああ')
+    assert rendered.endswith("...(truncated, 5018 chars)")
+
+
+def test_lazy_text_truncates():
+    assert str(LazyText("x" * 50, max_chars=10)) == "xxxxxxxxxx...(truncated, 50 chars)"
+
+
+def test_sampled_out_payload_is_summarized(monkeypatch):
+    monkeypatch.setattr(log_utils.random, "random", lambda: 0.7)
+
+    assert str(LazyJson({"b": 1, "a": 2}, sample_rate=0.5)) == "<payload omitted: keys=['a', 'b']>"
+    assert str(LazyJson([1, 2], sample_rate=0.5)) == "<payload omitted: list>"
+    assert str(LazyJson({"a": 1}, sample_rate=0.8)) == '{"a": 1}'
+
+
+def test_correlation_ids_prefix_the_formatted_message(logger):
+    install(logger)
+    bind_correlation_ids(channel_id="C1", ts="1.0", execution="")
+
+    logger.info("Started %s", "execution")
+
+    assert logger.stream.getvalue() == "INFO [channel_id=C1 ts=1.0] Started execution\n"
+
+
+def test_record_is_not_rewritten_for_other_handlers(logger):
+    install(logger)
+    records = []
+
+    class Collector(logging.Handler):
+        def emit(self, record):
+            records.append(record)
+
+    collector = Collector()
+    logger.addHandler(collector)
+    try:
+        bind_correlation_ids(channel_id="C1")
+        logger.info("Started %s", "execution")
+    finally:
+        logger.removeHandler(collector)
+
+    assert records[0].getMessage() == "Started execution"
+    assert records[0].correlation_ids == {"channel_id": "C1"}
+
+
+def test_cleared_ids_are_not_prefixed(logger):
+    install(logger)
+    bind_correlation_ids(channel_id="C1")
+    clear_correlation_ids()
+
+    logger.info("Warm-up")
+
+    assert logger.stream.getvalue() == "INFO Warm-up\n"
+
+
+def test_install_is_idempotent(logger):
+    install(logger)
+    install(logger)
+    bind_correlation_ids(channel_id="C1")
+
+    logger.info("once")
+
+    assert logger.stream.getvalue() == "INFO [channel_id=C1] once\n"
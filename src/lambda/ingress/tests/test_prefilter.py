@@ -0,0 +1,92 @@
+"""prefilter.py のテスト"""
+
+import json
+
+from prefilter import classify_raw_body
+
+
+def body(event: dict, **payload) -> bytes:
+    return json.dumps({"type": "event_callback", "event_id": "Ev1", "event": event, **payload}).encode()
+
+
+def test_plain_user_message_is_not_skipped():
+    event = {"type": "message", "user": "U1", "text": "hello", "channel": "C1", "ts": "1.0"}
+
+    assert classify_raw_body(body(event)) is None
+
+
+def test_url_verification_is_not_classified():
+    assert classify_raw_body(b'{"type": "url_verification", "challenge": "x"}') is None
+
+
+def test_non_message_event_is_skipped():
+    event = {"type": "reaction_added", "user": "U1", "reaction": "+1"}
+
+    assert classify_raw_body(body(event)) == "non-message event"
+
+
+def test_top_level_subtype_is_skipped():
+    event = {"type": "message", "subtype": "message_changed", "channel": "C1", "message": {"text": "x"}}
+
+    assert classify_raw_body(body(event)) == "message with subtype"
+
+
+def test_top_level_bot_id_is_skipped():
+    event = {"type": "message", "bot_id": "B1", "text": "beep", "channel": "C1", "ts": "1.0"}
+
+    assert classify_raw_body(body(event)) == "bot message"
+
+
+def test_nested_file_subtype_falls_through_to_parse():
+    event = {
+        "type": "message",
+        "user": "U1",
+        "text": "see attached",
+        "files": [{"id": "F1", "subtype": "slack_image"}],
+    }
+
+    assert classify_raw_body(body(event)) is None
+
+
+def test_nested_attachment_bot_id_falls_through_to_parse():
+    event = {
+        "type": "message",
+        "user": "U1",
+        "text": "look at this",
+        "attachments": [{"bot_id": "B1", "text": "unfurled"}],
+    }
+
+    assert classify_raw_body(body(event)) is None
+
+
+def test_keys_after_nesting_fall_through_to_parse():
+    # 入れ子の後ろに置かれたトップレベルのキーは判定せずパースに回す
+    event = {"type": "message", "blocks": [{"type": "rich_text"}], "bot_id": "B1"}
+
+    assert classify_raw_body(body(event)) is None
+
+
+def test_escaped_keys_inside_text_are_ignored():
+    event = {"type": "message", "user": "U1", "text": '"subtype": "bot_message", "bot_id": "B1"'}
+
+    assert classify_raw_body(body(event)) is None
+
+
+def test_reaction_to_a_message_is_skipped():
+    event = {
+        "type": "reaction_added",
+        "user": "U1",
+        "reaction": "+1",
+        "item": {"type": "message", "channel": "C1", "ts": "1.0"},
+    }
+
+    assert classify_raw_body(body(event)) == "non-message event"
+
+
+def test_event_type_after_a_nested_object_falls_through_to_parse():
+    raw = (
+        b'{"type": "event_callback", "event": {"item": {"type": "message"}, '
+        b'"type": "reaction_added"}}'
+    )
+
+    assert classify_raw_body(raw) is None
@@ -0,0 +1,88 @@
+"""signature.py のテスト"""
+
+import hashlib
+import hmac
+
+from signature import SlackSignatureVerifier, parse_signing_secrets
+
+# Slack のドキュメントにある署名例
+DOC_SECRET = "8f742231b10e8888abcd99yyyzzz85a5"
+DOC_TIMESTAMP = "1531420618"
+DOC_BODY = (
+    b"token=xyzz0WbapA4vBCDEFasx0q6G&team_id=T1DC2JH3J&team_domain=testteamnow"
+    b"&channel_id=G8PSS9T3V&channel_name=foobar&user_id=U2CERLKJA&user_name=roadrunner"
+    b"&command=%2Fwebhook-collect&text=&response_url=https%3A%2F%2Fhooks.slack.com"
+    b"%2Fcommands%2FT1DC2JH3J%2F397700885554%2F96rGlfmibIGlgcZRskXaIFfN"
+    b"&trigger_id=398738663015.47445629121.803a0bc887a14d10d2c447fce8b6703c"
+)
+DOC_SIGNATURE = "v0=a2114d57b48eac39b9ad189dd8316235a7b4a8d21a10bd27519666489c69b503"
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    base = b"v0:" + timestamp.encode() + b":" + body
+    return "v0=" + hmac.new(secret.encode(), base, hashlib.sha256).hexdigest()
+
+
+def make_verifier(secrets: list[str], now: float = float(DOC_TIMESTAMP)) -> SlackSignatureVerifier:
+    return SlackSignatureVerifier(secrets, clock=FakeClock(now))
+
+
+def test_slack_documentation_vector():
+    assert make_verifier([DOC_SECRET]).verify(DOC_TIMESTAMP, DOC_BODY, DOC_SIGNATURE) is True
+
+
+def test_tampered_body_is_rejected():
+    assert make_verifier([DOC_SECRET]).verify(DOC_TIMESTAMP, DOC_BODY + b"&x=1", DOC_SIGNATURE) is False
+
+
+def test_wrong_secret_is_rejected():
+    signature = sign("another-secret", DOC_TIMESTAMP, DOC_BODY)
+
+    assert make_verifier([DOC_SECRET]).verify(DOC_TIMESTAMP, DOC_BODY, signature) is False
+
+
+def test_expired_timestamp_is_rejected():
+    verifier = make_verifier([DOC_SECRET], now=float(DOC_TIMESTAMP) + 301)
+
+    assert verifier.verify(DOC_TIMESTAMP, DOC_BODY, DOC_SIGNATURE) is False
+
+
+def test_timestamp_within_max_age_is_accepted():
+    verifier = make_verifier([DOC_SECRET], now=float(DOC_TIMESTAMP) + 299)
+
+    assert verifier.verify(DOC_TIMESTAMP, DOC_BODY, DOC_SIGNATURE) is True
+
+
+def test_malformed_timestamp_is_rejected():
+    signature = sign(DOC_SECRET, "not-a-number", DOC_BODY)
+
+    assert make_verifier([DOC_SECRET]).verify("not-a-number", DOC_BODY, signature) is False
+
+
+def test_signature_without_version_prefix_is_rejected():
+    digest = DOC_SIGNATURE.removeprefix("v0=")
+
+    assert make_verifier([DOC_SECRET]).verify(DOC_TIMESTAMP, DOC_BODY, digest) is False
+
+
+def test_key_rotation_accepts_old_and_new_secrets():
+    verifier = make_verifier(parse_signing_secrets("old-secret, new-secret"))
+
+    for secret in ("old-secret", "new-secret"):
+        signature = sign(secret, DOC_TIMESTAMP, DOC_BODY)
+        assert verifier.verify(DOC_TIMESTAMP, DOC_BODY, signature) is True
+
+    retired = sign("retired-secret", DOC_TIMESTAMP, DOC_BODY)
+    assert verifier.verify(DOC_TIMESTAMP, DOC_BODY, retired) is False
+
+
+def test_parse_signing_secrets_skips_blanks():
+    assert parse_signing_secrets(" a ,, b ,") == ["a", "b"]
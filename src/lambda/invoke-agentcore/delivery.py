@@ -0,0 +1,214 @@
+"""返信の Slack 配信
+
+agentResult をパースし、should_reply / reply_mode / reply_text に応じて Slack に投稿する。
+ストリーミング表示済みのメッセージ（streamed_ts）は最終テキストで更新する。
+
+post-to-slack Lambda（Step Functions 経由）と invoke-agentcore の pipeline_handler
+（Step Functions を経由しない直接実行）で共有するため、両方に同じ内容のファイルを配置している。
+"""
+
+import json
+import logging
+import time
+from typing import Any
+
+from slack_sdk.errors import SlackApiError
+
+from log_utils import LazyText
+from posting import ChannelRateLimiter, SlackPoster
+from result_store import load_reply_text
+from slack_client import get_slack_client
+from ssm_params import get_slack_bot_token
+
+logger = logging.getLogger()
+
+# チャンネルごとの投稿レート（コンテナ単位で共有）
+rate_limiter = ChannelRateLimiter()
+
+_poster: SlackPoster | None = None
+
+
+def get_poster(slack_client: Any) -> SlackPoster:
+    """コンテナ単位で共有する SlackPoster を取得（クライアントが変わった場合のみ再構築）
+
+    投稿間隔のトークンバケットと ratelimited の待機状態を呼び出しをまたいで引き継ぐ。
+    """
+    global _poster
+    if _poster is None or _poster.client is not slack_client:
+        _poster = SlackPoster(slack_client, rate_limiter)
+    return _poster
+
+
+def parse_agent_result(agent_result: dict[str, Any] | str) -> dict[str, Any]:
+    """AgentCore の結果をパース"""
+    if isinstance(agent_result, str):
+        try:
+            return json.loads(agent_result)
+        except json.JSONDecodeError:
+            logger.warning(
+                "Failed to parse agent_result as JSON: %s", LazyText(agent_result)
+            )
+            return {
+                "should_reply": True,
+                "reply_mode": "thread",
+                "reply_text": agent_result,
+            }
+    return agent_result
+
+
+def deliver_reply(event: dict[str, Any], deadline: float | None = None) -> dict[str, Any]:
+    """agentResult に従って Slack に投稿
+
+    Args:
+        event: agentResult を含む正規化イベント
+        deadline: time.monotonic 基準の投稿待機の期限
+
+    Returns:
+        dict: statusCode と body（JSON 文字列）
+    """
+    # イベントから必要な情報を取得
+    channel_id = event.get("channel_id", "")
+    thread_ts = event.get("thread_ts", "")
+    agent_result = event.get("agentResult", {})
+
+    # AgentCore の結果をパース
+    result = parse_agent_result(agent_result)
+
+    should_reply = result.get("should_reply", False)
+    reply_mode = result.get("reply_mode", "thread")
+    reason = result.get("reason", "")
+
+    # 退避された返信テキストは返信する場合のみ取得
+    reply_text = ""
+    if should_reply:
+        try:
+            reply_text = load_reply_text(result)
+        except Exception as e:
+            logger.error(f"Failed to load offloaded reply_text: {e}")
+            return {
+                "statusCode": 500,
+                "body": json.dumps({"posted": False, "error": "reply_text_unavailable"}),
+            }
+
+    logger.info(
+        f"Agent result: should_reply={should_reply}, "
+        f"reply_mode={reply_mode}, reason={reason}"
+    )
+
+    # ストリーミングで途中経過を表示済みの場合は、そのメッセージを最終テキストにする
+    streamed_ts = result.get("streamed_ts")
+    if streamed_ts:
+        return _finalize_streamed_reply(
+            channel_id,
+            streamed_ts,
+            reply_text if should_reply else "",
+            thread_ts=thread_ts if reply_mode == "thread" else None,
+        )
+
+    # 返信不要の場合は何もしない
+    if not should_reply:
+        logger.info("should_reply is False, skipping Slack post")
+        return {
+            "statusCode": 200,
+            "body": json.dumps({"posted": False, "reason": reason}),
+        }
+
+    # 返信テキストがない場合はスキップ
+    if not reply_text:
+        logger.warning("reply_text is empty, skipping Slack post")
+        return {
+            "statusCode": 200,
+            "body": json.dumps({"posted": False, "reason": "empty reply_text"}),
+        }
+
+    # Slack クライアントを取得（SSM から動的に取得したトークンでキャッシュ）
+    bot_token = get_slack_bot_token()
+    slack_client = get_slack_client(bot_token)
+
+    # チャンネルごとのレート制限を考慮して投稿
+    poster = get_poster(slack_client)
+    reply_thread_ts = thread_ts if reply_mode == "thread" and thread_ts else None
+    poster.submit(channel_id, reply_text, thread_ts=reply_thread_ts)
+    post_result = next(
+        r
+        for r in poster.flush(deadline=deadline)
+        if r.channel == channel_id and r.thread_ts == reply_thread_ts
+    )
+
+    if not post_result.posted:
+        return {
+            "statusCode": 500,
+            "body": json.dumps(
+                {
+                    "posted": False,
+                    "error": post_result.error,
+                }
+            ),
+        }
+
+    logger.info(f"Posted message to Slack: {post_result.ts}")
+
+    return {
+        "statusCode": 200,
+        "body": json.dumps(
+            {
+                "posted": True,
+                "channel": channel_id,
+                "ts": post_result.ts,
+                "thread_ts": thread_ts if reply_mode == "thread" else None,
+            }
+        ),
+    }
+
+
+def _finalize_streamed_reply(
+    channel_id: str,
+    streamed_ts: str,
+    reply_text: str,
+    thread_ts: str | None,
+) -> dict[str, Any]:
+    """ストリーミング表示したメッセージを最終テキストで更新（返信なしなら削除）"""
+    slack_client = get_slack_client(get_slack_bot_token())
+
+    try:
+        if not reply_text:
+            slack_client.chat_delete(channel=channel_id, ts=streamed_ts)
+            logger.info(f"Deleted streaming placeholder: {streamed_ts}")
+            return {
+                "statusCode": 200,
+                "body": json.dumps({"posted": False, "reason": "empty streamed reply"}),
+            }
+
+        slack_client.chat_update(channel=channel_id, ts=streamed_ts, text=reply_text)
+        logger.info(f"Finalized streamed message: {streamed_ts}")
+
+    except SlackApiError as e:
+        logger.error(f"Slack API error: {e.response['error']}")
+        return {
+            "statusCode": 500,
+            "body": json.dumps(
+                {
+                    "posted": False,
+                    "error": e.response["error"],
+                }
+            ),
+        }
+
+    return {
+        "statusCode": 200,
+        "body": json.dumps(
+            {
+                "posted": True,
+                "channel": channel_id,
+                "ts": streamed_ts,
+                "thread_ts": thread_ts,
+            }
+        ),
+    }
+
+
+def posting_deadline(context: Any) -> float | None:
+    """Lambda の残り時間から投稿待機の期限を算出（終了処理用に 1 秒残す）"""
+    if context is None or not hasattr(context, "get_remaining_time_in_millis"):
+        return None
+    return time.monotonic() + context.get_remaining_time_in_millis() / 1000 - 1.0
@@ -4,18 +4,92 @@ AgentCore Runtime Invoker Lambda
 Step FunctionsからAgentCore Runtime APIを呼び出すラッパー。
 Step Functions SDK統合がbedrockagentcoreruntimeサービスを
 サポートしていないため、Lambda経由で呼び出す。
+
+STREAM_REPLIES=true の場合は AgentCore にストリーミングを要求し、
+生成中の返信テキストを Slack に逐次表示する。
+
+pipeline_handler は Step Functions を経由せず、AgentCore 呼び出しから
+Slack 投稿までを 1 回の実行で行う（Ingress の DISPATCH_MODE=direct から非同期実行される）。
 """
 
 import json
 import logging
 import os
-from typing import Any
+import time
+from functools import lru_cache
+from typing import Any, Callable
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from delivery import deliver_reply, posting_deadline
+from log_utils import LazyJson, bind_correlation_ids, install
+from resilience import CircuitOpenError, call_with_retry, get_circuit_breaker
+from result_store import get_result_store, offload_reply_text
+from session_ids import build_runtime_session_id, resolve_strategy
+from slack_client import get_slack_client
+from sse import iter_events
+from ssm_params import get_slack_bot_token
+from streaming import StreamingReplyWriter
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
+install(logger)
+
+# 返信生成中の途中経過を Slack に表示するか
+STREAM_REPLIES = os.environ.get("STREAM_REPLIES", "false").lower() == "true"
+
+# AgentCore のストリーミングイベント種別（最終結果以外）
+STREAM_EVENT_TYPES = {"route", "reply_delta"}
+
+# 大きな返信テキストの退避先（RESULT_BUCKET_NAME / RESULT_STORE_DIR 未設定時は退避しない）
+result_store = get_result_store()
+
+# SSE の読み取りチャンクサイズ
+SSE_CHUNK_SIZE = int(os.environ.get("SSE_CHUNK_SIZE", str(64 * 1024)))
+
+# AgentCore の応答待ちの上限秒数と、期限算出時に後続処理（退避・投稿）用に残す秒数
+AGENT_READ_TIMEOUT_SECONDS = int(os.environ.get("AGENT_READ_TIMEOUT_SECONDS", "120"))
+AGENT_DEADLINE_RESERVE_SECONDS = float(os.environ.get("AGENT_DEADLINE_RESERVE_SECONDS", "5"))
+
+# 期限から算出した応答待ちの上限はこの段階に切り下げる（クライアントは段階ごとに 1 つ）
+READ_TIMEOUT_STEPS = (1, 2, 5, 10, 15, 20, 30, 45, 60, 90)
+
+
+@lru_cache(maxsize=len(READ_TIMEOUT_STEPS) + 1)
+def get_agent_client(read_timeout: int) -> Any:
+    """応答待ちの上限秒数ごとの AgentCore クライアント（コンテナ単位で共有）
+
+    read_timeout は agent_read_timeout の値（READ_TIMEOUT_STEPS か AGENT_READ_TIMEOUT_SECONDS）
+    のため、期限が呼び出しごとに異なってもクライアントは作り直されない。
+    再試行は resilience で行うため SDK の再試行は無効化する。
+    """
+    return boto3.client(
+        "bedrock-agentcore",
+        config=Config(
+            read_timeout=read_timeout,
+            retries={"total_max_attempts": 1},
+        ),
+    )
+
+
+def agent_read_timeout(deadline: float | None) -> int:
+    """期限（time.monotonic 基準）までの残り秒数から応答待ちの上限を算出
+
+    Lambda がタイムアウトで強制終了される前に応答待ちを打ち切り、
+    後続処理（退避・投稿）を行えるようにする。
+    残り秒数は READ_TIMEOUT_STEPS の段階に切り下げる（1 秒未満でも 1 秒）。
+    """
+    if deadline is None:
+        return AGENT_READ_TIMEOUT_SECONDS
+    remaining = deadline - time.monotonic()
+    if remaining >= AGENT_READ_TIMEOUT_SECONDS:
+        return AGENT_READ_TIMEOUT_SECONDS
+    return max(
+        (step for step in READ_TIMEOUT_STEPS if step <= remaining),
+        default=READ_TIMEOUT_STEPS[0],
+    )
 
 
 def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
@@ -32,23 +106,98 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
         "is_mentioned": true,
         "is_dm": false,
         "channel_kind": "public",
-        "ts": "..."
+        "ts": "...",
+        "deadline_ms": 1700000000000
     }
 
     出力:
     元のeventに agentResult を追加した形式
+    （ストリーミング時は agentResult.streamed_ts に途中経過を表示したメッセージの ts）
     """
-    logger.info(f"Received event: {json.dumps(event)}")
+    _bind_event(event)
+
+    agent_result = invoke_agent(event, context)
+
+    # Step Functions のペイロード上限を超えないよう大きな返信テキストは退避
+    # （ステートのサイズは退避の判定時に算出してログ出力する）
+    if result_store is not None:
+        agent_result = offload_reply_text(event, agent_result, result_store)
+
+    # 元のeventにagentResultを追加して返す
+    result = {**event, "agentResult": agent_result}
+    logger.info("Returning result: %s", LazyJson(result))
+    return result
+
+
+def pipeline_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """
+    AgentCore の呼び出しと Slack への投稿を 1 回の実行で行う（Step Functions を経由しない）。
+
+    入力は lambda_handler と同じ正規化イベント。
+    ステートマシンを経由しないため返信テキストの退避は行わない。
+
+    出力:
+    post-to-slack と同じ形式（statusCode と body）
+    """
+    _bind_event(event)
+
+    agent_result = invoke_agent(event, context)
+    return deliver_reply(
+        {**event, "agentResult": agent_result},
+        deadline=posting_deadline(context),
+    )
 
+
+def _bind_event(event: dict[str, Any]) -> None:
+    """相関 ID を設定してイベントをログ出力"""
+    bind_correlation_ids(
+        channel_id=event.get("channel_id"),
+        ts=event.get("ts"),
+        execution=f"{event.get('channel_id', '')}-{event.get('ts', '').replace('.', '-')}",
+    )
+    logger.info("Received event: %s", LazyJson(event))
+
+
+def _effective_deadline_ms(event: dict[str, Any], context: Any) -> int | None:
+    """イベントの期限と Lambda の残り時間（後続処理分を除く）の早い方をエポックミリ秒で返す"""
+    candidates = []
+    if event.get("deadline_ms"):
+        candidates.append(int(event["deadline_ms"]))
+    if context is not None and hasattr(context, "get_remaining_time_in_millis"):
+        candidates.append(
+            int(time.time() * 1000)
+            + context.get_remaining_time_in_millis()
+            - int(AGENT_DEADLINE_RESERVE_SECONDS * 1000)
+        )
+    return min(candidates) if candidates else None
+
+
+def invoke_agent(event: dict[str, Any], context: Any = None) -> dict[str, Any]:
+    """AgentCore Runtime を呼び出して agentResult を返す（失敗時は should_reply=False）
+
+    Args:
+        event: 正規化イベント
+        context: Lambda コンテキスト（残り時間を期限の算出に使用）
+    """
     agent_runtime_arn = os.environ["AGENT_RUNTIME_ARN"]
 
-    # AgentCoreクライアント初期化
-    client = boto3.client("bedrock-agentcore")
+    # 期限をエージェントに伝播し、再試行もこの期限内に収める
+    deadline_ms = _effective_deadline_ms(event, context)
+    deadline = (
+        time.monotonic() + (deadline_ms - time.time() * 1000) / 1000
+        if deadline_ms is not None
+        else None
+    )
+
+    # セッションの共有単位（SESSION_AFFINITY）。channel の場合のみ Runtime 側で Agent を使い回す
+    strategy = resolve_strategy(event.get("team_id") or "default")
 
     # ペイロード構築（AgentCore handlerが期待する形式）
     payload = {
         "prompt": event.get("text", ""),
         "metadata": {
+            "deadline_ms": deadline_ms,
+            "session_affinity": strategy,
             "slack": {
                 "team_id": event.get("team_id"),
                 "channel_id": event.get("channel_id"),
@@ -62,19 +211,44 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
         },
     }
 
-    # セッションIDを構築（最小33文字が必要）
-    session_id = f"{event.get('team_id', 'default')}-{event.get('channel_id', 'channel')}-{event.get('thread_ts', 'session')}"
+    # ストリーミング時は途中経過を Slack に表示しながら受信する
+    writer = None
+    if STREAM_REPLIES:
+        payload["stream"] = True
+        writer = StreamingReplyWriter(
+            get_slack_client(get_slack_bot_token()),
+            channel_id=event.get("channel_id", ""),
+            thread_ts=event.get("thread_ts", ""),
+        )
+
+    # セッションIDを構築（SESSION_AFFINITY に応じてスレッド単位またはチャンネル単位）
+    session_id = build_runtime_session_id(event, strategy)
 
     try:
-        # AgentCore Runtime呼び出し
-        response = client.invoke_agent_runtime(
-            agentRuntimeArn=agent_runtime_arn,
-            runtimeSessionId=session_id,
-            payload=json.dumps(payload).encode(),
+        # AgentCore Runtime呼び出し（一時的なエラーは期限内で再試行）
+        body = json.dumps(payload).encode()
+        response = call_with_retry(
+            lambda: get_agent_client(agent_read_timeout(deadline)).invoke_agent_runtime(
+                agentRuntimeArn=agent_runtime_arn,
+                runtimeSessionId=session_id,
+                payload=body,
+            ),
+            breaker=get_circuit_breaker(agent_runtime_arn),
+            deadline=deadline,
         )
 
         # レスポンス処理
-        agent_result = _process_response(response)
+        agent_result = _process_response(
+            response,
+            on_event=writer.handle if writer else None,
+        )
+
+    except CircuitOpenError:
+        logger.error("AgentCore circuit is open, skipping invocation")
+        agent_result = {
+            "should_reply": False,
+            "reason": "AgentCore circuit open",
+        }
 
     except ClientError as e:
         error_code = e.response["Error"]["Code"]
@@ -93,27 +267,39 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
             "reason": f"Unexpected error: {type(e).__name__}",
         }
 
-    # 元のeventにagentResultを追加して返す
-    result = {**event, "agentResult": agent_result}
-    logger.info(f"Returning result: {json.dumps(result)}")
-    return result
+    # プレースホルダーを投稿済みなら post-to-slack で更新（または削除）する
+    if writer and writer.ts:
+        agent_result["streamed_ts"] = writer.ts
 
+    return agent_result
 
-def _process_response(response: dict[str, Any]) -> dict[str, Any]:
-    """AgentCore Runtimeのレスポンスを処理"""
+
+def _process_response(
+    response: dict[str, Any],
+    on_event: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """AgentCore Runtimeのレスポンスを処理
+
+    Args:
+        response: invoke_agent_runtime のレスポンス
+        on_event: 指定時はストリーミングイベント（route / reply_delta）を逐次渡す
+    """
     content_type = response.get("contentType", "")
     logger.info(f"Response content type: {content_type}")
 
     if "text/event-stream" in content_type:
-        # ストリーミングレスポンスを処理
-        content = []
-        for line in response["response"].iter_lines(chunk_size=10):
-            if line:
-                line_str = line.decode("utf-8")
-                if line_str.startswith("data: "):
-                    content.append(line_str[6:])
-
-        # 最後のチャンクがJSON結果であることを期待
+        # ストリーミングレスポンスを処理（JSON 以外の応答はテキスト全体を返すためすべて保持）
+        content: list[str] = []
+        chunks = response["response"].iter_chunks(chunk_size=SSE_CHUNK_SIZE)
+        for sse_event in iter_events(chunks):
+            if on_event is not None:
+                stream_event = _parse_stream_event(sse_event.data)
+                if stream_event is not None:
+                    on_event(stream_event)
+                    continue
+            content.append(sse_event.data)
+
+        # 最後のイベントがJSON結果であることを期待
         if content:
             try:
                 return json.loads(content[-1])
@@ -128,6 +314,12 @@ def _process_response(response: dict[str, Any]) -> dict[str, Any]:
                     "reason": "Non-JSON streaming response",
                 }
 
+        logger.warning("Empty streaming response")
+        return {
+            "should_reply": False,
+            "reason": "Empty streaming response",
+        }
+
     elif content_type == "application/json":
         # 標準JSONレスポンス
         chunks = []
@@ -144,3 +336,16 @@ def _process_response(response: dict[str, Any]) -> dict[str, Any]:
             "should_reply": False,
             "reason": f"Unknown response format: {content_type}",
         }
+
+
+def _parse_stream_event(data: str) -> dict[str, Any] | None:
+    """data 行がストリーミングイベントならパースして返す（最終結果などは None）"""
+    if not data.startswith('{"type"'):
+        return None
+    try:
+        parsed = json.loads(data)
+    except json.JSONDecodeError:
+        return None
+    if isinstance(parsed, dict) and parsed.get("type") in STREAM_EVENT_TYPES:
+        return parsed
+    return None
@@ -0,0 +1,220 @@
+"""Slack 投稿エンジン
+
+chat.postMessage のレート制限（チャンネルごとに概ね 1 秒 1 件）を考慮して投稿する。
+
+- チャンネルごとのトークンバケットで投稿間隔を制御
+- 投稿待ちのバックログを持ち、ratelimited は Retry-After に従って再スケジュール
+
+同じスレッドへの連投は Ingress のドレイナー（BATCH_WINDOW_MS）で 1 回の実行にまとめるため、
+ここでは返信をまとめない（Lambda のコンテナは同時に 1 件しか処理せず、
+バックログに同じスレッド宛ての返信が複数入ることはない）。
+
+環境変数:
+    SLACK_POSTS_PER_SECOND: チャンネルごとの投稿レート（デフォルト: 1.0）
+    SLACK_RATE_LIMIT_RETRIES: ratelimited 時の最大再試行回数（デフォルト: 2）
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from slack_sdk.errors import SlackApiError
+
+logger = logging.getLogger()
+
+SLACK_POSTS_PER_SECOND = float(os.environ.get("SLACK_POSTS_PER_SECOND", "1.0"))
+SLACK_RATE_LIMIT_RETRIES = int(os.environ.get("SLACK_RATE_LIMIT_RETRIES", "2"))
+
+class TokenBucket:
+    """投稿間隔を制御するトークンバケット"""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self._capacity,
+            self._tokens + (now - self._updated_at) * self._rate,
+        )
+        self._updated_at = now
+
+    def wait_time(self) -> float:
+        """トークンを取得できるまでの秒数（取得可能なら 0）"""
+        self._refill()
+        if self._tokens >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens) / self._rate
+
+    def consume(self) -> None:
+        """トークンを 1 つ消費"""
+        self._refill()
+        self._tokens -= 1.0
+
+    def penalize(self, seconds: float) -> None:
+        """Retry-After の間はトークンを取得できないようにする"""
+        self._refill()
+        self._tokens = min(self._tokens, 1.0 - seconds * self._rate)
+
+
+class ChannelRateLimiter:
+    """チャンネルごとのトークンバケット（コンテナ単位で共有）"""
+
+    def __init__(
+        self,
+        rate: float = SLACK_POSTS_PER_SECOND,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._rate = rate
+        self._clock = clock
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, channel_id: str) -> TokenBucket:
+        bucket = self._buckets.get(channel_id)
+        if bucket is None:
+            bucket = TokenBucket(self._rate, clock=self._clock)
+            self._buckets[channel_id] = bucket
+        return bucket
+
+
+@dataclass
+class PendingReply:
+    """投稿待ちの返信"""
+
+    channel_id: str
+    text: str
+    thread_ts: str | None = None
+    attempts: int = 0
+    not_before: float = 0.0
+
+
+@dataclass
+class PostResult:
+    """投稿結果"""
+
+    posted: bool
+    channel: str
+    thread_ts: str | None = None
+    ts: str | None = None
+    error: str | None = None
+
+
+class SlackPoster:
+    """レート制限を考慮した Slack 投稿エンジン"""
+
+    def __init__(
+        self,
+        client: Any,
+        rate_limiter: ChannelRateLimiter,
+        max_retries: int = SLACK_RATE_LIMIT_RETRIES,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._client = client
+        self._rate_limiter = rate_limiter
+        self._max_retries = max_retries
+        self._clock = clock
+        self._sleep = sleep
+        self._backlog: list[PendingReply] = []
+
+    @property
+    def client(self) -> Any:
+        return self._client
+
+    def submit(self, channel_id: str, text: str, thread_ts: str | None = None) -> None:
+        """返信をバックログに追加"""
+        self._backlog.append(PendingReply(channel_id=channel_id, text=text, thread_ts=thread_ts))
+
+    def flush(self, deadline: float | None = None) -> list[PostResult]:
+        """バックログをすべて投稿
+
+        Args:
+            deadline: clock 基準の期限。これを過ぎる待機が必要な投稿は失敗として返す
+
+        Returns:
+            list[PostResult]: 投稿ごとの結果
+        """
+        results: list[PostResult] = []
+
+        while self._backlog:
+            # 最も早く投稿できる返信を選ぶ
+            now = self._clock()
+            pending, wait = min(
+                (
+                    (
+                        p,
+                        max(
+                            p.not_before - now,
+                            self._rate_limiter.bucket(p.channel_id).wait_time(),
+                        ),
+                    )
+                    for p in self._backlog
+                ),
+                key=lambda item: item[1],
+            )
+
+            if wait > 0:
+                if deadline is not None and now + wait > deadline:
+                    self._backlog.remove(pending)
+                    results.append(self._failed(pending, "ratelimited"))
+                    continue
+                self._sleep(wait)
+                continue
+
+            self._backlog.remove(pending)
+            self._rate_limiter.bucket(pending.channel_id).consume()
+            result = self._post(pending)
+            if result is not None:
+                results.append(result)
+
+        return results
+
+    def _post(self, pending: PendingReply) -> PostResult | None:
+        """投稿（ratelimited で再スケジュールした場合は None）"""
+        kwargs: dict[str, Any] = {"channel": pending.channel_id, "text": pending.text}
+        if pending.thread_ts:
+            kwargs["thread_ts"] = pending.thread_ts
+
+        try:
+            response = self._client.chat_postMessage(**kwargs)
+        except SlackApiError as e:
+            error = e.response["error"]
+            if error == "ratelimited" and pending.attempts < self._max_retries:
+                retry_after = float(e.response.headers.get("Retry-After", 1))
+                logger.warning(
+                    f"Rate limited on {pending.channel_id}, retrying after {retry_after}s"
+                )
+                self._rate_limiter.bucket(pending.channel_id).penalize(retry_after)
+                pending.attempts += 1
+                pending.not_before = self._clock() + retry_after
+                self._backlog.append(pending)
+                return None
+            logger.error(f"Slack API error: {error}")
+            return self._failed(pending, error)
+
+        return PostResult(
+            posted=True,
+            channel=pending.channel_id,
+            thread_ts=pending.thread_ts,
+            ts=response["ts"],
+        )
+
+    @staticmethod
+    def _failed(pending: PendingReply, error: str) -> PostResult:
+        return PostResult(
+            posted=False,
+            channel=pending.channel_id,
+            thread_ts=pending.thread_ts,
+            error=error,
+        )
@@ -0,0 +1,205 @@
+"""AgentCore 呼び出しのリトライとサーキットブレーカー
+
+- スロットリングや一時的な 5xx はジッター付き指数バックオフで再試行
+- 応答待ちのタイムアウトはエージェントが処理を続けている可能性があるため再試行しない
+  （AgentCore の呼び出しは冪等ではなく、再試行すると二重に返信しうる）
+- 失敗が続く AgentCore Runtime にはサーキットブレーカーで即座に見切りをつける
+- Lambda の残り時間から算出した期限を超える待機はしない
+
+環境変数:
+    AGENT_MAX_ATTEMPTS: 最大試行回数（デフォルト: 3）
+    AGENT_RETRY_BASE_DELAY_SECONDS: バックオフの基準秒数（デフォルト: 0.2）
+    AGENT_RETRY_MAX_DELAY_SECONDS: バックオフの上限秒数（デフォルト: 2.0）
+    AGENT_CIRCUIT_FAILURE_THRESHOLD: サーキットを開く連続失敗回数（デフォルト: 5）
+    AGENT_CIRCUIT_RESET_SECONDS: サーキットを開いてから試行を再開するまでの秒数（デフォルト: 30）
+"""
+
+import logging
+import os
+import random
+import time
+from typing import Callable, TypeVar
+
+from botocore.exceptions import ClientError, ConnectionError, ReadTimeoutError
+
+logger = logging.getLogger()
+
+AGENT_MAX_ATTEMPTS = int(os.environ.get("AGENT_MAX_ATTEMPTS", "3"))
+AGENT_RETRY_BASE_DELAY_SECONDS = float(os.environ.get("AGENT_RETRY_BASE_DELAY_SECONDS", "0.2"))
+AGENT_RETRY_MAX_DELAY_SECONDS = float(os.environ.get("AGENT_RETRY_MAX_DELAY_SECONDS", "2.0"))
+AGENT_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("AGENT_CIRCUIT_FAILURE_THRESHOLD", "5"))
+AGENT_CIRCUIT_RESET_SECONDS = float(os.environ.get("AGENT_CIRCUIT_RESET_SECONDS", "30"))
+
+# 再試行で回復が見込めるエラーコード
+RETRYABLE_ERROR_CODES = {
+    "ThrottlingException",
+    "Throttling",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "InternalServerException",
+    "InternalFailure",
+}
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """サーキットが開いているため呼び出しを行わなかった"""
+
+
+def is_retryable(error: Exception) -> bool:
+    """再試行で回復が見込めるエラーかどうか（呼び出しが処理されていないと分かるもののみ）"""
+    if isinstance(error, ReadTimeoutError):
+        return False
+    if isinstance(error, ConnectionError):
+        return True
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code", "")
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        return code in RETRYABLE_ERROR_CODES or status == 429 or status >= 500
+    return False
+
+
+def is_failure(error: Exception) -> bool:
+    """呼び出し先の障害としてサーキットの判定に含めるエラーかどうか"""
+    return isinstance(error, ReadTimeoutError) or is_retryable(error)
+
+
+class CircuitBreaker:
+    """連続失敗でサーキットを開き、一定時間後に 1 件だけ試行を許可する
+
+    - closed: 通常どおり呼び出す
+    - open: reset_seconds の間は呼び出さずに失敗させる
+    - half_open: 試行 1 件の成否で closed / open に戻す
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = AGENT_CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds: float = AGENT_CIRCUIT_RESET_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self._reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """呼び出してよいか（half_open では試行中の 1 件のみ許可）"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """成否を判定できなかった試行の枠を返す（状態は変えない）"""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self._failure_threshold:
+            if self._opened_at is None or self._trial_in_flight:
+                logger.warning(f"Circuit opened after {self._failures} consecutive failures")
+            self._opened_at = self._clock()
+        self._trial_in_flight = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(key: str) -> CircuitBreaker:
+    """キー（Runtime ARN）ごとのサーキットブレーカーを取得（コンテナ単位で共有）"""
+    breaker = _breakers.get(key)
+    if breaker is None:
+        breaker = CircuitBreaker()
+        _breakers[key] = breaker
+    return breaker
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float = AGENT_RETRY_BASE_DELAY_SECONDS,
+    max_delay: float = AGENT_RETRY_MAX_DELAY_SECONDS,
+    rng: Callable[[], float] = random.random,
+) -> float:
+    """attempt 回目の失敗後の待機秒数（フルジッター付き指数バックオフ）"""
+    return rng() * min(max_delay, base_delay * (2 ** (attempt - 1)))
+
+
+def call_with_retry(
+    func: Callable[[], T],
+    breaker: CircuitBreaker,
+    deadline: float | None = None,
+    max_attempts: int = AGENT_MAX_ATTEMPTS,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+    rng: Callable[[], float] = random.random,
+) -> T:
+    """リトライとサーキットブレーカーを適用して func を呼び出す
+
+    Args:
+        func: 呼び出す関数
+        breaker: 呼び出し先のサーキットブレーカー
+        deadline: clock 基準の期限。これを過ぎる待機が必要な場合は再試行しない
+        max_attempts: 最大試行回数
+
+    Raises:
+        CircuitOpenError: サーキットが開いている
+        Exception: 再試行しないエラー、または再試行を使い切ったエラー
+    """
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError("AgentCore circuit is open")
+
+        attempt += 1
+        try:
+            result = func()
+        except Exception as e:
+            if not is_failure(e):
+                # 呼び出し側の不備などはサーキットの判定に含めない（half_open を閉じない）
+                breaker.release()
+                raise
+            breaker.record_failure()
+            if not is_retryable(e):
+                raise
+
+            # 試行回数を使い切った場合やサーキットが開いた場合は待たずに諦める
+            delay = backoff_delay(attempt, rng=rng)
+            if attempt >= max_attempts or breaker.state != "closed":
+                raise
+            if deadline is not None and clock() + delay > deadline:
+                logger.warning(f"Not retrying, deadline reached: {_describe(e)}")
+                raise
+            logger.warning(
+                f"Retryable error on attempt {attempt}: {_describe(e)}, retrying after {delay:.2f}s"
+            )
+            sleep(delay)
+            continue
+
+        breaker.record_success()
+        return result
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, ClientError):
+        return error.response.get("Error", {}).get("Code", type(error).__name__)
+    return type(error).__name__
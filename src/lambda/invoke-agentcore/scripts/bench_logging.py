@@ -0,0 +1,97 @@
+"""ペイロードのログ出力の CPU 時間ベンチマーク
+
+invoke-agentcore の「Received event」「Returning result」のログを、
+従来の f-string（json.dumps を常に実行）と LazyJson（出力時のみ JSON 化・切り詰め）で
+それぞれ出力し、1 呼び出しあたりの CPU 時間（time.process_time）を比較する。
+
+- INFO: ログが出力される場合（LazyJson は LOG_MAX_FIELD_CHARS で切り詰める）
+- WARNING: ログレベルで捨てられる場合（LazyJson はシリアライズしない）
+
+ログの出力先は /dev/null（Lambda ランタイムと同じく相関 ID のフォーマッターを設定）。
+
+Usage (src/lambda/invoke-agentcore で実行)::
+
+    uv run python scripts/bench_logging.py --reply-kb 200 --iterations 2000
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from log_utils import LazyJson, bind_correlation_ids, install  # noqa: E402
+
+logger = logging.getLogger("bench_logging")
+
+
+def payloads(reply_kb: int) -> tuple[dict, dict]:
+    """Step Functions から届くイベントと、返却する結果"""
+    event = {
+        "channel_id": "C_BENCH",
+        "ts": "1700000000.000100",
+        "thread_ts": "1700000000.000100",
+        "text": "デプロイ手順を教えて",
+        "user_id": "U_USER",
+        "is_mentioned": True,
+        "thread_history": [
+            {"user": "U_USER", "text": "staging の確認お願いします " * 20, "ts": f"1700000000.{n:06d}"}
+            for n in range(20)
+        ],
+    }
+    result = {
+        "should_reply": True,
+        "reply_text": "手順は次のとおりです。" * (reply_kb * 1024 // 30),
+        "channel_id": "C_BENCH",
+        "thread_ts": "1700000000.000100",
+    }
+    return event, result
+
+
+def eager(event: dict, result: dict) -> None:
+    logger.info(f"Received event: {json.dumps(event)}")
+    logger.info(f"Returning result: {json.dumps(result)}")
+
+
+def lazy(event: dict, result: dict) -> None:
+    logger.info("Received event: %s", LazyJson(event))
+    logger.info("Returning result: %s", LazyJson(result))
+
+
+def measure(log, event: dict, result: dict, iterations: int) -> float:
+    started = time.process_time()
+    for _ in range(iterations):
+        log(event, result)
+    return (time.process_time() - started) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reply-kb", type=int, default=200, help="返信テキストのサイズ（KB）")
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    logger.propagate = False
+    logger.addHandler(logging.StreamHandler(open(os.devnull, "w")))
+    install(logger)
+    bind_correlation_ids(channel_id="C_BENCH", ts="1700000000.000100")
+
+    event, result = payloads(args.reply_kb)
+    size = len(json.dumps(event)) + len(json.dumps(result))
+    print(f"payload: {size / 1024:.0f} KB per invocation (2 log lines)")
+    for level in (logging.INFO, logging.WARNING):
+        logger.setLevel(level)
+        baseline = measure(eager, event, result, args.iterations)
+        current = measure(lazy, event, result, args.iterations)
+        print(
+            f"{logging.getLevelName(level):>7}: f-string={baseline * 1e6:.1f}us "
+            f"LazyJson={current * 1e6:.1f}us ({baseline / current:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
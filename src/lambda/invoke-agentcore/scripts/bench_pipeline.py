@@ -0,0 +1,121 @@
+"""Step Functions 経由と直接実行（pipeline_handler）の返信までの遅延の比較
+
+AgentCore（invoke_agent_runtime）と Slack をスタンドインに置き換え、
+イベントの受け取りから Slack への投稿完了までの時間の p50/p99 を出力する。
+
+- stepfunctions: lambda_handler → ステート遷移 → post-to-slack の deliver_reply
+  （ステート遷移と Lambda の呼び出しのオーバーヘッドは --transition-ms / --invoke-ms で模擬）
+- direct: Ingress から非同期実行された pipeline_handler が投稿まで行う
+  （Lambda の呼び出しのオーバーヘッドは 1 回分）
+
+Usage (src/lambda/invoke-agentcore で実行)::
+
+    uv run python scripts/bench_pipeline.py --runs 50 --agent-latency-ms 800
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import urllib3
+
+LAMBDA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(LAMBDA_DIR))
+sys.path.insert(0, str(LAMBDA_DIR / "tests"))
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("AGENT_RUNTIME_ARN", "arn:aws:bedrock-agentcore:us-east-1:0:runtime/bench")
+
+from fake_slack import FakeSlack  # noqa: E402
+from test_process_response import sse_response  # noqa: E402
+
+import delivery  # noqa: E402
+import handler  # noqa: E402
+from posting import ChannelRateLimiter  # noqa: E402
+from slack_client import PooledWebClient  # noqa: E402
+
+REPLY = {"should_reply": True, "reply_mode": "thread", "reply_text": "手順はこちらです。" * 40}
+
+
+class FakeAgentCore:
+    def __init__(self, latency_seconds: float) -> None:
+        self._latency_seconds = latency_seconds
+
+    def invoke_agent_runtime(self, **kwargs) -> dict:
+        time.sleep(self._latency_seconds)
+        return sse_response(json.dumps(REPLY))
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def message_event(n: int) -> dict:
+    return {
+        "text": "デプロイ手順を教えて",
+        "team_id": "T_BENCH",
+        "channel_id": f"C{n:04d}",
+        "user_id": "U_USER",
+        "is_mentioned": True,
+        "ts": f"1700000000.{n:06d}",
+        "thread_ts": f"1700000000.{n:06d}",
+    }
+
+
+def via_step_functions(event: dict, transition: float, invoke: float) -> None:
+    # StartExecution → InvokeAgentCore
+    time.sleep(transition + invoke)
+    state = handler.lambda_handler(event, None)
+    # InvokeAgentCore → PostToSlack（post-to-slack は状態を JSON で受け取る）
+    time.sleep(transition + invoke)
+    response = delivery.deliver_reply(json.loads(json.dumps(state)))
+    assert response["statusCode"] == 200, response
+
+
+def direct(event: dict, transition: float, invoke: float) -> None:
+    time.sleep(invoke)
+    response = handler.pipeline_handler(event, None)
+    assert response["statusCode"] == 200, response
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--agent-latency-ms", type=float, default=500.0)
+    parser.add_argument("--transition-ms", type=float, default=30.0, help="ステート遷移 1 回あたり")
+    parser.add_argument("--invoke-ms", type=float, default=15.0, help="Lambda 呼び出し 1 回あたり")
+    args = parser.parse_args()
+
+    logging.getLogger().addHandler(logging.StreamHandler(open(os.devnull, "w")))
+    slack = FakeSlack()
+    client = PooledWebClient(token="xoxb-bench", base_url=slack.base_url, pool=urllib3.PoolManager())
+    delivery.get_slack_bot_token = lambda: "xoxb-bench"
+    delivery.get_slack_client = lambda token: client
+    delivery.rate_limiter = ChannelRateLimiter(rate=1000.0)
+    agent = FakeAgentCore(args.agent_latency_ms / 1000)
+    handler.get_agent_client = lambda *a: agent
+    handler.STREAM_REPLIES = False
+    handler.result_store = None
+
+    try:
+        for label, run in (("stepfunctions", via_step_functions), ("direct", direct)):
+            latencies = []
+            for n in range(args.runs):
+                started = time.perf_counter()
+                run(message_event(n), args.transition_ms / 1000, args.invoke_ms / 1000)
+                latencies.append(time.perf_counter() - started)
+            print(
+                f"{label:>13}: p50={statistics.median(latencies) * 1000:.1f}ms "
+                f"p99={percentile(latencies, 0.99) * 1000:.1f}ms (n={len(latencies)})"
+            )
+    finally:
+        slack.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""セッション共有戦略（SESSION_AFFINITY）ごとのウォームセッション率と呼び出し遅延のシミュレーター
+
+合成した Slack のトラフィックを build_runtime_session_id でセッションに振り分け、
+thread / channel の戦略ごとに、起動済み（ウォーム）の Runtime セッションに当たった割合と
+AgentCore の呼び出し遅延の p50/p99 を出力する。AWS にはアクセスしない。
+
+モデル:
+- セッションは最後の呼び出しから --idle-timeout-seconds 経過すると停止し、次の呼び出しはコールド
+- 1 つのセッションは呼び出しを 1 件ずつ処理する（同じセッション宛ての呼び出しは待つ）
+- channel の場合、ウォームなセッションでは Agent とセッションマネージャーを使い回すため
+  メモリの復元（--memory-restore-ms）が省かれる
+
+トラフィック:
+- メッセージは平均 --rate-per-minute のポアソン到着。チャンネルは偏りのある分布で選ぶ
+- 確率 --new-thread で新しいスレッドを始め、それ以外はそのチャンネルの直近のスレッドに返信
+
+Usage (src/lambda/invoke-agentcore で実行)::
+
+    uv run python scripts/bench_sessions.py --hours 8 --rate-per-minute 5
+"""
+
+import argparse
+import random
+import statistics
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from session_ids import SESSION_STRATEGIES, build_runtime_session_id  # noqa: E402
+
+
+@dataclass
+class Session:
+    busy_until: float = 0.0
+    last_active: float = 0.0
+
+
+def generate_events(args: argparse.Namespace) -> list[tuple[float, dict]]:
+    rng = random.Random(args.seed)
+    weights = [1 / (n + 1) for n in range(args.channels)]
+    threads: dict[str, list[str]] = {}
+    events = []
+    now = 0.0
+    while True:
+        now += rng.expovariate(args.rate_per_minute / 60)
+        if now > args.hours * 3600:
+            break
+        channel_id = f"C{rng.choices(range(args.channels), weights)[0]:04d}"
+        ts = f"{1700000000 + now:.6f}"
+        recent = threads.setdefault(channel_id, [])
+        if not recent or rng.random() < args.new_thread:
+            recent.append(ts)
+            del recent[:-5]
+            thread_ts = ts
+        else:
+            thread_ts = rng.choice(recent)
+        event = {"team_id": "T1", "channel_id": channel_id, "ts": ts, "thread_ts": thread_ts}
+        events.append((now, event))
+    return events
+
+
+def simulate(events: list[tuple[float, dict]], strategy: str, args: argparse.Namespace) -> dict:
+    sessions: dict[str, Session] = {}
+    latencies, waits = [], []
+    warm = 0
+    for at, event in events:
+        session_id = build_runtime_session_id(event, strategy)
+        session = sessions.get(session_id)
+        is_warm = session is not None and at - session.last_active <= args.idle_timeout_seconds
+        if session is None or not is_warm:
+            session = sessions[session_id] = Session()
+        service = args.invoke_ms / 1000
+        if is_warm:
+            warm += 1
+            if strategy != "channel":
+                service += args.memory_restore_ms / 1000
+        else:
+            service += (args.cold_start_ms + args.memory_restore_ms) / 1000
+        started = max(at, session.busy_until)
+        session.busy_until = session.last_active = started + service
+        waits.append(started - at)
+        latencies.append(started - at + service)
+    return {
+        "warm": warm / len(events),
+        "sessions": len(sessions),
+        "p50": statistics.median(latencies),
+        "p99": sorted(latencies)[min(len(latencies) - 1, int(0.99 * len(latencies)))],
+        "wait": statistics.fmean(waits),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=8.0)
+    parser.add_argument("--rate-per-minute", type=float, default=3.0)
+    parser.add_argument("--channels", type=int, default=30)
+    parser.add_argument("--new-thread", type=float, default=0.4, help="新しいスレッドを始める確率")
+    parser.add_argument("--idle-timeout-seconds", type=float, default=900.0)
+    parser.add_argument("--cold-start-ms", type=float, default=2500.0)
+    parser.add_argument("--memory-restore-ms", type=float, default=400.0)
+    parser.add_argument("--invoke-ms", type=float, default=3000.0, help="モデルの応答時間")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    events = generate_events(args)
+    print(f"{len(events)} messages over {args.hours:g}h, {args.channels} channels")
+    for strategy in SESSION_STRATEGIES:
+        result = simulate(events, strategy, args)
+        print(
+            f"{strategy:>7}: warm={result['warm']:.1%} sessions={result['sessions']} "
+            f"p50={result['p50'] * 1000:.0f}ms p99={result['p99'] * 1000:.0f}ms "
+            f"queue wait={result['wait'] * 1000:.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""AgentCore のストリーミングレスポンス読み取りのベンチマーク
+
+10 KB / 100 KB / 1 MB の合成 text/event-stream を botocore の StreamingBody から読み、
+従来のループ（iter_lines(chunk_size=10) で data: 行をすべて保持）と
+SSE パーサー（iter_chunks(SSE_CHUNK_SIZE) + sse.iter_events）の処理時間を比較する。
+
+ストリームの形:
+- deltas: 返信テキストの差分イベント（約 60 バイト）が続き、最後に結果の JSON
+- single: 返信テキスト全体を含む結果の JSON 1 イベントのみ
+
+従来のループは長い行で再連結を繰り返すため、single 1MB は 1 回で 30 秒程度かかる
+（従来のループの計測回数は --legacy-repeat で指定）。
+
+Usage (src/lambda/invoke-agentcore で実行)::
+
+    uv run python scripts/bench_sse.py --repeat 5 --legacy-repeat 1
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+from botocore.response import StreamingBody
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sse import iter_events  # noqa: E402
+
+SSE_CHUNK_SIZE = 65536
+SIZES = {"10KB": 10 * 1024, "100KB": 100 * 1024, "1MB": 1024 * 1024}
+
+
+def deltas_stream(size: int) -> bytes:
+    parts = []
+    total = 0
+    reply = []
+    while total < size:
+        text = "返信テキストの差分です。"
+        reply.append(text)
+        line = f"data: {json.dumps({'type': 'reply_delta', 'text': text})}\n\n"
+        parts.append(line)
+        total += len(line.encode())
+    result = {"should_reply": True, "reply_text": "".join(reply[-10:])}
+    parts.append(f"data: {json.dumps(result)}\n\n")
+    return "".join(parts).encode()
+
+
+def single_stream(size: int) -> bytes:
+    result = {"should_reply": True, "reply_text": "x" * size}
+    return f"data: {json.dumps(result)}\n\n".encode()
+
+
+def body(data: bytes) -> StreamingBody:
+    return StreamingBody(io.BytesIO(data), len(data))
+
+
+def legacy(data: bytes) -> dict:
+    content = []
+    for line in body(data).iter_lines(chunk_size=10):
+        if line:
+            line_str = line.decode("utf-8")
+            if line_str.startswith("data: "):
+                content.append(line_str[6:])
+    return json.loads(content[-1])
+
+
+def incremental(data: bytes) -> dict:
+    last = None
+    for event in iter_events(body(data).iter_chunks(chunk_size=SSE_CHUNK_SIZE)):
+        last = event.data
+    return json.loads(last)
+
+
+def measure(read, data: bytes, repeat: int) -> tuple[float, dict]:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = read(data)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--legacy-repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    for shape, build in (("deltas", deltas_stream), ("single", single_stream)):
+        for label, size in SIZES.items():
+            data = build(size)
+            baseline, expected = measure(legacy, data, args.legacy_repeat)
+            current, result = measure(incremental, data, args.repeat)
+            assert result == expected
+            print(
+                f"{shape:>6} {label:>5}: iter_lines(10)={baseline * 1000:.2f}ms "
+                f"parser={current * 1000:.2f}ms ({baseline / current:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
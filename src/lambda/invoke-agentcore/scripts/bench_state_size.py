@@ -0,0 +1,90 @@
+"""ステート遷移のペイロードサイズの計測
+
+invoke-agentcore が Step Functions に返すステート（{**event, "agentResult": ...}）のサイズを、
+返信テキストのサイズごとに、従来（返信テキストをそのまま載せる）と offload_reply_text
+（閾値を超えたら返信テキストを退避して参照だけを載せる）で比較する。
+退避先はローカルのファイルシステム（LocalResultStore、一時ディレクトリ）。
+
+- state: ステートの JSON のバイト数（Step Functions の上限は 256 KB）
+- offload: offload_reply_text の 1 呼び出しあたりの時間（退避時はファイルへの書き込みを含む）
+
+返信テキストは日本語（UTF-8 で 1 文字 3 バイト、JSON では \\uXXXX にエスケープされ 6 バイト）。
+
+Usage (src/lambda/invoke-agentcore で実行)::
+
+    uv run python scripts/bench_state_size.py
+    uv run python scripts/bench_state_size.py --reply-kb 1 50 200 1000 --threshold 200000
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from result_store import (  # noqa: E402
+    RESULT_OFFLOAD_THRESHOLD_BYTES,
+    LocalResultStore,
+    offload_reply_text,
+    state_size,
+)
+
+STEP_FUNCTIONS_LIMIT = 256 * 1024
+
+EVENT = {
+    "channel_id": "C_BENCH",
+    "ts": "1700000000.000100",
+    "thread_ts": "1700000000.000100",
+    "text": "障害の経緯をまとめて",
+    "user_id": "U_USER",
+    "is_mentioned": True,
+}
+
+
+def agent_result(reply_kb: int) -> dict:
+    """reply_kb KB（UTF-8）の返信テキストを持つエージェント結果"""
+    return {
+        "should_reply": True,
+        "route": "full_reply",
+        "reply_mode": "thread",
+        "typing_style": "none",
+        "reply_text": "経緯は次のとおりです。" * (reply_kb * 1024 // 30),
+        "reason": "mentioned",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reply-kb", type=int, nargs="+", default=[1, 10, 50, 100, 200, 1000])
+    parser.add_argument("--threshold", type=int, default=RESULT_OFFLOAD_THRESHOLD_BYTES)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"threshold={args.threshold} bytes, Step Functions limit={STEP_FUNCTIONS_LIMIT} bytes")
+    with tempfile.TemporaryDirectory() as directory:
+        store = LocalResultStore(directory)
+        for reply_kb in args.reply_kb:
+            result = agent_result(reply_kb)
+            baseline = state_size({**EVENT, "agentResult": result})
+
+            started = time.perf_counter()
+            for _ in range(args.iterations):
+                offloaded = offload_reply_text(EVENT, result, store, threshold=args.threshold)
+            elapsed = (time.perf_counter() - started) / args.iterations
+            current = state_size({**EVENT, "agentResult": offloaded})
+
+            print(
+                f"reply {reply_kb:>5} KB: state inline={baseline:>9} bytes "
+                f"({'over' if baseline > STEP_FUNCTIONS_LIMIT else 'under'} limit) "
+                f"offload={current:>7} bytes "
+                f"({'ref' if 'reply_text_ref' in offloaded else 'inline'}, {elapsed * 1000:.2f}ms)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""AgentCore Runtime のセッション ID
+
+runtimeSessionId が同じ呼び出しは同じ Runtime セッション（起動済みのコンテナ）に振り分けられる。
+Slack のどの単位でセッションを共有するかを戦略として選択できる。
+
+- thread: スレッドごとに別セッション（スレッド外のメッセージはメッセージごと）
+- channel: チャンネル内のメッセージで 1 つのセッションを共有し、新しいスレッドでも
+  起動済みのセッションを再利用する（メモリの session_id = channel_id とも一致する）。
+  同じチャンネルへの呼び出しは同じセッションに集まる点に注意
+
+ID は Slack の ID の組み合わせを SHA-256 でハッシュ化するため、
+入力によらず決定的かつ Runtime の制約（33〜256 文字）を満たす長さになる。
+
+環境変数:
+    SESSION_AFFINITY: デフォルトの戦略 thread / channel（デフォルト: thread）
+    SESSION_AFFINITY_OVERRIDES: ワークスペースごとの戦略（JSON 例: {"T0123": "channel"}）
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any
+
+logger = logging.getLogger()
+
+SESSION_STRATEGIES = ("thread", "channel")
+
+SESSION_AFFINITY = os.environ.get("SESSION_AFFINITY", "thread")
+
+
+def _load_overrides(raw: str) -> dict[str, str]:
+    """ワークスペースごとの戦略をパース（不正な値は無視）"""
+    if not raw:
+        return {}
+    try:
+        overrides = json.loads(raw)
+    except json.JSONDecodeError:
+        logger.warning("Invalid SESSION_AFFINITY_OVERRIDES, ignoring")
+        return {}
+    return {
+        team_id: strategy
+        for team_id, strategy in overrides.items()
+        if strategy in SESSION_STRATEGIES
+    }
+
+
+SESSION_AFFINITY_OVERRIDES = _load_overrides(os.environ.get("SESSION_AFFINITY_OVERRIDES", ""))
+
+
+def resolve_strategy(team_id: str) -> str:
+    """ワークスペースに適用する戦略を取得"""
+    strategy = SESSION_AFFINITY_OVERRIDES.get(team_id, SESSION_AFFINITY)
+    return strategy if strategy in SESSION_STRATEGIES else "thread"
+
+
+def build_runtime_session_id(event: dict[str, Any], strategy: str | None = None) -> str:
+    """正規化イベントから runtimeSessionId を構築
+
+    Args:
+        event: 正規化イベント
+        strategy: 戦略（未指定時はワークスペースの設定に従う）
+
+    Returns:
+        str: "{strategy}-{sha256 hex}"（72 文字以下）
+    """
+    team_id = event.get("team_id") or "default"
+    channel_id = event.get("channel_id") or "channel"
+    strategy = strategy or resolve_strategy(team_id)
+
+    parts = [team_id, channel_id]
+    if strategy == "thread":
+        parts.append(event.get("thread_ts") or event.get("ts") or "session")
+
+    digest = hashlib.sha256(":".join(parts).encode()).hexdigest()
+    return f"{strategy}-{digest}"
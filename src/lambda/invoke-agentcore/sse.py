@@ -0,0 +1,112 @@
+"""Server-Sent Events のインクリメンタルパーサー
+
+AgentCore Runtime の text/event-stream レスポンスを任意サイズのチャンクで受け取り、
+イベント単位に組み立てる。
+
+- 複数行の data: フィールドは改行で連結
+- event: / id: フィールド、コメント行（":" 始まり）に対応
+- 改行は LF / CRLF / CR のいずれも受け付ける
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+
+@dataclass(slots=True)
+class SSEEvent:
+    """1 つの SSE イベント"""
+
+    data: str
+    event: str = "message"
+    id: str | None = None
+
+
+class SSEParser:
+    """チャンクを順に与えてイベントを取り出すパーサー"""
+
+    def __init__(self) -> None:
+        self._buffer = b""
+        self._data: list[str] = []
+        self._event = ""
+        self.last_event_id: str | None = None
+
+    def feed(self, chunk: bytes) -> list[SSEEvent]:
+        """チャンクを追加し、完成したイベントを返す"""
+        buffer = self._buffer + chunk
+
+        # チャンク末尾の CR は次チャンクの LF と組になる可能性があるため保留
+        if buffer.endswith(b"\r"):
+            self._buffer = b"\r"
+            buffer = buffer[:-1]
+        else:
+            self._buffer = b""
+
+        if b"\r" in buffer:
+            buffer = buffer.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+        lines = buffer.split(b"\n")
+        # 最後の要素は改行で終わっていない途中の行
+        self._buffer = lines.pop() + self._buffer
+
+        events = []
+        for line in lines:
+            event = self._process_line(line.decode("utf-8"))
+            if event is not None:
+                events.append(event)
+        return events
+
+    def close(self) -> list[SSEEvent]:
+        """ストリーム終端で、空行で閉じられていない最後のイベントを返す"""
+        events = []
+        if self._buffer:
+            line = self._buffer.rstrip(b"\r").decode("utf-8")
+            self._buffer = b""
+            event = self._process_line(line)
+            if event is not None:
+                events.append(event)
+        event = self._dispatch()
+        if event is not None:
+            events.append(event)
+        return events
+
+    def _process_line(self, line: str) -> SSEEvent | None:
+        if not line:
+            return self._dispatch()
+
+        if line.startswith(":"):
+            # コメント行
+            return None
+
+        field, sep, value = line.partition(":")
+        if sep and value.startswith(" "):
+            value = value[1:]
+
+        if field == "data":
+            self._data.append(value)
+        elif field == "event":
+            self._event = value
+        elif field == "id" and "\0" not in value:
+            self.last_event_id = value
+        return None
+
+    def _dispatch(self) -> SSEEvent | None:
+        if not self._data:
+            self._event = ""
+            return None
+
+        event = SSEEvent(
+            data="\n".join(self._data),
+            event=self._event or "message",
+            id=self.last_event_id,
+        )
+        self._data = []
+        self._event = ""
+        return event
+
+
+def iter_events(chunks: Iterable[bytes]) -> Iterator[SSEEvent]:
+    """チャンクのイテラブルから SSE イベントを順に取り出す"""
+    parser = SSEParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
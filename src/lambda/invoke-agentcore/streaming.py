@@ -0,0 +1,82 @@
+"""Slack へのストリーミング返信
+
+AgentCore が返信テキストを生成している間に、途中経過を Slack に表示する。
+
+- Router が返信を決めた時点でプレースホルダーを投稿
+- 生成中のテキストは一定間隔で chat.update（レート制限を避けるため間引く）
+- 最終テキストへの更新は post-to-slack が行う（agentResult の streamed_ts を参照）
+
+環境変数:
+    STREAM_UPDATE_INTERVAL_SECONDS: chat.update の最小間隔（デフォルト: 1.0）
+"""
+
+import logging
+import os
+import time
+from typing import Any, Callable
+
+from slack_sdk.errors import SlackApiError
+
+logger = logging.getLogger()
+
+STREAM_UPDATE_INTERVAL_SECONDS = float(os.environ.get("STREAM_UPDATE_INTERVAL_SECONDS", "1.0"))
+
+PLACEHOLDER_TEXT = "考え中です…"
+TYPING_SUFFIX = " …"
+
+
+class StreamingReplyWriter:
+    """ストリーミングイベントを受けて Slack のメッセージを更新する"""
+
+    def __init__(
+        self,
+        client: Any,
+        channel_id: str,
+        thread_ts: str,
+        min_interval: float = STREAM_UPDATE_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._client = client
+        self._channel_id = channel_id
+        self._thread_ts = thread_ts
+        self._min_interval = min_interval
+        self._clock = clock
+        self._text = ""
+        self._ts: str | None = None
+        self._updated_at = 0.0
+        self._disabled = False
+
+    @property
+    def ts(self) -> str | None:
+        """投稿したメッセージの ts（未投稿なら None）"""
+        return self._ts
+
+    def handle(self, event: dict[str, Any]) -> None:
+        """AgentCore のストリーミングイベントを処理"""
+        if self._disabled:
+            return
+
+        try:
+            if event.get("type") == "route":
+                self._post_placeholder(event.get("reply_mode", "thread"))
+            elif event.get("type") == "reply_delta":
+                self._text += event.get("text", "")
+                if self._ts and self._clock() - self._updated_at >= self._min_interval:
+                    self._update(self._text + TYPING_SUFFIX)
+        except SlackApiError as e:
+            # 途中経過の表示に失敗しても最終投稿は post-to-slack が行う
+            logger.warning(f"Streaming update failed, disabling: {e.response['error']}")
+            self._disabled = True
+
+    def _post_placeholder(self, reply_mode: str) -> None:
+        kwargs: dict[str, Any] = {"channel": self._channel_id, "text": PLACEHOLDER_TEXT}
+        if reply_mode == "thread" and self._thread_ts:
+            kwargs["thread_ts"] = self._thread_ts
+        response = self._client.chat_postMessage(**kwargs)
+        self._ts = response["ts"]
+        self._updated_at = self._clock()
+        logger.info(f"Posted streaming placeholder: {self._ts}")
+
+    def _update(self, text: str) -> None:
+        self._client.chat_update(channel=self._channel_id, ts=self._ts, text=text)
+        self._updated_at = self._clock()
@@ -0,0 +1,119 @@
+"""pipeline_handler のテスト（AgentCore と Slack をスタンドインに置き換えて返信まで通す）"""
+
+import json
+
+import pytest
+import urllib3
+from botocore.exceptions import ClientError
+from fake_slack import FakeSlack
+from test_process_response import sse_response
+
+import delivery
+import handler
+from posting import ChannelRateLimiter
+from slack_client import PooledWebClient
+
+AGENT_RUNTIME_ARN = "arn:aws:bedrock-agentcore:us-east-1:123456789012:runtime/test"
+
+
+class FakeAgentCore:
+    """invoke_agent_runtime に決まった結果を SSE で返す AgentCore クライアント"""
+
+    def __init__(self, result: dict | None = None, error: str | None = None) -> None:
+        self.result = result
+        self.error = error
+        self.calls: list[dict] = []
+
+    def invoke_agent_runtime(self, **kwargs) -> dict:
+        self.calls.append(kwargs)
+        if self.error:
+            raise ClientError(
+                {"Error": {"Code": self.error, "Message": "test"}}, "InvokeAgentRuntime"
+            )
+        return sse_response(json.dumps(self.result))
+
+
+class Context:
+    def get_remaining_time_in_millis(self) -> int:
+        return 60_000
+
+
+@pytest.fixture
+def slack(monkeypatch):
+    fake = FakeSlack()
+    client = PooledWebClient(token="xoxb-test", base_url=fake.base_url, pool=urllib3.PoolManager())
+    monkeypatch.setattr(delivery, "get_slack_bot_token", lambda: "xoxb-test")
+    monkeypatch.setattr(delivery, "get_slack_client", lambda token: client)
+    monkeypatch.setattr(delivery, "rate_limiter", ChannelRateLimiter(rate=20.0))
+    monkeypatch.setattr(delivery, "_poster", None)
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    fake = FakeAgentCore()
+    monkeypatch.setenv("AGENT_RUNTIME_ARN", AGENT_RUNTIME_ARN)
+    monkeypatch.setattr(handler, "get_agent_client", lambda *args: fake)
+    monkeypatch.setattr(handler, "STREAM_REPLIES", False)
+    return fake
+
+
+def message_event() -> dict:
+    return {
+        "text": "デプロイ手順を教えて",
+        "team_id": "T1",
+        "channel_id": "C1",
+        "user_id": "U1",
+        "is_mentioned": True,
+        "ts": "1700000000.000200",
+        "thread_ts": "1700000000.000100",
+    }
+
+
+def test_reply_is_posted_to_the_thread(slack, agent):
+    agent.result = {"should_reply": True, "reply_mode": "thread", "reply_text": "手順はこちら"}
+
+    response = handler.pipeline_handler(message_event(), Context())
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["posted"] is True
+    [(method, params)] = slack.calls
+    assert method == "chat.postMessage"
+    assert params["channel"] == "C1"
+    assert params["thread_ts"] == "1700000000.000100"
+    assert params["text"] == "手順はこちら"
+
+    [call] = agent.calls
+    assert call["agentRuntimeArn"] == AGENT_RUNTIME_ARN
+    payload = json.loads(call["payload"])
+    assert payload["prompt"] == "デプロイ手順を教えて"
+    assert payload["metadata"]["slack"]["channel_id"] == "C1"
+    assert payload["metadata"]["deadline_ms"] is not None
+
+
+def test_channel_reply_is_not_threaded(slack, agent):
+    agent.result = {"should_reply": True, "reply_mode": "channel", "reply_text": "了解です"}
+
+    handler.pipeline_handler(message_event(), Context())
+
+    [(_, params)] = slack.calls
+    assert "thread_ts" not in params
+
+
+def test_nothing_is_posted_when_the_agent_declines(slack, agent):
+    agent.result = {"should_reply": False, "reason": "chatter"}
+
+    response = handler.pipeline_handler(message_event(), Context())
+
+    assert json.loads(response["body"]) == {"posted": False, "reason": "chatter"}
+    assert slack.calls == []
+
+
+def test_agent_errors_are_not_posted(slack, agent):
+    agent.error = "ValidationException"
+
+    response = handler.pipeline_handler(message_event(), Context())
+
+    assert json.loads(response["body"])["reason"] == "AgentCore error: ValidationException"
+    assert slack.calls == []
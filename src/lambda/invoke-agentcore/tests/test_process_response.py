@@ -0,0 +1,60 @@
+"""handler._process_response のテスト"""
+
+import json
+
+import handler
+
+
+class FakeStreamingBody:
+    """イベントの途中で区切られた小さなチャンクを返す StreamingBody"""
+
+    def __init__(self, data: bytes, size: int = 7) -> None:
+        self._data = data
+        self._size = size
+
+    def iter_chunks(self, chunk_size: int):
+        for i in range(0, len(self._data), self._size):
+            yield self._data[i : i + self._size]
+
+
+def sse_response(*data: str) -> dict:
+    body = "".join(f"data: {d}\n\n" for d in data).encode()
+    return {"contentType": "text/event-stream", "response": FakeStreamingBody(body)}
+
+
+def test_last_json_event_is_the_result():
+    result = {"should_reply": True, "reply_text": "done"}
+
+    assert handler._process_response(sse_response("ignored", json.dumps(result))) == result
+
+
+def test_stream_events_go_to_the_callback():
+    received = []
+    delta = {"type": "reply_delta", "text": "he"}
+    result = {"should_reply": True, "reply_text": "hello"}
+
+    response = sse_response(json.dumps(delta), json.dumps(result))
+
+    assert handler._process_response(response, on_event=received.append) == result
+    assert received == [delta]
+
+
+def test_long_plain_text_is_returned_in_full():
+    lines = [f"line {i}" for i in range(1000)]
+
+    result = handler._process_response(sse_response(*lines))
+
+    assert result["reply_text"] == "\n".join(lines)
+    assert result["reason"] == "Non-JSON streaming response"
+
+
+def test_empty_stream_does_not_reply():
+    response = {"contentType": "text/event-stream", "response": FakeStreamingBody(b": ping\n\n")}
+
+    assert handler._process_response(response)["should_reply"] is False
+
+
+def test_json_response():
+    response = {"contentType": "application/json", "response": [b'{"should_reply":', b" false}"]}
+
+    assert handler._process_response(response) == {"should_reply": False}
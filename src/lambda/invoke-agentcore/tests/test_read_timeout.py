@@ -0,0 +1,57 @@
+"""handler の応答待ち上限のテスト"""
+
+import time
+
+import handler
+
+
+def test_read_timeout_is_capped_by_the_deadline():
+    assert handler.agent_read_timeout(time.monotonic() + 30.5) == 30
+
+
+def test_read_timeout_defaults_without_a_deadline():
+    assert handler.agent_read_timeout(None) == handler.AGENT_READ_TIMEOUT_SECONDS
+
+
+def test_read_timeout_never_exceeds_the_configured_limit():
+    deadline = time.monotonic() + handler.AGENT_READ_TIMEOUT_SECONDS + 100
+
+    assert handler.agent_read_timeout(deadline) == handler.AGENT_READ_TIMEOUT_SECONDS
+
+
+def test_read_timeout_is_at_least_one_second():
+    assert handler.agent_read_timeout(time.monotonic() - 5) == 1
+
+
+def test_remaining_lambda_time_bounds_the_deadline():
+    class Context:
+        def get_remaining_time_in_millis(self) -> int:
+            return 120_000
+
+    deadline_ms = handler._effective_deadline_ms({}, Context())
+    remaining = deadline_ms / 1000 - time.time()
+
+    assert 120 - handler.AGENT_DEADLINE_RESERVE_SECONDS - 1 < remaining <= 120 - handler.AGENT_DEADLINE_RESERVE_SECONDS
+
+
+def test_clients_are_shared_per_timeout():
+    assert handler.get_agent_client(30) is handler.get_agent_client(30)
+    assert handler.get_agent_client(30).meta.config.read_timeout == 30
+
+
+def test_read_timeout_is_rounded_down_to_a_step():
+    assert handler.agent_read_timeout(time.monotonic() + 59.5) == 45
+    assert handler.agent_read_timeout(time.monotonic() + 7) == 5
+
+
+def test_requests_with_different_deadlines_share_one_client():
+    handler.get_agent_client.cache_clear()
+    now = time.monotonic()
+
+    clients = {
+        id(handler.get_agent_client(handler.agent_read_timeout(now + remaining)))
+        for remaining in (58.2, 52.7, 49.1, 46.0)
+    }
+
+    assert len(clients) == 1
+    assert handler.get_agent_client.cache_info().currsize == 1
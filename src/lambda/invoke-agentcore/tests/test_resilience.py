@@ -0,0 +1,177 @@
+"""resilience.py のテスト（障害注入）"""
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError, ReadTimeoutError
+
+from resilience import CircuitBreaker, CircuitOpenError, call_with_retry
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def client_error(code: str, status: int) -> ClientError:
+    return ClientError(
+        {"Error": {"Code": code, "Message": code}, "ResponseMetadata": {"HTTPStatusCode": status}},
+        "InvokeAgentRuntime",
+    )
+
+
+THROTTLED = client_error("ThrottlingException", 429)
+ACCESS_DENIED = client_error("AccessDeniedException", 403)
+READ_TIMEOUT = ReadTimeoutError(endpoint_url="https://agentcore")
+CONNECT_FAILED = EndpointConnectionError(endpoint_url="https://agentcore")
+
+
+class FaultyAgent:
+    """指定したエラーを順に送出し、尽きたら成功する呼び出し先"""
+
+    def __init__(self, *faults: Exception) -> None:
+        self.faults = list(faults)
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.faults:
+            raise self.faults.pop(0)
+        return "ok"
+
+
+def call(agent: FaultyAgent, breaker: CircuitBreaker, clock: FakeClock, **kwargs) -> str:
+    return call_with_retry(
+        agent, breaker, clock=clock, sleep=clock.sleep, rng=lambda: 1.0, **kwargs
+    )
+
+
+def open_breaker(clock: FakeClock) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    return breaker
+
+
+def test_breaker_opens_after_consecutive_failures():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.allow() is False
+
+
+def test_half_open_allows_a_single_trial():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+    clock.now += 30
+
+    assert breaker.state == "half_open"
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+
+
+def test_successful_trial_closes_the_circuit():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+    clock.now += 30
+    breaker.allow()
+
+    breaker.record_success()
+
+    assert breaker.state == "closed"
+
+
+def test_failed_trial_reopens_the_circuit():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+    clock.now += 30
+    breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+
+
+def test_throttling_is_retried_with_backoff():
+    clock = FakeClock()
+    agent = FaultyAgent(THROTTLED, CONNECT_FAILED)
+
+    assert call(agent, CircuitBreaker(clock=clock), clock) == "ok"
+    assert agent.calls == 3
+    # rng=1.0 なので 0.2 + 0.4 秒待つ
+    assert clock.now == pytest.approx(1000.6)
+
+
+def test_read_timeout_is_not_retried_but_counts_as_failure():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, clock=clock)
+    agent = FaultyAgent(READ_TIMEOUT)
+
+    with pytest.raises(ReadTimeoutError):
+        call(agent, breaker, clock)
+
+    assert agent.calls == 1
+    assert breaker.state == "open"
+
+
+def test_non_retryable_error_does_not_close_a_half_open_circuit():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+    clock.now += 30
+
+    with pytest.raises(ClientError):
+        call(FaultyAgent(ACCESS_DENIED), breaker, clock)
+
+    assert breaker.state == "half_open"
+    # 試行の枠は返されるので次の呼び出しで判定できる
+    assert call(FaultyAgent(), breaker, clock) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_non_retryable_error_does_not_reset_the_failure_count():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, clock=clock)
+
+    with pytest.raises(ClientError):
+        call(FaultyAgent(THROTTLED), breaker, clock, max_attempts=1)
+    with pytest.raises(ClientError):
+        call(FaultyAgent(ACCESS_DENIED), breaker, clock)
+    with pytest.raises(ClientError):
+        call(FaultyAgent(THROTTLED), breaker, clock, max_attempts=1)
+
+    assert breaker.state == "open"
+
+
+def test_open_circuit_skips_the_call():
+    clock = FakeClock()
+    agent = FaultyAgent()
+
+    with pytest.raises(CircuitOpenError):
+        call(agent, open_breaker(clock), clock)
+    assert agent.calls == 0
+
+
+def test_retry_is_not_attempted_past_the_deadline():
+    clock = FakeClock()
+    agent = FaultyAgent(THROTTLED)
+
+    with pytest.raises(ClientError):
+        call(agent, CircuitBreaker(clock=clock), clock, deadline=clock.now + 0.1)
+    assert agent.calls == 1
+
+
+def test_retries_stop_after_max_attempts():
+    clock = FakeClock()
+    agent = FaultyAgent(THROTTLED, THROTTLED, THROTTLED)
+
+    with pytest.raises(ClientError):
+        call(agent, CircuitBreaker(clock=clock), clock, max_attempts=3)
+    assert agent.calls == 3
@@ -0,0 +1,85 @@
+"""result_store.py のテスト"""
+
+import io
+import json
+
+import pytest
+
+import result_store
+from result_store import LocalResultStore, load_reply_text, offload_reply_text
+
+EVENT = {"channel_id": "C1", "ts": "1.0"}
+
+
+def test_small_result_is_kept_inline(tmp_path):
+    agent_result = {"should_reply": True, "reply_text": "short"}
+
+    assert offload_reply_text(EVENT, agent_result, LocalResultStore(str(tmp_path))) == agent_result
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_large_reply_text_is_offloaded_and_loaded_back(tmp_path):
+    agent_result = {"should_reply": True, "reply_text": "x" * 1000}
+
+    offloaded = offload_reply_text(EVENT, agent_result, LocalResultStore(str(tmp_path)), threshold=500)
+
+    assert offloaded["reply_text"] == ""
+    assert offloaded["reply_text_ref"].startswith("file://")
+    assert load_reply_text(offloaded) == "x" * 1000
+
+
+def test_state_is_serialized_once(tmp_path, monkeypatch):
+    calls = []
+    original = json.dumps
+    monkeypatch.setattr(result_store.json, "dumps", lambda *a, **k: calls.append(1) or original(*a, **k))
+
+    offload_reply_text(EVENT, {"reply_text": "short"}, LocalResultStore(str(tmp_path)))
+
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(
+    "event",
+    [
+        {"channel_id": "../C1", "ts": "1.0"},
+        {"channel_id": "C1", "ts": "../../etc/passwd"},
+        {"channel_id": "C1\\..", "ts": "1.0"},
+        {"channel_id": "..", "ts": "1.0"},
+    ],
+)
+def test_keys_with_path_separators_are_rejected(tmp_path, event):
+    agent_result = {"should_reply": True, "reply_text": "x" * 1000}
+
+    with pytest.raises(ValueError):
+        offload_reply_text(event, agent_result, LocalResultStore(str(tmp_path)), threshold=500)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("key", ["../outside.txt", "/tmp/outside.txt", "a/../../outside.txt"])
+def test_local_store_keeps_files_under_its_directory(tmp_path, key):
+    with pytest.raises(ValueError):
+        LocalResultStore(str(tmp_path / "store")).put(key, "text")
+
+
+class FakeS3:
+    def __init__(self) -> None:
+        self.objects: dict[tuple[str, str], bytes] = {}
+
+    def put_object(self, Bucket, Key, Body, ContentType):  # noqa: N803
+        self.objects[(Bucket, Key)] = Body
+
+    def get_object(self, Bucket, Key):  # noqa: N803
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+
+def test_s3_client_is_shared_across_loads(monkeypatch):
+    s3 = FakeS3()
+    created = []
+    monkeypatch.setattr(result_store, "_s3_client", None)
+    monkeypatch.setattr("boto3.client", lambda service: created.append(service) or s3)
+    ref = result_store.S3ResultStore("bucket").put("agent-results/C1/1.0.txt", "hello")
+
+    assert load_reply_text({"reply_text_ref": ref}) == "hello"
+    assert load_reply_text({"reply_text_ref": ref}) == "hello"
+    assert created == ["s3"]
@@ -0,0 +1,92 @@
+"""session_ids.py のテスト"""
+
+import pytest
+
+import session_ids
+from session_ids import _load_overrides, build_runtime_session_id, resolve_strategy
+
+EVENT = {
+    "team_id": "T1",
+    "channel_id": "C1",
+    "ts": "1700000000.000200",
+    "thread_ts": "1700000000.000100",
+}
+
+
+def test_session_id_is_deterministic():
+    for strategy in ("thread", "channel"):
+        assert build_runtime_session_id(dict(EVENT), strategy) == build_runtime_session_id(
+            dict(EVENT), strategy
+        )
+
+
+def test_thread_strategy_separates_threads():
+    other_thread = {**EVENT, "thread_ts": "1700000000.000900"}
+
+    assert build_runtime_session_id(EVENT, "thread") != build_runtime_session_id(
+        other_thread, "thread"
+    )
+
+
+def test_thread_strategy_uses_ts_outside_threads():
+    event = {**EVENT, "thread_ts": None}
+
+    assert build_runtime_session_id(event, "thread") == build_runtime_session_id(
+        {**EVENT, "thread_ts": EVENT["ts"]}, "thread"
+    )
+
+
+def test_channel_strategy_shares_one_session_across_threads():
+    other_thread = {**EVENT, "thread_ts": "1700000000.000900", "ts": "1700000000.000901"}
+
+    assert build_runtime_session_id(EVENT, "channel") == build_runtime_session_id(
+        other_thread, "channel"
+    )
+    assert build_runtime_session_id(EVENT, "channel") != build_runtime_session_id(
+        {**EVENT, "channel_id": "C2"}, "channel"
+    )
+
+
+def test_strategies_do_not_collide():
+    assert build_runtime_session_id(EVENT, "thread") != build_runtime_session_id(EVENT, "channel")
+    assert build_runtime_session_id(EVENT, "channel").startswith("channel-")
+
+
+@pytest.mark.parametrize(
+    "event",
+    [
+        {},
+        {"team_id": "T", "channel_id": "C", "ts": "1"},
+        {"team_id": "T" * 500, "channel_id": "C" * 500, "thread_ts": "9" * 500},
+    ],
+)
+@pytest.mark.parametrize("strategy", ["thread", "channel"])
+def test_session_id_length_is_within_runtime_limits(event, strategy):
+    session_id = build_runtime_session_id(event, strategy)
+
+    assert 33 <= len(session_id) <= 256
+
+
+def test_overrides_are_parsed():
+    assert _load_overrides('{"T1": "channel", "T2": "thread"}') == {"T1": "channel", "T2": "thread"}
+
+
+@pytest.mark.parametrize("raw", ["", "not json", '{"T1": "workspace"}'])
+def test_invalid_overrides_are_ignored(raw):
+    assert _load_overrides(raw) == {}
+
+
+def test_workspace_override_wins_over_the_default(monkeypatch):
+    monkeypatch.setattr(session_ids, "SESSION_AFFINITY", "thread")
+    monkeypatch.setattr(session_ids, "SESSION_AFFINITY_OVERRIDES", {"T1": "channel"})
+
+    assert resolve_strategy("T1") == "channel"
+    assert resolve_strategy("T2") == "thread"
+    assert build_runtime_session_id(EVENT) == build_runtime_session_id(EVENT, "channel")
+
+
+def test_unknown_default_falls_back_to_thread(monkeypatch):
+    monkeypatch.setattr(session_ids, "SESSION_AFFINITY", "workspace")
+    monkeypatch.setattr(session_ids, "SESSION_AFFINITY_OVERRIDES", {})
+
+    assert resolve_strategy("T1") == "thread"
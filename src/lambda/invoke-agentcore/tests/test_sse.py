@@ -0,0 +1,70 @@
+"""sse.py のテスト"""
+
+import pytest
+
+from sse import SSEParser, iter_events
+
+STREAM = (
+    b": keep-alive\r\n"
+    b"event: delta\r\n"
+    b"id: 1\r\n"
+    b"data: {\"type\": \"reply_delta\", \"text\": \"\xe3\x81\x93\"}\r\n"
+    b"\r\n"
+    b"data: line one\n"
+    b"data: line two\n"
+    b"\n"
+    b"data:no-space\r"
+    b"\r"
+    b"data: {\"should_reply\": true}\n"
+)
+
+
+def split_every(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def parse(chunks: list[bytes]) -> list[tuple[str, str, str | None]]:
+    return [(e.event, e.data, e.id) for e in iter_events(chunks)]
+
+
+EXPECTED = [
+    ("delta", '{"type": "reply_delta", "text": "こ"}', "1"),
+    ("message", "line one\nline two", "1"),
+    ("message", "no-space", "1"),
+    ("message", '{"should_reply": true}', "1"),
+]
+
+
+def test_whole_stream_in_one_chunk():
+    assert parse([STREAM]) == EXPECTED
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 16])
+def test_every_chunk_boundary_gives_the_same_events(size):
+    assert parse(split_every(STREAM, size)) == EXPECTED
+
+
+def test_crlf_split_across_chunks_is_one_line_break():
+    parser = SSEParser()
+
+    assert parser.feed(b"data: a\r") == []
+    assert parser.feed(b"\n\r") == []
+    [event] = parser.feed(b"\n")
+    assert event.data == "a"
+
+
+def test_multibyte_character_split_across_chunks():
+    encoded = "data: 日本語\n\n".encode()
+
+    assert parse([encoded[:8], encoded[8:]]) == [("message", "日本語", None)]
+
+
+def test_unterminated_last_event_is_returned_on_close():
+    parser = SSEParser()
+
+    assert parser.feed(b"data: partial") == []
+    assert [e.data for e in parser.close()] == ["partial"]
+
+
+def test_event_without_data_is_not_dispatched():
+    assert parse([b"event: ping\n\n", b"data: x\n\n"]) == [("message", "x", None)]
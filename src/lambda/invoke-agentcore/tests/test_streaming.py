@@ -0,0 +1,174 @@
+"""ストリーミング返信（StreamingReplyWriter と delivery の最終更新）のテスト
+
+_process_response に SSE を流し、ローカルの Slack スタンドインへの呼び出しを確認する。
+"""
+
+import json
+
+import pytest
+import urllib3
+from fake_slack import FakeSlack
+from test_process_response import sse_response
+
+import delivery
+import handler
+from slack_client import PooledWebClient
+from streaming import PLACEHOLDER_TEXT, TYPING_SUFFIX, StreamingReplyWriter
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def slack(monkeypatch):
+    fake = FakeSlack()
+    client = PooledWebClient(token="xoxb-test", base_url=fake.base_url, pool=urllib3.PoolManager())
+    fake.client = client
+    monkeypatch.setattr(delivery, "get_slack_bot_token", lambda: "xoxb-test")
+    monkeypatch.setattr(delivery, "get_slack_client", lambda token: client)
+    yield fake
+    fake.close()
+
+
+def stream(writer: StreamingReplyWriter, clock: Clock, *events: dict, step: float = 0.4) -> dict:
+    """イベントごとに時計を step 秒進めながら writer に渡す"""
+
+    def on_event(event: dict) -> None:
+        clock.now += step
+        writer.handle(event)
+
+    result = {"should_reply": True, "reply_text": "".join(e.get("text", "") for e in events)}
+    data = [json.dumps(e) for e in events] + [json.dumps(result)]
+    assert handler._process_response(sse_response(*data), on_event=on_event) == result
+    return result
+
+
+def route(reply_mode: str = "thread") -> dict:
+    return {"type": "route", "reply_mode": reply_mode}
+
+
+def delta(text: str) -> dict:
+    return {"type": "reply_delta", "text": text}
+
+
+def test_placeholder_is_posted_to_the_thread_when_the_route_is_decided(slack):
+    clock = Clock()
+    writer = StreamingReplyWriter(slack.client, "C1", "1.0", min_interval=1.0, clock=clock)
+
+    stream(writer, clock, route())
+
+    assert slack.calls == [
+        ("chat.postMessage", {"channel": "C1", "text": PLACEHOLDER_TEXT, "thread_ts": "1.0"})
+    ]
+    assert writer.ts == "1.000"
+
+
+def test_channel_replies_are_not_threaded(slack):
+    clock = Clock()
+    writer = StreamingReplyWriter(slack.client, "C1", "1.0", min_interval=1.0, clock=clock)
+
+    stream(writer, clock, route("channel"))
+
+    [(_, params)] = slack.calls
+    assert "thread_ts" not in params
+
+
+def test_updates_are_throttled(slack):
+    clock = Clock()
+    writer = StreamingReplyWriter(slack.client, "C1", "1.0", min_interval=1.0, clock=clock)
+
+    # 0.4 秒ごとのイベント: 1.2 秒後と 2.4 秒後の差分で更新する
+    stream(writer, clock, route(), *(delta(c) for c in "abcdefg"))
+
+    updates = [params["text"] for method, params in slack.calls if method == "chat.update"]
+    assert updates == ["abc" + TYPING_SUFFIX, "abcdef" + TYPING_SUFFIX]
+
+
+def test_deltas_before_the_placeholder_are_not_sent(slack):
+    clock = Clock()
+    writer = StreamingReplyWriter(slack.client, "C1", "1.0", min_interval=1.0, clock=clock)
+
+    stream(writer, clock, delta("a"), delta("b"), step=5.0)
+
+    assert slack.calls == []
+
+
+def test_slack_error_disables_streaming(slack):
+    slack.responses.append((200, {"ok": False, "error": "channel_not_found"}, {}))
+    clock = Clock()
+    writer = StreamingReplyWriter(slack.client, "C1", "1.0", min_interval=1.0, clock=clock)
+
+    stream(writer, clock, route(), *(delta(c) for c in "abcdef"), step=2.0)
+
+    assert [method for method, _ in slack.calls] == ["chat.postMessage"]
+    assert writer.ts is None
+
+
+def test_update_error_stops_further_updates(slack):
+    clock = Clock()
+    writer = StreamingReplyWriter(slack.client, "C1", "1.0", min_interval=1.0, clock=clock)
+    slack.responses.extend(
+        [
+            (200, {"ok": True, "ts": "9.000"}, {}),
+            (429, {"ok": False, "error": "ratelimited"}, {"Retry-After": "1"}),
+        ]
+    )
+
+    stream(writer, clock, route(), delta("a"), delta("b"), delta("c"), step=2.0)
+
+    assert [method for method, _ in slack.calls] == ["chat.postMessage", "chat.update"]
+    # 表示済みのメッセージは最終更新の対象として残る
+    assert writer.ts == "9.000"
+
+
+def test_streamed_message_is_finalized_with_the_reply(slack):
+    clock = Clock()
+    writer = StreamingReplyWriter(slack.client, "C1", "1.0", min_interval=1.0, clock=clock)
+    result = stream(writer, clock, route(), delta("hel"), delta("lo"))
+    event = {
+        "channel_id": "C1",
+        "thread_ts": "1.0",
+        "agentResult": {**result, "reply_mode": "thread", "streamed_ts": writer.ts},
+    }
+
+    response = delivery.deliver_reply(event)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["ts"] == writer.ts
+    assert slack.calls[-1] == ("chat.update", {"channel": "C1", "ts": writer.ts, "text": "hello"})
+    assert [method for method, _ in slack.calls].count("chat.postMessage") == 1
+
+
+def test_streamed_placeholder_is_deleted_without_a_reply(slack):
+    clock = Clock()
+    writer = StreamingReplyWriter(slack.client, "C1", "1.0", min_interval=1.0, clock=clock)
+    stream(writer, clock, route())
+    event = {
+        "channel_id": "C1",
+        "thread_ts": "1.0",
+        "agentResult": {"should_reply": False, "reason": "chatter", "streamed_ts": writer.ts},
+    }
+
+    response = delivery.deliver_reply(event)
+
+    assert json.loads(response["body"])["posted"] is False
+    assert slack.calls[-1] == ("chat.delete", {"channel": "C1", "ts": writer.ts})
+
+
+def test_finalize_error_is_reported(slack):
+    slack.responses.append((200, {"ok": False, "error": "message_not_found"}, {}))
+    event = {
+        "channel_id": "C1",
+        "thread_ts": "1.0",
+        "agentResult": {"should_reply": True, "reply_text": "hello", "streamed_ts": "9.000"},
+    }
+
+    response = delivery.deliver_reply(event)
+
+    assert response["statusCode"] == 500
+    assert json.loads(response["body"])["error"] == "message_not_found"
@@ -0,0 +1,137 @@
+"""構造化ログユーティリティ
+
+ログ出力用の値を遅延評価でシリアライズする。
+ログレベルで捨てられるメッセージではペイロードの JSON 化を行わず、
+出力される場合もサイズ上限で切り詰め、全文ダンプはサンプリングする。
+また、リクエスト単位の相関 ID（channel_id, ts, 実行名）を各ログに付与する。
+相関 ID はログレコードの correlation_ids 属性に載せ、メッセージへの付与は
+フォーマッターで行う（レコード自体は書き換えない）。
+
+Lambda 間で共有するため、各 Lambda に同じ内容のファイルを配置している。
+
+環境変数:
+    LOG_MAX_FIELD_CHARS: ペイロード系フィールドの最大文字数（デフォルト: 2000）
+    LOG_PAYLOAD_SAMPLE_RATE: ペイロード全文を出力する割合 0.0〜1.0（デフォルト: 1.0）
+"""
+
+import copy
+import json
+import logging
+import os
+import random
+from contextvars import ContextVar
+from typing import Any
+
+MAX_FIELD_CHARS = int(os.environ.get("LOG_MAX_FIELD_CHARS", "2000"))
+PAYLOAD_SAMPLE_RATE = float(os.environ.get("LOG_PAYLOAD_SAMPLE_RATE", "1.0"))
+
+# 同時に複数のリクエストを処理するプロセス（AgentCore Runtime）でも混ざらないよう ContextVar で保持
+_correlation_ids: ContextVar[dict[str, str]] = ContextVar("correlation_ids", default={})
+
+
+def truncate(text: str, max_chars: int = MAX_FIELD_CHARS) -> str:
+    """文字列を上限で切り詰める"""
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}...(truncated, {len(text)} chars)"
+
+
+class LazyJson:
+    """ログ出力時にのみ JSON 化される値
+
+    logger.info("Received event: %s", LazyJson(event)) のように渡すと、
+    メッセージが実際に出力される場合だけシリアライズされる。
+    """
+
+    __slots__ = ("_value", "_max_chars", "_sample_rate")
+
+    def __init__(
+        self,
+        value: Any,
+        max_chars: int = MAX_FIELD_CHARS,
+        sample_rate: float = PAYLOAD_SAMPLE_RATE,
+    ) -> None:
+        self._value = value
+        self._max_chars = max_chars
+        self._sample_rate = sample_rate
+
+    def __str__(self) -> str:
+        if self._sample_rate < 1.0 and random.random() >= self._sample_rate:
+            return _summarize(self._value)
+        return truncate(
+            json.dumps(self._value, ensure_ascii=False, default=str),
+            self._max_chars,
+        )
+
+
+class LazyText:
+    """ログ出力時にのみ切り詰められる長い文字列（返信テキストなど）"""
+
+    __slots__ = ("_value", "_max_chars")
+
+    def __init__(self, value: Any, max_chars: int = MAX_FIELD_CHARS) -> None:
+        self._value = value
+        self._max_chars = max_chars
+
+    def __str__(self) -> str:
+        return truncate(str(self._value), self._max_chars)
+
+
+def _summarize(value: Any) -> str:
+    """サンプリング対象外のペイロードの要約"""
+    if isinstance(value, dict):
+        return f"<payload omitted: keys={sorted(value)}>"
+    return f"<payload omitted: {type(value).__name__}>"
+
+
+def bind_correlation_ids(**ids: Any) -> None:
+    """以降のログに付与する相関 ID を設定（リクエストごとに上書き）"""
+    _correlation_ids.set({k: str(v) for k, v in ids.items() if v})
+
+
+def clear_correlation_ids() -> None:
+    """相関 ID をクリア"""
+    _correlation_ids.set({})
+
+
+class CorrelationIdFilter(logging.Filter):
+    """ログレコードに相関 ID（correlation_ids 属性）を付与するフィルター"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_ids = _correlation_ids.get()
+        return True
+
+
+class CorrelationIdFormatter(logging.Formatter):
+    """メッセージの先頭に相関 ID を付けて出力するフォーマッター
+
+    既存のフォーマッター（Lambda ランタイムのものなど）をラップする。
+    付与はレコードの複製に対して行うため、他のハンドラーには元のメッセージが渡る。
+    """
+
+    def __init__(self, wrapped: logging.Formatter | None = None) -> None:
+        super().__init__()
+        self.wrapped = wrapped or logging.Formatter()
+
+    def format(self, record: logging.LogRecord) -> str:
+        ids = getattr(record, "correlation_ids", None)
+        if not ids:
+            return self.wrapped.format(record)
+        prefix = " ".join(f"{k}={v}" for k, v in ids.items())
+        prefixed = copy.copy(record)
+        prefixed.msg = f"[{prefix}] {record.getMessage()}"
+        prefixed.args = None
+        return self.wrapped.format(prefixed)
+
+
+def install(logger: logging.Logger) -> None:
+    """ロガーのハンドラーに相関 ID のフィルターとフォーマッターを設定（重複設定はしない）
+
+    Lambda ランタイムは関数コードの import 前にルートロガーへハンドラーを追加するため、
+    モジュールの読み込み時に呼べばそのハンドラーが対象になる。
+    """
+    for handler in logger.handlers:
+        if not any(isinstance(f, CorrelationIdFilter) for f in handler.filters):
+            handler.addFilter(CorrelationIdFilter())
+        if not isinstance(handler.formatter, CorrelationIdFormatter):
+            handler.setFormatter(CorrelationIdFormatter(handler.formatter))
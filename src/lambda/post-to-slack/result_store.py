@@ -0,0 +1,159 @@
+"""エージェント結果のオフロード
+
+Step Functions のステート間で受け渡せるペイロードは 256 KB まで。
+返信テキストが大きい場合はオブジェクトストアに退避し、
+ステートには参照（reply_text_ref）だけを載せる。
+
+- s3://bucket/key: S3（本番）
+- file:///path: ローカルファイルシステム（ローカル実行・テスト用）
+
+Lambda 間で共有するため、invoke-agentcore と post-to-slack に同じ内容のファイルを配置している。
+
+環境変数:
+    RESULT_BUCKET_NAME: 退避先の S3 バケット名
+    RESULT_STORE_DIR: 退避先のローカルディレクトリ（RESULT_BUCKET_NAME 未設定時）
+    RESULT_OFFLOAD_THRESHOLD_BYTES: 退避するステートサイズの閾値（デフォルト: 200000）
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Protocol
+from urllib.parse import urlparse
+
+logger = logging.getLogger()
+
+RESULT_OFFLOAD_THRESHOLD_BYTES = int(os.environ.get("RESULT_OFFLOAD_THRESHOLD_BYTES", "200000"))
+
+# S3 クライアント（コンテナ単位で共有、初回の退避・取得時に作成）
+_s3_client: Any = None
+
+
+def get_s3_client() -> Any:
+    """コンテナ単位で共有する S3 クライアントを取得"""
+    global _s3_client
+    if _s3_client is None:
+        import boto3
+
+        _s3_client = boto3.client("s3")
+    return _s3_client
+
+
+class ResultStore(Protocol):
+    """返信テキストの退避先"""
+
+    def put(self, key: str, text: str) -> str:
+        """テキストを保存して参照 URI を返す"""
+        ...
+
+    def get(self, ref: str) -> str:
+        """参照 URI からテキストを取得"""
+        ...
+
+
+class S3ResultStore:
+    """S3 に退避する"""
+
+    def __init__(self, bucket: str | None = None, client: Any = None) -> None:
+        self._bucket = bucket
+        self._client = client or get_s3_client()
+
+    def put(self, key: str, text: str) -> str:
+        self._client.put_object(
+            Bucket=self._bucket,
+            Key=key,
+            Body=text.encode("utf-8"),
+            ContentType="text/plain; charset=utf-8",
+        )
+        return f"s3://{self._bucket}/{key}"
+
+    def get(self, ref: str) -> str:
+        parsed = urlparse(ref)
+        response = self._client.get_object(Bucket=parsed.netloc, Key=parsed.path.lstrip("/"))
+        return response["Body"].read().decode("utf-8")
+
+
+class LocalResultStore:
+    """ローカルファイルシステムに退避する"""
+
+    def __init__(self, base_dir: str | None = None) -> None:
+        self._base_dir = Path(base_dir) if base_dir else None
+
+    def put(self, key: str, text: str) -> str:
+        parts = Path(key).parts
+        if not parts or Path(key).is_absolute() or "\\" in key or ".." in parts:
+            raise ValueError(f"Invalid result key: {key!r}")
+        path = self._base_dir / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path.resolve().as_uri()
+
+    def get(self, ref: str) -> str:
+        return Path(urlparse(ref).path).read_text(encoding="utf-8")
+
+
+def get_result_store() -> ResultStore | None:
+    """環境変数に応じた退避先を取得（未設定なら None = 退避しない）"""
+    bucket = os.environ.get("RESULT_BUCKET_NAME")
+    if bucket:
+        return S3ResultStore(bucket)
+
+    directory = os.environ.get("RESULT_STORE_DIR")
+    if directory:
+        return LocalResultStore(directory)
+
+    return None
+
+
+def state_size(state: dict[str, Any]) -> int:
+    """ステートとして受け渡す JSON のバイト数"""
+    return len(json.dumps(state).encode("utf-8"))
+
+
+def offload_reply_text(
+    event: dict[str, Any],
+    agent_result: dict[str, Any],
+    store: ResultStore,
+    threshold: int = RESULT_OFFLOAD_THRESHOLD_BYTES,
+) -> dict[str, Any]:
+    """ステートが閾値を超える場合は返信テキストを退避し、参照に置き換えた結果を返す"""
+    size = state_size({**event, "agentResult": agent_result})
+    reply_text = agent_result.get("reply_text")
+    if size <= threshold or not reply_text:
+        logger.info(f"Result state size: {size} bytes")
+        return agent_result
+
+    key = result_key(event)
+    ref = store.put(key, reply_text)
+    logger.info(f"Offloaded reply_text ({size} bytes state) to {ref}")
+
+    return {**agent_result, "reply_text": "", "reply_text_ref": ref}
+
+
+def result_key(event: dict[str, Any]) -> str:
+    """退避先のキー（agent-results/<channel_id>/<ts>.txt）
+
+    Raises:
+        ValueError: channel_id / ts にパス区切りなどキーの階層を変える文字が含まれる場合
+    """
+    channel_id = str(event.get("channel_id") or "channel")
+    ts = str(event.get("ts") or "ts")
+    for part in (channel_id, ts):
+        if "/" in part or "\\" in part or part in (".", ".."):
+            raise ValueError(f"Invalid key component: {part!r}")
+    return f"agent-results/{channel_id}/{ts}.txt"
+
+
+def load_reply_text(agent_result: dict[str, Any]) -> str:
+    """退避された返信テキストを参照から取得（退避されていなければそのまま返す）"""
+    ref = agent_result.get("reply_text_ref")
+    if not ref:
+        return agent_result.get("reply_text", "")
+
+    scheme = urlparse(ref).scheme
+    if scheme == "s3":
+        return S3ResultStore().get(ref)
+    if scheme == "file":
+        return LocalResultStore().get(ref)
+    raise ValueError(f"Unsupported reply_text_ref: {ref}")
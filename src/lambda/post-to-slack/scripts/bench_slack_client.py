@@ -0,0 +1,82 @@
+"""Slack クライアントの使い回しによる投稿遅延のベンチマーク
+
+ローカルの Slack スタンドイン（tests/fake_slack.py）に chat.postMessage を送り、
+1 呼び出しあたりの p50/p99 と張った接続数を比較する。
+
+- cold: 呼び出しごとに WebClient を作り直す（従来の実装）
+- cached: WebClient は使い回すが、urllib のため呼び出しごとに接続を張る
+- pooled: get_slack_client の PooledWebClient（keep-alive の接続プール）
+
+--connect-latency-ms で接続確立（Slack までの TCP/TLS ハンドシェイク）の時間を、
+--api-latency-ms で API の応答時間を模擬する。
+
+Usage (src/lambda/post-to-slack で実行)::
+
+    uv run python scripts/bench_slack_client.py --calls 200 --connect-latency-ms 30
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import urllib3
+
+LAMBDA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(LAMBDA_DIR))
+sys.path.insert(0, str(LAMBDA_DIR / "tests"))
+
+from fake_slack import FakeSlack  # noqa: E402
+from slack_sdk import WebClient  # noqa: E402
+
+from slack_client import PooledWebClient  # noqa: E402
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def measure(get_client, calls: int) -> list[float]:
+    latencies = []
+    for n in range(calls):
+        started = time.perf_counter()
+        get_client().chat_postMessage(channel="C_BENCH", thread_ts="1.0", text=f"reply {n}")
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--connect-latency-ms", type=float, default=20.0)
+    parser.add_argument("--api-latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    fake = FakeSlack(
+        latency_seconds=args.api_latency_ms / 1000,
+        connect_latency_seconds=args.connect_latency_ms / 1000,
+    )
+    cached = WebClient(token="xoxb-bench", base_url=fake.base_url)
+    pooled = PooledWebClient(token="xoxb-bench", base_url=fake.base_url, pool=urllib3.PoolManager())
+    variants = {
+        "cold": lambda: WebClient(token="xoxb-bench", base_url=fake.base_url),
+        "cached": lambda: cached,
+        "pooled": lambda: pooled,
+    }
+    try:
+        for label, get_client in variants.items():
+            connections = fake.connections
+            latencies = measure(get_client, args.calls)
+            print(
+                f"{label:>6}: p50={statistics.median(latencies) * 1000:.2f}ms "
+                f"p99={percentile(latencies, 0.99) * 1000:.2f}ms "
+                f"connections={fake.connections - connections} (n={len(latencies)})"
+            )
+    finally:
+        fake.close()
+
+
+if __name__ == "__main__":
+    main()
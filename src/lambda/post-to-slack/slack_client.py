@@ -0,0 +1,91 @@
+"""Slack WebClient のキャッシュ
+
+WebClient をコンテナ単位で使い回し、トークンがローテーションされた場合のみ再構築する。
+slack_sdk の WebClient は呼び出しごとに urllib で接続を張り直すため、HTTP 通信は
+コンテナ単位の keep-alive 接続プール（urllib3）経由で行い、TCP/TLS のハンドシェイクを省く。
+接続プールはトークンのローテーション後も引き継ぐ。
+レート制限（ratelimited）は posting.SlackPoster が Retry-After に従って再スケジュールする。
+
+環境変数:
+    SLACK_TIMEOUT_SECONDS: Slack API 呼び出しのタイムアウト秒数（デフォルト: 10）
+"""
+
+import os
+import ssl
+from typing import Any
+from urllib.error import URLError
+from urllib.request import Request
+
+import urllib3
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackRequestError
+from slack_sdk.http_retry.builtin_handlers import ConnectionErrorRetryHandler
+
+SLACK_TIMEOUT_SECONDS = int(os.environ.get("SLACK_TIMEOUT_SECONDS", "10"))
+
+# 同時に使う接続数（ストリーミング中の chat.update と投稿が重なる程度）
+POOL_MAXSIZE = 4
+
+# 接続ごとに CA 証明書を読み込まないよう SSL コンテキストを共有
+_ssl_context = ssl.create_default_context()
+
+_pool = urllib3.PoolManager(maxsize=POOL_MAXSIZE, ssl_context=_ssl_context, retries=False)
+
+_client_cache: tuple[str, WebClient] | None = None
+
+
+class PooledWebClient(WebClient):
+    """HTTP 通信を keep-alive の接続プールで行う WebClient
+
+    リトライ・レスポンスの検証は WebClient の処理をそのまま使う。
+    接続エラーは urllib と同じく URLError として送出し、ConnectionErrorRetryHandler の対象にする。
+    """
+
+    def __init__(self, *args: Any, pool: urllib3.PoolManager | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.pool = pool or _pool
+
+    def _perform_urllib_http_request_internal(self, url: str, req: Request) -> dict[str, Any]:
+        if not url.lower().startswith("http"):
+            raise SlackRequestError(f"Invalid URL detected: {url}")
+        try:
+            resp = self.pool.request(
+                "POST",
+                url,
+                body=req.data,
+                headers={k: str(v) for k, v in req.header_items()},
+                timeout=self.timeout,
+            )
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise TimeoutError(str(e)) from e
+        except urllib3.exceptions.HTTPError as e:
+            raise URLError(e) from e
+
+        headers = dict(resp.headers.items())
+        # Retry-After の参照は大文字・小文字どちらでもできるようにする（urllib 使用時と同じ）
+        if "retry-after" in headers or "Retry-After" in headers:
+            headers["Retry-After"] = headers["retry-after"] = headers.get(
+                "Retry-After", headers.get("retry-after")
+            )
+        return {"status": resp.status, "headers": headers, "body": resp.data.decode("utf-8")}
+
+
+def get_slack_client(token: str) -> WebClient:
+    """トークンに対応する WebClient を取得（トークンが変わった場合のみ再構築）
+
+    Args:
+        token: Slack Bot Token
+
+    Returns:
+        WebClient: キャッシュ済みの WebClient
+    """
+    global _client_cache
+    if _client_cache is None or _client_cache[0] != token:
+        client = PooledWebClient(
+            token=token,
+            timeout=SLACK_TIMEOUT_SECONDS,
+            ssl=_ssl_context,
+            retry_handlers=[ConnectionErrorRetryHandler(max_retry_count=1)],
+        )
+        _client_cache = (token, client)
+    return _client_cache[1]
@@ -0,0 +1,73 @@
+"""ローカルの Slack API スタンドイン（テスト・ベンチマーク用）"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+
+class FakeSlack:
+    """Slack Web API（chat.postMessage など）を受け付けるローカルのスタンドイン
+
+    keep-alive（HTTP/1.1）に対応し、受け付けた TCP 接続の数を connections に数える。
+    connect_latency_seconds で接続確立（TCP/TLS ハンドシェイク）の時間を、
+    latency_seconds で API の応答時間を模擬する。
+    """
+
+    def __init__(self, latency_seconds: float = 0.0, connect_latency_seconds: float = 0.0) -> None:
+        self.posts: list[tuple[float, dict]] = []
+        # 呼び出された API メソッド名（chat.postMessage など）と引数
+        self.calls: list[tuple[str, dict]] = []
+        # 先頭から順に返す (status, body, headers)。空なら ok を返す
+        self.responses: list[tuple[int, dict, dict]] = []
+        self.connections = 0
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # 応答をまとめて 1 回で書き出す（ヘッダーと本文の分割送信で遅延 ACK を待たない）
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                fake.connections += 1
+                time.sleep(connect_latency_seconds)
+
+            def do_POST(self) -> None:
+                raw = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+                if self.headers.get("Content-Type", "").startswith("application/json"):
+                    params = json.loads(raw)
+                else:
+                    params = dict(parse_qsl(raw))
+                time.sleep(latency_seconds)
+                fake.posts.append((time.monotonic(), params))
+                fake.calls.append((self.path.rsplit("/", 1)[-1], params))
+                status, body, headers = (
+                    fake.responses.pop(0)
+                    if fake.responses
+                    else (200, {"ok": True, "ts": f"{len(fake.posts)}.000"}, {})
+                )
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        ).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/api/"
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,113 @@
+"""delivery.py のテスト（ローカルの Slack スタンドインに投稿する）"""
+
+import json
+
+import pytest
+from fake_slack import FakeSlack
+
+import delivery
+from posting import ChannelRateLimiter
+from slack_client import PooledWebClient
+
+
+@pytest.fixture
+def slack(monkeypatch):
+    fake = FakeSlack()
+    client = PooledWebClient(token="xoxb-test", base_url=fake.base_url, timeout=5)
+    monkeypatch.setattr(delivery, "get_slack_bot_token", lambda: "xoxb-test")
+    monkeypatch.setattr(delivery, "get_slack_client", lambda token: client)
+    # 投稿間隔 50ms のバケットで、新しいコンテナとして開始する
+    monkeypatch.setattr(delivery, "rate_limiter", ChannelRateLimiter(rate=20.0))
+    monkeypatch.setattr(delivery, "_poster", None)
+    yield fake
+    fake.close()
+
+
+def reply_event(text: str, channel_id: str = "C1", thread_ts: str = "1.0") -> dict:
+    return {
+        "channel_id": channel_id,
+        "thread_ts": thread_ts,
+        "agentResult": {"should_reply": True, "reply_mode": "thread", "reply_text": text},
+    }
+
+
+def test_reply_is_posted_to_the_thread(slack):
+    response = delivery.deliver_reply(reply_event("hello"))
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["ts"] == "1.000"
+    [(_, params)] = slack.posts
+    assert params["channel"] == "C1"
+    assert params["thread_ts"] == "1.0"
+    assert params["text"] == "hello"
+
+
+def test_poster_and_rate_limit_are_kept_across_invocations(slack):
+    delivery.deliver_reply(reply_event("first"))
+    poster = delivery._poster
+    delivery.deliver_reply(reply_event("second"))
+
+    assert delivery._poster is poster
+    (first_at, _), (second_at, _) = slack.posts
+    # 2 回目の呼び出しは前回の投稿で消費したバケットの回復を待つ
+    assert second_at - first_at >= 0.04
+
+
+def test_other_channels_are_not_throttled(slack):
+    delivery.deliver_reply(reply_event("first", channel_id="C1"))
+    delivery.deliver_reply(reply_event("second", channel_id="C2"))
+
+    (first_at, _), (second_at, _) = slack.posts
+    assert second_at - first_at < 0.04
+
+
+def test_ratelimited_post_is_retried_after_retry_after(slack):
+    slack.responses.append((429, {"ok": False, "error": "ratelimited"}, {"Retry-After": "0"}))
+
+    response = delivery.deliver_reply(reply_event("hello"))
+
+    assert response["statusCode"] == 200
+    assert len(slack.posts) == 2
+
+
+def test_api_error_is_reported(slack):
+    slack.responses.append((200, {"ok": False, "error": "channel_not_found"}, {}))
+
+    response = delivery.deliver_reply(reply_event("hello"))
+
+    assert response["statusCode"] == 500
+    assert json.loads(response["body"])["error"] == "channel_not_found"
+
+
+def test_no_reply_skips_posting(slack):
+    event = {"channel_id": "C1", "agentResult": {"should_reply": False, "reason": "chatter"}}
+
+    response = delivery.deliver_reply(event)
+
+    assert json.loads(response["body"])["posted"] is False
+    assert slack.posts == []
+
+
+def streamed_event(agent_result: dict) -> dict:
+    return {"channel_id": "C1", "thread_ts": "1.0", "agentResult": agent_result}
+
+
+def test_streamed_message_is_finalized_with_the_reply(slack):
+    event = streamed_event(
+        {"should_reply": True, "reply_mode": "thread", "reply_text": "hello", "streamed_ts": "9.000"}
+    )
+
+    response = delivery.deliver_reply(event)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["ts"] == "9.000"
+    assert slack.calls == [("chat.update", {"channel": "C1", "ts": "9.000", "text": "hello"})]
+
+
+def test_streamed_placeholder_is_deleted_without_a_reply(slack):
+    event = streamed_event({"should_reply": False, "reason": "chatter", "streamed_ts": "9.000"})
+
+    response = delivery.deliver_reply(event)
+
+    assert json.loads(response["body"])["posted"] is False
+    assert slack.calls == [("chat.delete", {"channel": "C1", "ts": "9.000"})]
@@ -0,0 +1,56 @@
+"""posting.py のテスト（ローカルの Slack スタンドインに直接投稿する）"""
+
+import pytest
+import urllib3
+from fake_slack import FakeSlack
+
+from posting import ChannelRateLimiter, SlackPoster
+from slack_client import PooledWebClient
+
+
+@pytest.fixture
+def slack():
+    fake = FakeSlack()
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def poster(slack):
+    client = PooledWebClient(token="xoxb-test", base_url=slack.base_url, pool=urllib3.PoolManager())
+    # 投稿間隔 50ms のバケット
+    return SlackPoster(client, ChannelRateLimiter(rate=20.0))
+
+
+def test_replies_to_the_same_thread_are_posted_separately_in_order(slack, poster):
+    poster.submit("C1", "first", thread_ts="1.0")
+    poster.submit("C1", "second", thread_ts="1.0")
+
+    results = poster.flush()
+
+    assert [r.posted for r in results] == [True, True]
+    assert [params["text"] for _, params in slack.posts] == ["first", "second"]
+    (first_at, _), (second_at, _) = slack.posts
+    assert second_at - first_at >= 0.04
+
+
+def test_ratelimited_channel_does_not_hold_back_other_channels(slack, poster):
+    slack.responses.append((429, {"ok": False, "error": "ratelimited"}, {"Retry-After": "0.2"}))
+    poster.submit("C1", "limited", thread_ts="1.0")
+    poster.submit("C2", "other", thread_ts="2.0")
+
+    results = poster.flush()
+
+    assert [params["text"] for _, params in slack.posts] == ["limited", "other", "limited"]
+    assert {r.channel: r.posted for r in results} == {"C1": True, "C2": True}
+
+
+def test_post_that_cannot_wait_past_the_deadline_fails(slack, poster):
+    slack.responses.append((429, {"ok": False, "error": "ratelimited"}, {"Retry-After": "30"}))
+    poster.submit("C1", "hello")
+
+    [result] = poster.flush(deadline=0.0)
+
+    assert result.posted is False
+    assert result.error == "ratelimited"
+    assert len(slack.posts) == 1
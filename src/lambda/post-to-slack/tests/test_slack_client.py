@@ -0,0 +1,61 @@
+"""slack_client.py のテスト"""
+
+import pytest
+import urllib3
+from fake_slack import FakeSlack
+from slack_sdk.errors import SlackApiError
+
+import slack_client
+from slack_client import PooledWebClient, get_slack_client
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(slack_client, "_client_cache", None)
+
+
+@pytest.fixture
+def slack():
+    fake = FakeSlack()
+    yield fake
+    fake.close()
+
+
+def test_client_is_reused_for_the_same_token():
+    client = get_slack_client("xoxb-1")
+
+    assert get_slack_client("xoxb-1") is client
+    assert isinstance(client, PooledWebClient)
+
+
+def test_client_is_rebuilt_when_the_token_rotates():
+    client = get_slack_client("xoxb-1")
+
+    rotated = get_slack_client("xoxb-2")
+
+    assert rotated is not client
+    assert rotated.token == "xoxb-2"
+    # 接続プールはローテーション後も引き継ぐ
+    assert rotated.pool is client.pool
+    assert get_slack_client("xoxb-2") is rotated
+
+
+def test_consecutive_calls_share_one_connection(slack):
+    client = PooledWebClient(token="xoxb-1", base_url=slack.base_url, pool=urllib3.PoolManager())
+
+    for n in range(3):
+        client.chat_postMessage(channel="C1", text=f"message {n}")
+
+    assert [params["text"] for _, params in slack.posts] == ["message 0", "message 1", "message 2"]
+    assert slack.connections == 1
+
+
+def test_api_errors_are_raised_as_slack_api_errors(slack):
+    slack.responses.append((429, {"ok": False, "error": "ratelimited"}, {"Retry-After": "3"}))
+    client = PooledWebClient(token="xoxb-1", base_url=slack.base_url, pool=urllib3.PoolManager())
+
+    with pytest.raises(SlackApiError) as excinfo:
+        client.chat_postMessage(channel="C1", text="hello")
+
+    assert excinfo.value.response["error"] == "ratelimited"
+    assert excinfo.value.response.headers["Retry-After"] == "3"